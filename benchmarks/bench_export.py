@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Web用JSONエクスポートベンチマーク
+従来の ``export_to_json``（``iterrows`` + ``json.dump(indent=2)``）と、
+列選択 + レコード変換 + 逐次エンコードの現行版の時間と出力サイズを比較する
+
+    python benchmarks/bench_export.py                      # 10万行
+    python benchmarks/bench_export.py --sizes 10000 100000
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from bench_normalizer import _timed  # noqa: E402
+
+DEFAULT_SIZES = (100000,)
+
+
+def generate_frame(count, seed=0):
+    """``enhance_data_for_web`` 後に近い列構成のDataFrameを ``count`` 行生成"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    prices = rng.integers(3000, 15000, count) / 10
+    years = rng.integers(2014, 2026, count)
+    mileages = rng.integers(1, 150, count) * 1000
+    ages = np.maximum(2026 - years, 1)
+    grades = np.array(['RC F', 'RC F カーボンエクステリアパッケージ', 'RC F パフォーマンスパッケージ'])
+    return pd.DataFrame({
+        '車種名': 'RC F',
+        'モデル': '情報なし',
+        'グレード': grades[rng.integers(0, len(grades), count)],
+        '正規グレード': grades[rng.integers(0, len(grades), count)],
+        '支払総額': [f"{price}万円" for price in prices],
+        '年式': years.astype(str),
+        '走行距離': [f"{mileage / 10000}万km" for mileage in mileages],
+        '修復歴': 'なし',
+        'ミッション': 'フロアMTモード付8AT',
+        '排気量': '5000CC',
+        'マッチング精度': 0.8,
+        '取得日時': '2025-06-18T23:31:23.071773',
+        'ソースURL': 'https://www.carsensor.net/usedcar/index.html?CARC=LE_S016',
+        '車両URL': [f"https://www.carsensor.net/usedcar/detail/AU{i:010d}/index.html" for i in range(count)],
+        '価格数値': pd.array(prices, dtype='Float64'),
+        '年式数値': pd.array(years, dtype='Int16'),
+        '走行距離数値': pd.array(mileages, dtype='Int32'),
+        '年齢': ages,
+        '年間走行距離': mileages / ages
+    })
+
+
+def export_iterrows(df, output_path):
+    """従来の export_for_web.export_to_json と同じ行ごとの出力"""
+    web_data = []
+    for _, row in df.iterrows():
+        web_data.append({
+            '車種名': row.get('車種名', 'F'),
+            'モデル': row.get('モデル', '情報なし'),
+            'グレード': row.get('グレード', ''),
+            '正規グレード': row.get('正規グレード', ''),
+            '支払総額': row.get('支払総額', ''),
+            '年式': row.get('年式', ''),
+            '走行距離': row.get('走行距離', ''),
+            '修復歴': row.get('修復歴', 'なし'),
+            'ミッション': row.get('ミッション', ''),
+            '排気量': row.get('排気量', '5000CC'),
+            'マッチング精度': float(row.get('マッチング精度', 0.8)),
+            '取得日時': row.get('取得日時', ''),
+            'ソースURL': row.get('ソースURL', ''),
+            '車両URL': row.get('車両URL', row.get('ソースURL', '')),
+            'price': float(row.get('価格数値', 0)),
+            'year': int(row.get('年式数値', 2020)),
+            'mileage': float(row.get('走行距離数値', 0)),
+            'age': int(row.get('年齢', 1)),
+            'mileagePerYear': float(row.get('年間走行距離', 0))
+        })
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(web_data, f, ensure_ascii=False, indent=2)
+
+
+def run_benchmarks(sizes, repeat, work_dir):
+    from scripts.export_for_web import export_to_json
+
+    methods = {
+        'iterrows': export_iterrows,
+        'vectorized': lambda df, path: export_to_json(df, path),
+        'vectorized_pretty': lambda df, path: export_to_json(df, path, pretty=True)
+    }
+    results = {}
+    for size in sizes:
+        df = generate_frame(size, seed=size)
+        outputs = {}
+        for name, export in methods.items():
+            path = Path(work_dir) / f"{name}_{size}.json"
+            results[f'{name}_{size}_s'] = _timed(lambda: export(df, path), repeat)
+            results[f'{name}_{size}_mb'] = path.stat().st_size / 1e6
+            outputs[name] = path
+        expected = json.loads(outputs['iterrows'].read_text(encoding='utf-8'))
+        for name in ('vectorized', 'vectorized_pretty'):
+            assert json.loads(outputs[name].read_text(encoding='utf-8')) == expected, f"出力が一致しません: {name}"
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Web用JSONエクスポートベンチマーク')
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES), help='行数')
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（中央値を採用）')
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix='bench_export_')
+    try:
+        results = run_benchmarks(args.sizes, args.repeat, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'方式':<20}{'行数':>10}{'秒':>10}{'サイズ(MB)':>14}")
+    for size in args.sizes:
+        for name in ('iterrows', 'vectorized', 'vectorized_pretty'):
+            print(f"{name:<20}{size:>10,}{results[f'{name}_{size}_s']:>10.3f}"
+                  f"{results[f'{name}_{size}_mb']:>14.1f}")
+        speedup = results[f'iterrows_{size}_s'] / results[f'vectorized_{size}_s']
+        ratio = results[f'vectorized_{size}_mb'] / results[f'iterrows_{size}_mb']
+        print(f"{size:,}行: {speedup:.1f}倍高速、出力サイズ {ratio:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
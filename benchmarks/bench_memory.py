@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+読み込みメモリベンチマーク
+1年分のスナップショットを合成し、従来の読み込み（型推論 + ``pd.concat`` + 行ごとの数値化）と
+``load_snapshots`` + ``parse_vehicle_fields``（カテゴリ型・狭い数値型）のピークメモリを比較する
+
+各方式は別プロセスで実行し、プロセスのピークRSSの増分を計測する。
+
+    python benchmarks/bench_memory.py                      # 365日 × 300行
+    python benchmarks/bench_memory.py --days 365 --rows 1000
+"""
+
+import argparse
+import multiprocessing
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from bench_parsing import parse_rowwise  # noqa: E402
+
+
+def generate_snapshots(root, days, rows, seed=0):
+    """``root/RC_F/<日付>/*.csv`` に ``days`` 日分のスナップショットを書き出す"""
+    import pandas as pd
+    from datetime import date, timedelta
+    from src.scraper.car_scraper import CarListing
+
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    grades = ['RC F', 'RC F カーボンエクステリアパッケージ', 'RC F パフォーマンスパッケージ',
+              'RC F 10th アニバーサリー', 'RC F ファイナル エディション']
+    files = []
+    for day in range(days):
+        current = start + timedelta(days=day)
+        directory = Path(root) / 'RC_F' / current.strftime('%Y年%m月%d日')
+        directory.mkdir(parents=True)
+        records = []
+        for _ in range(rows):
+            year = rng.randint(2015, 2025)
+            vehicle_id = rng.randint(1, 5 * rows)
+            records.append(CarListing(
+                'RC F', rng.choice(['前期型', '後期型']), rng.choice(grades) + ' 純正ナビ',
+                f"{rng.randint(4000, 12000) / 10}万円", f"{year}({'R' if year >= 2019 else 'H'}{year % 100:02d})",
+                f"{rng.randint(1, 120) / 10}万km", rng.choice(['なし', 'あり']), 'フロアMTモード付8AT',
+                '5000CC', f"{current.isoformat()}T03:00:00", current.isoformat(), '03:00:00',
+                'https://www.carsensor.net/usedcar/search.php?CARC=LE_S020',
+                f"https://www.carsensor.net/usedcar/detail/AU{vehicle_id:010d}/index.html"))
+        path = directory / f"{current.strftime('%Y_%m_%d')}_RC_F.No1.csv"
+        pd.DataFrame.from_records(records, columns=CarListing._fields).to_csv(
+            path, index=False, encoding='utf-8-sig')
+        files.append(path)
+    return files
+
+
+def _peak_rss_kb():
+    import resource
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _load(mode, files, result_queue):
+    """別プロセスで読み込み、``(ピークRSS増分KB, DataFrameのメモリMB, 秒)`` を返す"""
+    import pandas as pd
+    from src.utils.loader import load_snapshots
+    from src.utils.parsing import parse_vehicle_fields
+
+    before = _peak_rss_kb()
+    start = time.perf_counter()
+    if mode == 'legacy':
+        df = pd.concat([pd.read_csv(f, encoding='utf-8-sig') for f in files], ignore_index=True)
+        parsed = parse_rowwise(df)
+    else:
+        df = load_snapshots(files, use_cache=False)
+        parsed = parse_vehicle_fields(df)[0]
+    for column in parsed.columns:
+        df[column] = parsed[column]
+    del parsed
+    elapsed = time.perf_counter() - start
+    result_queue.put((_peak_rss_kb() - before, df.memory_usage(deep=True).sum() / 1e6, elapsed))
+
+
+def measure_records(rows):
+    """掲載情報 ``rows`` 件を辞書 / CarListing で保持した場合のメモリ（MB）"""
+    from src.scraper.car_scraper import CarListing
+
+    values = [f"値{i % 50}" for i in range(len(CarListing._fields))]
+    results = {}
+    for name, build in (('dict', lambda: dict(zip(CarListing._fields, values))),
+                        ('CarListing', lambda: CarListing(*values))):
+        tracemalloc.start()
+        records = [build() for _ in range(rows)]
+        results[name] = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        del records
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='読み込みメモリベンチマーク')
+    parser.add_argument('--days', type=int, default=365, help='スナップショットの日数')
+    parser.add_argument('--rows', type=int, default=300, help='1スナップショットあたりの行数')
+    args = parser.parse_args(argv)
+
+    context = multiprocessing.get_context('spawn')
+    root = tempfile.mkdtemp(prefix='bench_memory_')
+    try:
+        files = generate_snapshots(root, args.days, args.rows)
+        print(f"{len(files)}ファイル / {len(files) * args.rows:,}行")
+        print(f"{'方式':<10}{'ピークRSS増分(MB)':>20}{'DataFrame(MB)':>16}{'秒':>8}")
+        for mode in ('legacy', 'compact'):
+            result_queue = context.Queue()
+            process = context.Process(target=_load, args=(mode, files, result_queue))
+            process.start()
+            peak_kb, frame_mb, elapsed = result_queue.get()
+            process.join()
+            print(f"{mode:<10}{peak_kb / 1024:>20.1f}{frame_mb:>16.1f}{elapsed:>8.2f}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    records = measure_records(args.rows * 10)
+    print(f"\n掲載情報 {args.rows * 10:,}件の保持メモリ: "
+          + ' / '.join(f"{name} {mb:.2f}MB" for name, mb in records.items()))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
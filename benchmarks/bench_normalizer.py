@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+グレード正規化ベンチマーク
+実際の car_grades.json から合成したグレード文字列で処理時間を計測し、
+保存済みのベースラインと比較する
+
+    python benchmarks/bench_normalizer.py                      # 計測してベースラインと比較
+    python benchmarks/bench_normalizer.py --save-baseline      # ベースラインを更新
+    python benchmarks/bench_normalizer.py --sizes 1000 100000 --threshold 0.3
+"""
+
+import argparse
+import glob
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+DEFAULT_BASELINE = Path(__file__).parent / 'baselines' / 'bench_normalizer.json'
+DEFAULT_THRESHOLD = 0.25
+
+# 計測誤差として無視する差（項目名の単位ごと）
+NOISE_FLOOR = {'_ms': 1.0, '_us': 5.0, '_s': 0.05}
+
+# サンプルCSVが見つからない場合の販売店コメント
+FALLBACK_NOISE = [
+    '純正ナビ', 'フルセグ', 'Bカメラ', 'ETC', '禁煙車', 'ワンオーナー', '記録簿',
+    'サンルーフ', 'マークレビンソン', 'OPアルミ', '本革シート', 'ドラレコ', '後期型',
+    'TVD', 'BSM', '寒冷地仕様', '車高調', '19インチAW', '1オーナー', '走行300km'
+]
+
+
+def load_dealer_noise(limit=2000):
+    """サンプルCSVのグレード文字列から販売店コメント部分を収集"""
+    import csv
+
+    noise = set()
+    for path in glob.glob(str(project_root / 'data' / 'scraped' / '**' / '*.csv'), recursive=True):
+        with open(path, encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                parts = (row.get('グレード') or '').split('\xa0')
+                if len(parts) >= 3 and parts[2].strip():
+                    noise.add(parts[2].strip())
+        if len(noise) >= limit:
+            break
+    return sorted(noise) or FALLBACK_NOISE
+
+
+def generate_rows(count, seed=0):
+    """``(車種名, グレード)`` の合成データを ``count`` 行生成
+
+    販売サイトの表記（``モデル \\xa0グレード\\xa0コメント``）を模し、
+    単語の欠落・大小文字の揺れ・エイリアス表記・未登録車種を混ぜる。
+    """
+    with open(project_root / 'config' / 'car_grades.json', encoding='utf-8') as f:
+        cars = [car for car in json.load(f) if car.get('grades')]
+    noise = load_dealer_noise()
+    rng = random.Random(seed)
+
+    rows = []
+    for _ in range(count):
+        car = rng.choice(cars)
+        words = rng.choice(car['grades']).split()
+        if len(words) > 1 and rng.random() < 0.3:
+            words.pop(rng.randrange(len(words)))
+        grade = ' '.join(words)
+        if rng.random() < 0.2:
+            grade = grade.lower()
+
+        roll = rng.random()
+        if roll < 0.1 and car.get('aliases'):
+            car_name = rng.choice(car['aliases'])
+        elif roll < 0.15:
+            car_name = 'Unknown'
+        else:
+            car_name = car['car_name']
+
+        comment = rng.choice(noise) if rng.random() < 0.8 else ''
+        rows.append((car_name, f"{car_name} \xa0{grade}\xa0{comment}".rstrip('\xa0')))
+    return rows
+
+
+def _timed(func, repeat=1):
+    """``repeat`` 回実行した中央値（秒）"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def measure_startup(repeat):
+    """読み込み方式ごとの正規化エンジン起動時間（ミリ秒）"""
+    from src.analyzer.grade_normalizer import GradeNormalizer
+
+    GradeNormalizer()  # コンパイル済みキャッシュを作成
+    GradeNormalizer(lazy=True)
+    return {
+        'startup_json_ms': _timed(lambda: GradeNormalizer(use_cache=False), repeat) * 1000,
+        'startup_cache_ms': _timed(lambda: GradeNormalizer(), repeat) * 1000,
+        'startup_lazy_ms': _timed(lambda: GradeNormalizer(lazy=True), repeat) * 1000
+    }
+
+
+def measure_calls(rows, repeat):
+    """``clean_grade_text`` と ``find_best_grade_match`` の1件あたり時間（マイクロ秒）"""
+    from src.analyzer.grade_normalizer import GradeNormalizer
+
+    grades = [grade for _, grade in rows]
+
+    def clean():
+        normalizer = GradeNormalizer()
+        for grade in grades:
+            normalizer.clean_grade_text(grade)
+
+    def match():
+        # 車種ごとのインデックス構築を含めるため毎回新しいインスタンスを使う
+        normalizer = GradeNormalizer()
+        for car_name, grade in rows:
+            normalizer.find_best_grade_match(grade, car_name)
+
+    return {
+        'clean_grade_text_us': _timed(clean, repeat) / len(rows) * 1e6,
+        'find_best_grade_match_us': _timed(match, repeat) / len(rows) * 1e6
+    }
+
+
+def measure_dataframe(size, max_workers, repeat):
+    """``normalize_dataframe`` の処理時間（秒）"""
+    import pandas as pd
+    from src.analyzer.grade_normalizer import GradeNormalizer
+
+    rows = generate_rows(size, seed=size)
+    df = pd.DataFrame(rows, columns=['車種名', 'グレード'])
+
+    def run():
+        GradeNormalizer().normalize_dataframe(df, max_workers=max_workers)
+
+    return _timed(run, repeat)
+
+
+def run_benchmarks(sizes, call_rows, max_workers, repeat):
+    results = {}
+    results.update(measure_startup(repeat=max(repeat, 5)))
+    results.update(measure_calls(generate_rows(call_rows, seed=1), repeat))
+    for size in sizes:
+        results[f'normalize_dataframe_{size}_s'] = measure_dataframe(size, max_workers, repeat)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """ベースラインより ``threshold`` を超えて遅い項目の一覧"""
+    regressions = []
+    for name, value in results.items():
+        base = baseline.get('results', {}).get(name)
+        floor = next((delta for unit, delta in NOISE_FLOOR.items() if name.endswith(unit)), 0.0)
+        if base and value > base * (1 + threshold) and value - base > floor:
+            regressions.append((name, base, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='グレード正規化ベンチマーク')
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES),
+                        help='normalize_dataframe の行数')
+    parser.add_argument('--call-rows', type=int, default=5000,
+                        help='clean_grade_text / find_best_grade_match の計測件数')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='normalize_dataframe のワーカー数（1で逐次）')
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（中央値を採用）')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='許容する悪化率（0.25 = 25%%）')
+    parser.add_argument('--save-baseline', action='store_true', help='計測結果をベースラインとして保存')
+    args = parser.parse_args(argv)
+
+    import os
+    os.chdir(project_root)
+    results = run_benchmarks(args.sizes, args.call_rows, args.workers, args.repeat)
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+
+    print(f"{'項目':<36}{'今回':>12}{'基準':>12}{'比率':>8}")
+    for name, value in results.items():
+        base = baseline.get('results', {}).get(name)
+        ratio = f"{value / base:.2f}" if base else '-'
+        base_text = f"{base:.3f}" if base else '-'
+        print(f"{name:<36}{value:>12.3f}{base_text:>12}{ratio:>8}")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'workers': args.workers,
+            'results': results
+        }, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"ベースラインを保存しました: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {args.threshold:.0%} を超える性能低下:")
+        for name, base, value in regressions:
+            print(f"  {name}: {base:.3f} → {value:.3f}")
+        return 1
+    if baseline:
+        print("\n✅ 性能低下なし")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
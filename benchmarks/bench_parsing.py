@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+数値化処理ベンチマーク
+支払総額・年式・走行距離の数値化を、従来の行ごとの ``.apply`` と
+``src.utils.parsing`` のベクトル化版で比較する
+
+    python benchmarks/bench_parsing.py                     # 100万行で計測してベースラインと比較
+    python benchmarks/bench_parsing.py --save-baseline
+    python benchmarks/bench_parsing.py --sizes 100000 1000000
+"""
+
+import argparse
+import json
+import platform
+import random
+import re
+import sys
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from bench_normalizer import _timed, compare  # noqa: E402
+
+DEFAULT_SIZES = (1000000,)
+DEFAULT_BASELINE = Path(__file__).parent / 'baselines' / 'bench_parsing.json'
+DEFAULT_THRESHOLD = 0.25
+
+
+def generate_frame(count, seed=0):
+    """掲載データに近い表記の ``支払総額`` / ``年式`` / ``走行距離`` を ``count`` 行生成"""
+    import pandas as pd
+
+    rng = random.Random(seed)
+    eras = [('R', 2018), ('H', 1988)]
+    prices, years, mileages = [], [], []
+    for _ in range(count):
+        prices.append('応談' if rng.random() < 0.02 else f"{rng.randint(3000, 15000) / 10}万円")
+        year = rng.randint(2014, 2025)
+        era, offset = eras[0] if year >= 2019 else eras[1]
+        years.append(f"{year}({era}{year - offset:02d})")
+        mileages.append(f"{rng.randint(1, 150) / 10}万km" if rng.random() < 0.95 else f"{rng.randint(5, 999)}km")
+    return pd.DataFrame({'支払総額': prices, '年式': years, '走行距離': mileages})
+
+
+def parse_rowwise(df):
+    """従来の export_for_web.clean_and_validate_data と同じ行ごとの数値化"""
+    import pandas as pd
+
+    def extract_price(price_str):
+        if pd.isna(price_str):
+            return None
+        match = re.search(r'([0-9.]+)万円', str(price_str))
+        return float(match.group(1)) if match else None
+
+    def extract_year(year_str):
+        if pd.isna(year_str):
+            return None
+        match = re.search(r'(\d{4})', str(year_str))
+        return int(match.group(1)) if match else None
+
+    def extract_mileage(mileage_str):
+        if pd.isna(mileage_str):
+            return None
+        if '万km' in str(mileage_str):
+            match = re.search(r'([0-9.]+)万km', str(mileage_str))
+            return float(match.group(1)) * 10000 if match else None
+        elif 'km' in str(mileage_str):
+            match = re.search(r'([0-9.]+)km', str(mileage_str))
+            return float(match.group(1)) if match else None
+        return None
+
+    return pd.DataFrame({
+        '価格数値': df['支払総額'].apply(extract_price),
+        '年式数値': df['年式'].apply(extract_year),
+        '走行距離数値': df['走行距離'].apply(extract_mileage)
+    })
+
+
+def parse_vectorized(df):
+    from src.utils.parsing import parse_vehicle_fields
+
+    return parse_vehicle_fields(df)[0]
+
+
+def check_equal(expected, actual):
+    """両実装の結果が一致するか確認（不一致なら ``AssertionError``）"""
+    import numpy as np
+
+    for column in expected.columns:
+        left = expected[column].to_numpy(dtype=float, na_value=np.nan)
+        right = actual[column].to_numpy(dtype=float, na_value=np.nan)
+        assert np.allclose(left, right, equal_nan=True), f"結果が一致しません: {column}"
+
+
+def run_benchmarks(sizes, repeat):
+    results = {}
+    for size in sizes:
+        df = generate_frame(size, seed=size)
+        check_equal(parse_rowwise(df.head(10000)), parse_vectorized(df.head(10000)))
+        results[f'rowwise_{size}_s'] = _timed(lambda: parse_rowwise(df), repeat)
+        results[f'vectorized_{size}_s'] = _timed(lambda: parse_vectorized(df), repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='数値化処理ベンチマーク')
+    parser.add_argument('--sizes', type=int, nargs='*', default=list(DEFAULT_SIZES), help='行数')
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（中央値を採用）')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='許容する悪化率（0.25 = 25%%）')
+    parser.add_argument('--save-baseline', action='store_true', help='計測結果をベースラインとして保存')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat)
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+
+    print(f"{'項目':<28}{'今回':>10}{'基準':>10}")
+    for name, value in results.items():
+        base = baseline.get('results', {}).get(name)
+        print(f"{name:<28}{value:>10.3f}{(f'{base:.3f}' if base else '-'):>10}")
+    for size in args.sizes:
+        speedup = results[f'rowwise_{size}_s'] / results[f'vectorized_{size}_s']
+        print(f"{size:,}行: ベクトル化版は {speedup:.1f}倍高速")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': results
+        }, ensure_ascii=False, indent=2) + '\n', encoding='utf-8')
+        print(f"ベースラインを保存しました: {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {args.threshold:.0%} を超える性能低下:")
+        for name, base, value in regressions:
+            print(f"  {name}: {base:.3f} → {value:.3f}")
+        return 1
+    if baseline:
+        print("\n✅ 性能低下なし")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正規化ワーカープロセスの起動時間・メモリ計測
+ワーカーごとの設定読み込み方式を比較する
+
+    python benchmarks/bench_worker_pool.py --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+MODES = {
+    'json': 'ワーカーごとにJSONを全件パース',
+    'cache': 'ワーカーごとにコンパイル済みキャッシュを読み込み',
+    'lazy': 'ワーカーごとにオフセットインデックスで遅延読み込み',
+    'mapped': 'メモリマップ共有インデックスを参照'
+}
+
+
+def memory_usage_kb():
+    """``(RSS, 匿名メモリ)`` をKB単位で返す（取得できない値は ``None``）
+
+    メモリマップしたファイルのページはRSSに含まれるが、ページキャッシュ上で
+    プロセス間共有され解放も可能なため、ワーカー固有の消費量としては
+    ヒープ等の匿名メモリ (``Anonymous``) を比較する。
+    """
+    rss = private = None
+    try:
+        with open('/proc/self/smaps_rollup', encoding='ascii') as f:
+            for line in f:
+                name, _, value = line.partition(':')
+                if name == 'Rss':
+                    rss = int(value.split()[0])
+                elif name == 'Anonymous':
+                    private = int(value.split()[0])
+    except OSError:
+        try:
+            import resource
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        except ImportError:
+            pass
+    return rss, private
+
+
+def _measure_worker(mode, index_path, car_names):
+    """ワーカー内で正規化エンジンを作成し、起動時間とメモリ増分を返す"""
+    from src.analyzer.grade_normalizer import GradeNormalizer
+    from src.analyzer.shared_index import open_grade_index
+
+    rss_before, private_before = memory_usage_kb()
+    start = time.perf_counter()
+    if mode == 'json':
+        normalizer = GradeNormalizer(use_cache=False)
+    elif mode == 'cache':
+        normalizer = GradeNormalizer()
+    elif mode == 'lazy':
+        normalizer = GradeNormalizer(lazy=True)
+    else:
+        normalizer = open_grade_index(index_path)
+    for car_name in car_names:
+        normalizer.find_best_grade_match('ベース', car_name)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    rss_after, private_after = memory_usage_kb()
+
+    def delta(after, before):
+        return None if after is None or before is None else after - before
+
+    return {
+        'pid': os.getpid(),
+        'startup_ms': elapsed_ms,
+        'rss_kb': rss_after,
+        'rss_delta_kb': delta(rss_after, rss_before),
+        'private_delta_kb': delta(private_after, private_before)
+    }
+
+
+def _warm_import():
+    """pandas等のimport時間を計測対象から除くための空タスク"""
+    import src.analyzer.grade_normalizer  # noqa: F401
+    return os.getpid()
+
+
+def run_mode(mode, workers, index_path, car_names):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_warm_import) as executor:
+        futures = [executor.submit(_measure_worker, mode, str(index_path), car_names)
+                   for _ in range(workers)]
+        return [future.result() for future in futures]
+
+
+def _format(value, fmt='{:,.0f}'):
+    return '-' if value is None else fmt.format(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='正規化ワーカー起動ベンチマーク')
+    parser.add_argument('--workers', type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument('--cars', nargs='*', default=['RC F', 'GRヤリス', 'スープラ'],
+                        help='各ワーカーで参照する車種')
+    args = parser.parse_args(argv)
+
+    os.chdir(project_root)
+    from src.analyzer.shared_index import publish_grade_index
+    index_path = publish_grade_index(Path('config') / 'car_grades.json',
+                                     Path('config') / 'exclude_keywords.txt')
+
+    print(f"ワーカー数: {args.workers}  参照車種: {', '.join(args.cars)}")
+    print(f"{'方式':<8}{'起動(ms)':>10}{'RSS(KB)':>12}{'RSS増分(KB)':>14}{'匿名増分(KB)':>14}  説明")
+    for mode, description in MODES.items():
+        results = run_mode(mode, args.workers, index_path, args.cars)
+        count = len(results)
+        startup = sum(r['startup_ms'] for r in results) / count
+        rss = [r['rss_kb'] for r in results if r['rss_kb'] is not None]
+        rss_delta = [r['rss_delta_kb'] for r in results if r['rss_delta_kb'] is not None]
+        private_delta = [r['private_delta_kb'] for r in results if r['private_delta_kb'] is not None]
+        print(f"{mode:<8}{startup:>10.1f}"
+              f"{_format(sum(rss) / len(rss) if rss else None):>12}"
+              f"{_format(sum(rss_delta) / len(rss_delta) if rss_delta else None):>14}"
+              f"{_format(sum(private_delta) / len(private_delta) if private_delta else None):>14}"
+              f"  {description}")
+
+
+if __name__ == '__main__':
+    main()
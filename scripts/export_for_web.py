@@ -14,7 +14,9 @@ from pathlib import Path
 from datetime import datetime
 
 import pandas as pd
-from src.utils import get_scraped_dir
+from src.analyzer.normalizer_service import connect_normalizer_service
+from src.utils import find_car_files, get_scraped_dir, load_snapshots
+from src.utils.parsing import parse_vehicle_fields, parse_vehicle_id
 
 # ログ設定
 logging.basicConfig(
@@ -23,33 +25,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# スクレイピングデータから読み込む列
+EXPORT_COLUMNS = [
+    '車種名', 'モデル', 'グレード', '支払総額', '年式', '走行距離', '修復歴',
+    'ミッション', '排気量', '取得日時', 'ソースURL', '車両URL'
+]
+
 def find_csv_files(car_dir: Path):
     """Return list of CSV files inside a scraped car directory."""
     if not car_dir.exists():
         logger.error(f"データディレクトリが存在しません: {car_dir}")
         return []
 
-    files = []
-    for date_dir in car_dir.iterdir():
-        if date_dir.is_dir():
-            files.extend(date_dir.glob('*.csv'))
-    return sorted(files)
+    project_root = Path(__file__).parent.parent
+    return sorted(find_car_files(car_dir, project_root))
 
 def load_dataframe_from_dir(car_dir: Path):
     """Load and concatenate all CSV files under ``car_dir``."""
     files = find_csv_files(car_dir)
     if not files:
         return None
-
-    dfs = []
-    for f in files:
-        try:
-            dfs.append(pd.read_csv(f, encoding='utf-8-sig'))
-        except Exception as e:
-            logger.warning(f"CSV読み込みエラー {f}: {e}")
-    if not dfs:
-        return None
-    return pd.concat(dfs, ignore_index=True)
+    return load_snapshots(files, columns=EXPORT_COLUMNS)
 
 def clean_and_validate_data(df):
     """データのクリーニングと検証"""
@@ -65,36 +61,12 @@ def clean_and_validate_data(df):
     # データ型の統一
     cleaned_df = df.copy()
     
-    # 価格の統一（"万円"を含む文字列から数値を抽出）
-    def extract_price(price_str):
-        if pd.isna(price_str):
-            return None
-        match = re.search(r'([0-9.]+)万円', str(price_str))
-        return float(match.group(1)) if match else None
-    
-    # 年式の統一（YYYY年形式から数値を抽出）
-    def extract_year(year_str):
-        if pd.isna(year_str):
-            return None
-        match = re.search(r'(\d{4})', str(year_str))
-        return int(match.group(1)) if match else None
-    
-    # 走行距離の統一（"万km"から数値を抽出）
-    def extract_mileage(mileage_str):
-        if pd.isna(mileage_str):
-            return None
-        if '万km' in str(mileage_str):
-            match = re.search(r'([0-9.]+)万km', str(mileage_str))
-            return float(match.group(1)) * 10000 if match else None
-        elif 'km' in str(mileage_str):
-            match = re.search(r'([0-9.]+)km', str(mileage_str))
-            return float(match.group(1)) if match else None
-        return None
-    
-    # データ処理
-    cleaned_df['価格数値'] = cleaned_df['支払総額'].apply(extract_price)
-    cleaned_df['年式数値'] = cleaned_df['年式'].apply(extract_year)
-    cleaned_df['走行距離数値'] = cleaned_df['走行距離'].apply(extract_mileage)
+    # 価格・年式・走行距離を数値化（"万円" / 和暦 / "万km" に対応、応談は欠損扱い）
+    parsed, failed = parse_vehicle_fields(cleaned_df)
+    for column in ['価格数値', '年式数値', '走行距離数値']:
+        cleaned_df[column] = parsed[column] if column in parsed.columns else pd.NA
+    if failed.any().any():
+        logger.warning(f"数値化できない値: {failed.sum()[failed.sum() > 0].to_dict()}")
     
     # 無効なデータを除外
     before_count = len(cleaned_df)
@@ -105,6 +77,67 @@ def clean_and_validate_data(df):
     
     return cleaned_df
 
+def deduplicate_vehicles(df):
+    """車両URLの車両IDごとに1件へ集約し、掲載期間と価格履歴を付与
+
+    最新スナップショットの行を残し、``初回掲載日`` / ``最終掲載日`` と
+    日ごとの ``[日付, 価格]`` の配列 ``価格履歴`` を追加する。
+    車両URLのない行はそのまま1台として扱う。
+    """
+    urls = df['車両URL'] if '車両URL' in df.columns else pd.Series(None, index=df.index, dtype=object)
+    ids = parse_vehicle_id(urls)
+    # 車両IDのない行は行ごとに別の車両とする
+    ids = ids.fillna(pd.Series([f"row{i}" for i in range(len(df))], index=df.index))
+    if '取得日時' in df.columns:
+        timestamps = df['取得日時'].astype(object).fillna('').astype(str)
+    else:
+        timestamps = pd.Series('', index=df.index)
+
+    deduped = df.assign(車両ID=ids.to_numpy(), _取得日時=timestamps.to_numpy(),
+                        _日付=timestamps.str[:10].to_numpy())
+    deduped = deduped.sort_values(['車両ID', '_取得日時'], kind='stable')
+
+    # 同じ日の複数スナップショットは最後の観測のみ（価格のない観測は履歴に含めない）
+    grouped = deduped.groupby('車両ID', sort=False)['_日付']
+    priced = deduped[deduped['価格数値'].notna()].drop_duplicates(['車両ID', '_日付'], keep='last')
+    observations = pd.Series(
+        [[date, float(price)] for date, price in zip(priced['_日付'], priced['価格数値'])],
+        index=priced['車両ID'].to_numpy(), dtype=object
+    )
+    history = observations.groupby(level=0, sort=False).agg(list)
+
+    latest = deduped.drop_duplicates('車両ID', keep='last').set_index('車両ID')
+    latest['初回掲載日'] = grouped.first()
+    latest['最終掲載日'] = grouped.last()
+    latest['価格履歴'] = [history.get(vehicle_id, []) for vehicle_id in latest.index]
+    latest = latest.drop(columns=['_取得日時', '_日付']).reset_index()
+
+    logger.info(f"車両単位に集約: {len(df)}件 → {len(latest)}台")
+    return latest
+
+def normalize_with_service(df):
+    """正規化サービスが起動していればグレードを正規化（未起動なら元のまま）"""
+    if '正規グレード' in df.columns:
+        return df
+    
+    client = connect_normalizer_service()
+    if client is None:
+        return df
+    
+    try:
+        normalized_df = client.normalize_dataframe(df)
+        logger.info(f"正規化サービスでグレード正規化: {len(normalized_df)}件")
+        return normalized_df
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"正規化サービスエラーのため簡易正規化を使用します: {e}")
+        return df
+
+def _fillna(series, value):
+    """欠損値を ``value`` で埋める（カテゴリ型の場合はカテゴリに追加してから）"""
+    if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+        series = series.cat.add_categories([value])
+    return series.fillna(value)
+
 def enhance_data_for_web(df):
     """Web表示用のデータ拡張"""
     enhanced_df = df.copy()
@@ -123,7 +156,7 @@ def enhance_data_for_web(df):
     if '修復歴' not in enhanced_df.columns:
         enhanced_df['修復歴'] = 'なし'
     else:
-        enhanced_df['修復歴'] = enhanced_df['修復歴'].fillna('なし')
+        enhanced_df['修復歴'] = _fillna(enhanced_df['修復歴'], 'なし')
     
     # ミッションのデフォルト値
     if 'ミッション' not in enhanced_df.columns:
@@ -186,43 +219,99 @@ def enhance_data_for_web(df):
     
     return enhanced_df
 
-def export_to_json(df, output_path):
+# Web用JSONのフィールド: (出力キー, 元の列, 列がない場合の値, 数値型)
+WEB_RECORD_FIELDS = [
+    ('車種名', '車種名', 'F', None),
+    ('モデル', 'モデル', '情報なし', None),
+    ('グレード', 'グレード', '', None),
+    ('正規グレード', '正規グレード', '', None),
+    ('支払総額', '支払総額', '', None),
+    ('年式', '年式', '', None),
+    ('走行距離', '走行距離', '', None),
+    ('修復歴', '修復歴', 'なし', None),
+    ('ミッション', 'ミッション', '', None),
+    ('排気量', '排気量', '5000CC', None),
+    ('マッチング精度', 'マッチング精度', 0.8, 'float64'),
+    ('取得日時', '取得日時', '', None),
+    ('ソースURL', 'ソースURL', '', None),
+    ('車両URL', '車両URL', '', None),
+    # 分析用の数値データ
+    ('price', '価格数値', 0, 'float64'),
+    ('year', '年式数値', 2020, 'int64'),
+    ('mileage', '走行距離数値', 0, 'float64'),
+    ('age', '年齢', 1, 'int64'),
+    ('mileagePerYear', '年間走行距離', 0, 'float64')
+]
+
+# 車両単位に集約した場合の追加フィールド
+VEHICLE_RECORD_FIELDS = [
+    ('vehicleId', '車両ID'),
+    ('firstSeen', '初回掲載日'),
+    ('lastSeen', '最終掲載日'),
+    ('priceHistory', '価格履歴')
+]
+
+# 1回に辞書へ変換・エンコードする行数
+JSON_CHUNK_ROWS = 10000
+
+def build_web_records(df):
+    """Web用JSONの列を選択・改名したDataFrameを作成（欠損値は None）"""
+    columns = {}
+    for key, source, default, dtype in WEB_RECORD_FIELDS:
+        if source in df.columns:
+            values = df[source]
+        elif source == '車両URL' and 'ソースURL' in df.columns:
+            values = df['ソースURL']
+        else:
+            values = pd.Series(default, index=df.index)
+        if dtype:
+            values = values.astype(dtype)
+        columns[key] = values.astype(object).where(values.notna(), None) if values.hasnans else values
+    if '価格履歴' in df.columns:
+        for key, source in VEHICLE_RECORD_FIELDS:
+            columns[key] = df[source]
+    return pd.DataFrame(columns, index=df.index)
+
+def _to_records(frame):
+    """DataFrameを辞書のリストに変換（列ごとに ``tolist`` してPythonの型に揃える）"""
+    keys = list(frame.columns)
+    return [dict(zip(keys, row)) for row in zip(*(frame[key].tolist() for key in keys))]
+
+def write_json_records(records, f, pretty=False, chunk_rows=JSON_CHUNK_ROWS):
+    """``records`` をJSON配列として ``f`` に逐次書き込み
+
+    ``chunk_rows`` 行ずつ辞書に変換してエンコードする。既定は空白なしの
+    コンパクト形式、``pretty=True`` でインデント2の整形出力。
+    """
+    if pretty:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    closing = '\n]' if pretty else ']'
+
+    if len(records) == 0:
+        f.write('[]')
+        return
+    f.write('[')
+    for start in range(0, len(records), chunk_rows):
+        if start:
+            f.write(',')
+        chunk = encoder.encode(_to_records(records.iloc[start:start + chunk_rows]))
+        f.write(chunk[1:-len(closing)])
+    f.write(closing)
+
+def export_to_json(df, output_path, pretty=False):
     """JSONファイルとしてエクスポート"""
     try:
         # Web用に最適化したデータ構造
-        web_data = []
-        
-        for _, row in df.iterrows():
-            record = {
-                '車種名': row.get('車種名', 'F'),
-                'モデル': row.get('モデル', '情報なし'),
-                'グレード': row.get('グレード', ''),
-                '正規グレード': row.get('正規グレード', ''),
-                '支払総額': row.get('支払総額', ''),
-                '年式': row.get('年式', ''),
-                '走行距離': row.get('走行距離', ''),
-                '修復歴': row.get('修復歴', 'なし'),
-                'ミッション': row.get('ミッション', ''),
-                '排気量': row.get('排気量', '5000CC'),
-                'マッチング精度': float(row.get('マッチング精度', 0.8)),
-                '取得日時': row.get('取得日時', ''),
-                'ソースURL': row.get('ソースURL', ''),
-                '車両URL': row.get('車両URL', row.get('ソースURL', '')),
-                # 分析用の数値データ
-                'price': float(row.get('価格数値', 0)),
-                'year': int(row.get('年式数値', 2020)),
-                'mileage': float(row.get('走行距離数値', 0)),
-                'age': int(row.get('年齢', 1)),
-                'mileagePerYear': float(row.get('年間走行距離', 0))
-            }
-            web_data.append(record)
+        records = build_web_records(df)
         
         # JSONファイル保存
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(web_data, f, ensure_ascii=False, indent=2)
+            write_json_records(records, f, pretty=pretty)
         
         logger.info(f"JSONエクスポート完了: {output_path}")
-        logger.info(f"レコード数: {len(web_data)}")
+        logger.info(f"レコード数: {len(records)}")
         
         return True
         
@@ -236,6 +325,7 @@ def export_metadata(df, output_dir):
         metadata = {
             'export_date': datetime.now().isoformat(),
             'total_records': len(df),
+            'total_observations': int(df['価格履歴'].str.len().sum()) if '価格履歴' in df.columns else len(df),
             'unique_grades': int(df['正規グレード'].nunique()),
             'year_range': {
                 'min': int(df['年式数値'].min()),
@@ -275,6 +365,16 @@ def main(argv=None):
         help="data/scraped 内の車種ディレクトリ名",
         default="F",
     )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="車両単位に集約せず、スナップショットの行ごとに出力する",
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="JSONをインデント付きで出力する（既定は空白なしのコンパクト形式）",
+    )
     args = parser.parse_args(argv)
 
     logger.info("Web用データエクスポート開始")
@@ -299,10 +399,13 @@ def main(argv=None):
             logger.error("有効なデータがありません")
             return False
 
-        enhanced_df = enhance_data_for_web(cleaned_df)
+        if not args.no_dedup:
+            cleaned_df = deduplicate_vehicles(cleaned_df)
+
+        enhanced_df = enhance_data_for_web(normalize_with_service(cleaned_df))
 
         json_output_path = output_dir / f"{args.car_dir}_data.json"
-        if not export_to_json(enhanced_df, json_output_path):
+        if not export_to_json(enhanced_df, json_output_path, pretty=args.pretty):
             return False
 
         export_metadata(enhanced_df, output_dir)
@@ -22,7 +22,10 @@ project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.scraper.car_scraper import CarScraper
-from src.analyzer.grade_normalizer import GradeNormalizer
+from src.analyzer.normalizer_registry import get_shared_normalizer
+from src.analyzer.price_stats import grade_price_summary
+from src.analyzer.result_writer import write_analysis_result
+from src.utils import load_snapshot
 
 class LogHandler(logging.Handler):
     """GUIログハンドラー"""
@@ -150,7 +153,7 @@ class CarAnalysisGUI:
         # Determine scraped data directory. Prefer 'data/scraped' at the
         # project root, but fall back to the bundled sample data under
         # src/scraper if the directory doesn't exist.
-        from src.utils import get_scraped_dir
+        from src.utils import get_catalog, get_scraped_dir
         scraped_dir = get_scraped_dir(project_root)
         if not scraped_dir.exists():
             self.car_listbox.insert(tk.END, "スクレイピングデータがありません")
@@ -158,21 +161,18 @@ class CarAnalysisGUI:
         
         car_data = {}
         
-        for car_dir in scraped_dir.iterdir():
-            if not car_dir.is_dir():
-                continue
-                
+        # カタログから車種ごとのファイル一覧を取得（変更のあったディレクトリのみ再走査）
+        for folder_name, entries in get_catalog(project_root).cars().items():
             # RC F の特別処理
-            display_name = self.get_display_car_name(car_dir.name)
+            display_name = self.get_display_car_name(folder_name)
             
             # 各車種の最新ファイル情報を取得
-            latest_file = self.get_latest_file_for_car(car_dir)
+            latest_file = self.get_latest_file_for_car(entries)
             if latest_file:
-                file_count = self.count_files_for_car(car_dir)
                 car_data[display_name] = {
-                    'folder_name': car_dir.name,
+                    'folder_name': folder_name,
                     'latest_file': latest_file,
-                    'file_count': file_count,
+                    'file_count': len(entries),
                     'display_name': display_name
                 }
         
@@ -197,34 +197,12 @@ class CarAnalysisGUI:
         # その他の車種はそのまま
         return folder_name
         
-    def get_latest_file_for_car(self, car_dir):
-        """指定車種の最新ファイル取得（No が最大のもの）"""
-        all_files = []
-        
-        for date_dir in car_dir.iterdir():
-            if date_dir.is_dir():
-                csv_files = list(date_dir.glob('*.csv'))
-                all_files.extend(csv_files)
-        
-        if not all_files:
+    def get_latest_file_for_car(self, entries):
+        """カタログエントリから最新ファイル取得（更新日時が同じ場合は No が最大のもの）"""
+        if not entries:
             return None
-        
-        # ファイル名からNo番号を抽出してソート
-        def get_file_number(file_path):
-            match = re.search(r'\.No(\d+)\.csv$', file_path.name)
-            return int(match.group(1)) if match else 0
-        
-        # 同じ日付の中で最大のNo、異なる日付では最新の日付
-        latest_file = max(all_files, key=lambda f: (f.stat().st_mtime, get_file_number(f)))
-        return latest_file
-        
-    def count_files_for_car(self, car_dir):
-        """指定車種のファイル数カウント"""
-        count = 0
-        for date_dir in car_dir.iterdir():
-            if date_dir.is_dir():
-                count += len(list(date_dir.glob('*.csv')))
-        return count
+        latest = max(entries, key=lambda e: (e['mtime'], e['file_number']))
+        return latest['path']
         
     def start_scraping(self):
         """スクレイピング開始"""
@@ -309,17 +287,12 @@ class CarAnalysisGUI:
             target_file = car_info['latest_file']
             
             # データ読み込み
-            if target_file.suffix.lower() == '.csv':
-                df = pd.read_csv(target_file, encoding='utf-8-sig')
-            elif target_file.suffix.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(target_file)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {target_file.suffix}")
+            df = load_snapshot(target_file)
             
             self.logger.info(f"データ読み込み完了: {len(df)}件")
             
-            # グレード正規化
-            normalizer = GradeNormalizer()
+            # グレード正規化（設定変更時は自動で再読み込みされる共有インスタンス）
+            normalizer = get_shared_normalizer(result_cache=True)
             normalized_df = normalizer.normalize_dataframe(df)
             
             # 分析結果保存
@@ -348,67 +321,25 @@ class CarAnalysisGUI:
         safe_filename = re.sub(r'[\\|/|:|*|?|"|<|>|\|]', '_', output_filename)
         output_path = output_dir / safe_filename
         
+        # グレード別集計
+        grade_df = grade_price_summary(df) if '正規グレード' in df.columns else None
+        if grade_df is not None and grade_df.empty:
+            grade_df = None
+        
+        # メタデータ
+        metadata = {
+            'ソースファイル': str(source_file),
+            '車種名': car_display_name,
+            '処理日時': datetime.now().isoformat(),
+            '総件数': len(df),
+            '正規グレード数': df['正規グレード'].nunique() if '正規グレード' in df.columns else 0
+        }
+        
         # Excel保存（複数シート）
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # 正規化済みデータ
-            df.to_excel(writer, sheet_name='正規化済みデータ', index=False)
-            
-            # グレード別集計
-            if '正規グレード' in df.columns:
-                grade_summary = df.groupby('正規グレード').agg({
-                    '支払総額': lambda x: self.extract_price_stats(x)
-                }).round(2)
-                
-                # 集計結果を展開
-                grade_stats = []
-                for grade, stats in grade_summary.iterrows():
-                    price_data = stats['支払総額']
-                    if isinstance(price_data, dict):
-                        grade_stats.append({
-                            'グレード': grade,
-                            '平均価格': price_data.get('平均', 0),
-                            '最小価格': price_data.get('最小', 0),
-                            '最大価格': price_data.get('最大', 0),
-                            'データ件数': price_data.get('件数', 0)
-                        })
-                
-                if grade_stats:
-                    grade_df = pd.DataFrame(grade_stats)
-                    grade_df.to_excel(writer, sheet_name='グレード別集計', index=False)
-            
-            # メタデータ
-            metadata = {
-                'ソースファイル': str(source_file),
-                '車種名': car_display_name,
-                '処理日時': datetime.now().isoformat(),
-                '総件数': len(df),
-                '正規グレード数': df['正規グレード'].nunique() if '正規グレード' in df.columns else 0
-            }
-            metadata_df = pd.DataFrame([metadata])
-            metadata_df.to_excel(writer, sheet_name='メタデータ', index=False)
+        write_analysis_result(output_path, df, grade_df, metadata)
         
         return output_path
         
-    def extract_price_stats(self, price_series):
-        """価格統計計算"""
-        values = []
-        for price in price_series:
-            if pd.isna(price):
-                continue
-            match = re.search(r'([0-9.]+)万円', str(price))
-            if match:
-                values.append(float(match.group(1)))
-        
-        if values:
-            import numpy as np
-            return {
-                '平均': np.mean(values),
-                '最小': np.min(values),
-                '最大': np.max(values),
-                '件数': len(values)
-            }
-        return {'平均': 0, '最小': 0, '最大': 0, '件数': 0}
-        
     def analysis_completed(self, output_path, report, car_name):
         """分析完了処理"""
         self.current_operation = None
@@ -10,7 +10,6 @@ import os
 import re
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import pandas as pd
 import logging
 from pathlib import Path
 from datetime import datetime
@@ -26,11 +25,19 @@ sys.path.append(str(project_root))
 try:
     from src.scraper.car_scraper import CarScraper
     from src.analyzer.grade_normalizer import GradeNormalizer
+    from src.analyzer.normalizer_registry import get_shared_normalizer
+    from src.analyzer.price_stats import grade_price_summary
+    from src.analyzer.result_writer import write_analysis_result
+    from src.utils import load_snapshot
     print("モジュールインポート成功")
 except ImportError as e:
     print(f"モジュールインポートエラー: {e}")
     CarScraper = None
     GradeNormalizer = None
+    get_shared_normalizer = None
+    grade_price_summary = None
+    write_analysis_result = None
+    load_snapshot = None
 
 class LogHandler(logging.Handler):
     """GUIログハンドラー"""
@@ -186,7 +193,7 @@ class CarAnalysisGUI:
         # Prefer the runtime 'data/scraped' directory, but allow running
         # against the example dataset under src/scraper when the default
         # location does not exist.
-        from src.utils import get_scraped_dir
+        from src.utils import get_catalog, get_scraped_dir
         scraped_dir = get_scraped_dir(project_root)
         
         if not scraped_dir.exists():
@@ -197,19 +204,16 @@ class CarAnalysisGUI:
         car_count = 0
         car_data = {}
         
-        for car_dir in scraped_dir.iterdir():
-            if not car_dir.is_dir():
-                continue
-                
-            display_name = self.get_display_car_name(car_dir.name)
-            latest_file = self.get_latest_file_for_car(car_dir)
+        # カタログから車種ごとのファイル一覧を取得（変更のあったディレクトリのみ再走査）
+        for folder_name, entries in get_catalog(project_root).cars().items():
+            display_name = self.get_display_car_name(folder_name)
+            latest_file = self.get_latest_file_for_car(entries)
             
             if latest_file:
-                file_count = self.count_files_for_car(car_dir)
                 car_data[display_name] = {
-                    'folder_name': car_dir.name,
+                    'folder_name': folder_name,
                     'latest_file': latest_file,
-                    'file_count': file_count,
+                    'file_count': len(entries),
                     'display_name': display_name
                 }
         
@@ -235,33 +239,12 @@ class CarAnalysisGUI:
             return "RC F"
         return folder_name
         
-    def get_latest_file_for_car(self, car_dir):
-        """指定車種の最新ファイル取得（No が最大のもの）"""
-        all_files = []
-        
-        for date_dir in car_dir.iterdir():
-            if date_dir.is_dir():
-                csv_files = list(date_dir.glob('*.csv'))
-                all_files.extend(csv_files)
-        
-        if not all_files:
+    def get_latest_file_for_car(self, entries):
+        """カタログエントリから最新ファイル取得（更新日時が同じ場合は No が最大のもの）"""
+        if not entries:
             return None
-        
-        # ファイル名からNo番号を抽出してソート
-        def get_file_number(file_path):
-            match = re.search(r'\.No(\d+)\.csv$', file_path.name)
-            return int(match.group(1)) if match else 0
-        
-        latest_file = max(all_files, key=lambda f: (f.stat().st_mtime, get_file_number(f)))
-        return latest_file
-        
-    def count_files_for_car(self, car_dir):
-        """指定車種のファイル数カウント"""
-        count = 0
-        for date_dir in car_dir.iterdir():
-            if date_dir.is_dir():
-                count += len(list(date_dir.glob('*.csv')))
-        return count
+        latest = max(entries, key=lambda e: (e['mtime'], e['file_number']))
+        return latest['path']
         
     def start_scraping(self):
         """スクレイピング開始"""
@@ -351,15 +334,10 @@ class CarAnalysisGUI:
             target_file = car_info['latest_file']
             
             # データ読み込み
-            if target_file.suffix.lower() == '.csv':
-                df = pd.read_csv(target_file, encoding='utf-8-sig')
-            elif target_file.suffix.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(target_file)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {target_file.suffix}")
+            df = load_snapshot(target_file)
             
-            # グレード正規化
-            normalizer = GradeNormalizer()
+            # グレード正規化（設定変更時は自動で再読み込みされる共有インスタンス）
+            normalizer = get_shared_normalizer(result_cache=True)
             normalized_df = normalizer.normalize_dataframe(df)
             
             # 分析結果保存
@@ -383,52 +361,13 @@ class CarAnalysisGUI:
         safe_filename = re.sub(r'[\\|/|:|*|?|"|<|>|\|]', '_', output_filename)
         output_path = output_dir / safe_filename
         
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='正規化済みデータ', index=False)
-            
-            if '正規グレード' in df.columns:
-                grade_summary = df.groupby('正規グレード').agg({
-                    '支払総額': lambda x: self.extract_price_stats(x)
-                }).round(2)
-                
-                grade_stats = []
-                for grade, stats in grade_summary.iterrows():
-                    price_data = stats['支払総額']
-                    if isinstance(price_data, dict):
-                        grade_stats.append({
-                            'グレード': grade,
-                            '平均価格': price_data.get('平均', 0),
-                            '最小価格': price_data.get('最小', 0),
-                            '最大価格': price_data.get('最大', 0),
-                            'データ件数': price_data.get('件数', 0)
-                        })
-                
-                if grade_stats:
-                    grade_df = pd.DataFrame(grade_stats)
-                    grade_df.to_excel(writer, sheet_name='グレード別集計', index=False)
+        grade_df = grade_price_summary(df) if '正規グレード' in df.columns else None
+        if grade_df is not None and grade_df.empty:
+            grade_df = None
+        write_analysis_result(output_path, df, grade_df)
         
         return output_path
     
-    def extract_price_stats(self, price_series):
-        """価格統計計算"""
-        values = []
-        for price in price_series:
-            if pd.isna(price):
-                continue
-            match = re.search(r'([0-9.]+)万円', str(price))
-            if match:
-                values.append(float(match.group(1)))
-        
-        if values:
-            import numpy as np
-            return {
-                '平均': np.mean(values),
-                '最小': np.min(values),
-                '最大': np.max(values),
-                '件数': len(values)
-            }
-        return {'平均': 0, '最小': 0, '最大': 0, '件数': 0}
-        
     def analysis_completed(self, output_path, report, car_name):
         """分析完了処理"""
         self.current_operation = None
@@ -7,24 +7,43 @@
 
 import sys
 import os
-import re
+import fnmatch
+import time
+import queue
+import threading
 import argparse
-import pandas as pd
 import logging
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.append(str(project_root))
 
 from src.scraper.car_scraper import CarScraper
-from src.analyzer.grade_normalizer import GradeNormalizer
-from src.utils import get_car_directories
+from src.analyzer.normalizer_registry import get_shared_normalizer
+from src.analyzer.normalizer_service import NormalizerService, connect_normalizer_service
+from src.analyzer.incremental import (
+    SOURCE_COLUMN, WATERMARKS_FILENAME, CumulativeDataset, SnapshotWatermarks
+)
+from src.analyzer.price_stats import grade_price_summary
+from src.analyzer.result_writer import (
+    DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, is_result_file, read_analysis_result, write_analysis_result
+)
+from src.utils import find_car_files, get_car_directories, get_catalog, load_snapshot
+
+# パイプライン実行時に分析待ちで保持するURL数（超えるとスクレイピングを待機）
+PIPELINE_QUEUE_SIZE = 2
+
+# 正規化サービスの接続確認をまだ行っていないことを表す値
+_UNRESOLVED = object()
 
 class CarAnalysisSystem:
-    def __init__(self):
+    def __init__(self, output_format=DEFAULT_OUTPUT_FORMAT):
         self.project_root = project_root
+        self.output_format = output_format
+        self._service_client = _UNRESOLVED
         self.setup_logging()
 
     def available_car_dirs(self):
@@ -59,7 +78,60 @@ class CarAnalysisSystem:
             self.logger.warning("スクレイピングでデータが取得できませんでした")
             return []
     
-    def analyze_data(self, data_path=None, car_name=None, car_dir=None, use_latest=False):
+    def run_pipeline(self, tier='full', queue_size=PIPELINE_QUEUE_SIZE):
+        """スクレイピングと分析を並行実行（全工程）
+        
+        URLごとの取得データを保存直後にメモリ上のまま有界キューで分析スレッドへ渡し、
+        次のURLの取得待ちと正規化を重ねる。分析が追いつかない場合は
+        キューが空くまでスクレイピングを待たせる。
+        
+        分析でエラーが発生した場合は以降の分析を中止し（キューは読み捨てて
+        スクレイピングを止めない）、スクレイピング完了後にその例外を送出する。
+        """
+        self.logger.info("スクレイピング・分析パイプライン開始")
+        pending = queue.Queue(maxsize=queue_size)
+        outputs = []
+        failures = []
+        
+        def consume():
+            while True:
+                item = pending.get()
+                if item is None:
+                    return
+                if failures:
+                    continue
+                csv_path, df = item
+                try:
+                    output_path, report = self.analyze_frame(df, Path(csv_path), tier=tier)
+                    self.print_analysis_report(report, Path(csv_path))
+                    outputs.append(output_path)
+                except Exception as e:
+                    self.logger.error(f"分析エラーのため以降の分析を中止します ({csv_path}): {e}")
+                    failures.append(e)
+        
+        def on_saved(csv_path, df):
+            if not failures:
+                pending.put((csv_path, df))
+        
+        worker = threading.Thread(target=consume, name='analysis-pipeline', daemon=True)
+        worker.start()
+        start = time.perf_counter()
+        try:
+            scraper = CarScraper()
+            scraped_files = scraper.run_from_urls_file(str(self.project_root / 'urls.txt'), on_saved=on_saved)
+        finally:
+            pending.put(None)
+            worker.join()
+        
+        if failures:
+            raise failures[0]
+        if not scraped_files:
+            self.logger.warning("スクレイピングでデータが取得できませんでした")
+        self.logger.info(f"パイプライン完了: {len(scraped_files)}ファイル取得 / {len(outputs)}ファイル分析 "
+                         f"({time.perf_counter() - start:.1f}秒)")
+        return outputs
+    
+    def analyze_data(self, data_path=None, car_name=None, car_dir=None, use_latest=False, tier='full'):
         """データ分析"""
         # 分析対象ファイルの特定
         if data_path:
@@ -75,64 +147,220 @@ class CarAnalysisSystem:
             self.logger.error(f"分析対象ファイルが見つかりません: {target_file}")
             return None
         
-        self.logger.info(f"分析開始: {target_file}")
-        
         try:
-            # データ読み込み
-            if target_file.suffix.lower() == '.csv':
-                df = pd.read_csv(target_file, encoding='utf-8-sig')
-            elif target_file.suffix.lower() in ['.xlsx', '.xls']:
-                df = pd.read_excel(target_file)
-            else:
-                raise ValueError(f"サポートされていないファイル形式: {target_file.suffix}")
-            
-            self.logger.info(f"データ読み込み完了: {len(df)}件")
-            
-            # グレード正規化
-            normalizer = GradeNormalizer()
-            normalized_df = normalizer.normalize_dataframe(df)
-            
-            # 分析結果保存
-            output_path = self.save_analysis_result(normalized_df, target_file)
-            
-            # レポート生成
-            report = normalizer.get_normalization_report(normalized_df)
+            output_path, report = self.analyze_file(target_file, tier=tier)
             self.print_analysis_report(report, target_file)
-            
-            self.logger.info(f"分析完了: {output_path}")
             return output_path
             
         except Exception as e:
             self.logger.error(f"分析エラー: {e}")
             return None
     
+    def load_data(self, target_file):
+        """CSV / Excel ファイルをDataFrameとして読み込み（型指定・読み込みキャッシュ経由）"""
+        return load_snapshot(target_file)
+    
+    def normalizer_service(self):
+        """起動中の正規化サービスのクライアント（なければ ``None``、確認結果は再利用）"""
+        if self._service_client is _UNRESOLVED:
+            self._service_client = connect_normalizer_service()
+            if self._service_client is not None:
+                self.logger.info("正規化サービスを使用します")
+        return self._service_client
+    
+    def normalize_data(self, df, tier='full', max_workers=None):
+        """グレード正規化し、``(正規化済みDataFrame, 正規化エンジン)`` を返す
+        
+        常駐サービスが起動していれば委譲し、なければ共有インスタンスで
+        必要な車種のみ読み込む。サービスの接続確認は最初の1回だけ行う。
+        """
+        client = self.normalizer_service()
+        if client is not None:
+            try:
+                return client.normalize_dataframe(df, max_workers=max_workers, tier=tier), client
+            except (OSError, RuntimeError, ValueError) as e:
+                self.logger.warning(f"正規化サービスエラーのため直接正規化します: {e}")
+                self._service_client = None
+        normalizer = get_shared_normalizer(lazy=True, result_cache=True)
+        return normalizer.normalize_dataframe(df, max_workers=max_workers, tier=tier), normalizer
+    
+    def analyze_file(self, target_file, tier='full', max_workers=None, output_tag=None):
+        """1ファイルを読み込み・正規化・保存し、``(出力パス, 正規化レポート)`` を返す"""
+        target_file = Path(target_file)
+        self.logger.info(f"分析開始: {target_file}")
+        
+        # データ読み込み
+        df = self.load_data(target_file)
+        self.logger.info(f"データ読み込み完了: {len(df)}件")
+        return self.analyze_frame(df, target_file, tier=tier, max_workers=max_workers,
+                                  output_tag=output_tag)
+    
+    def analyze_frame(self, df, source_file, tier='full', max_workers=None, output_tag=None):
+        """読み込み済みのDataFrameを正規化・保存し、``(出力パス, 正規化レポート)`` を返す"""
+        # グレード正規化
+        normalized_df, normalizer = self.normalize_data(df, tier=tier, max_workers=max_workers)
+        
+        # 分析結果保存
+        output_path = self.save_analysis_result(normalized_df, source_file, output_tag=output_tag)
+        
+        # レポート生成
+        report = normalizer.get_normalization_report(normalized_df)
+        self.logger.info(f"分析完了: {output_path}")
+        return output_path, report
+    
+    def analyze_incremental(self, car=None, since=None, tier='full'):
+        """未分析・内容が変わったスナップショットのみ正規化し、車種別の累積データに追加
+        
+        ``car`` は車種ディレクトリ名の部分一致、``since`` は ``YYYY-MM-DD``。
+        分析済みのスナップショットはパスと内容ハッシュで記録し
+        (``data/normalized/cumulative/.watermarks.json``)、次回以降は処理しない。
+        累積データは ``data/normalized/cumulative/<車種>_cumulative.csv``。
+        """
+        cumulative_dir = self.project_root / 'data' / 'normalized' / 'cumulative'
+        watermarks = SnapshotWatermarks(cumulative_dir / WATERMARKS_FILENAME)
+        catalog = get_catalog(self.project_root)
+        
+        pending = []
+        for entry in catalog.entries():
+            if car and not _matches_car(entry['car'], car):
+                continue
+            if since and not (entry['date'] and entry['date'] >= since):
+                continue
+            key = entry['path'].relative_to(catalog.scraped_dir).as_posix()
+            status, content_hash = watermarks.status(key, entry['path'])
+            if status != 'unchanged':
+                pending.append((entry, key, status, content_hash))
+        
+        if not pending:
+            watermarks.save()
+            print("✔ 新しいスナップショットはありません")
+            return []
+        print(f"🆕 {len(pending)}ファイルを増分分析します")
+        
+        processed = []
+        for entry, key, status, content_hash in pending:
+            try:
+                df = self.load_data(entry['path'])
+                normalized_df, _ = self.normalize_data(df, tier=tier)
+                normalized_df[SOURCE_COLUMN] = key
+                
+                dataset = CumulativeDataset(cumulative_dir / f"{entry['car']}_cumulative.csv")
+                dataset.append(normalized_df, replace_sources=[key] if status == 'changed' else ())
+                # 追加のたびに記録し、中断しても同じ行を二重に追加しない
+                watermarks.mark(key, entry['path'], content_hash, len(normalized_df))
+                watermarks.save()
+                processed.append(key)
+                label = '追加' if status == 'new' else '置換'
+                print(f"  {'➕' if status == 'new' else '🔄'} {entry['car']}: {entry['path'].name} ({len(normalized_df)}件{label})")
+            except Exception as e:
+                self.logger.error(f"増分分析エラー ({key}): {e}")
+        
+        self.logger.info(f"増分分析完了: {len(processed)}/{len(pending)}ファイル")
+        return processed
+    
+    def fleet_target_files(self, since=None):
+        """全車種の分析対象ファイル ``{車種ディレクトリ名: [パス, ...]}``
+        
+        ``since`` (``YYYY-MM-DD``) を指定するとその日以降の全スナップショット、
+        省略時は各車種の最新ファイルのみを対象とする。
+        """
+        catalog = get_catalog(self.project_root)
+        targets = {}
+        for car, _ in get_car_directories(self.project_root):
+            entries = catalog.entries(car)
+            if since:
+                entries = [entry for entry in entries if entry['date'] and entry['date'] >= since]
+            elif entries:
+                entries = [max(entries, key=lambda e: (e['mtime'], e['file_number']))]
+            if entries:
+                targets[car] = [entry['path'] for entry in entries]
+        return targets
+    
+    def analyze_fleet(self, since=None, workers=None, tier='full'):
+        """全車種を一括分析し、車種別の集計表を表示
+        
+        各ファイルの分析は ``workers`` プロセスで並列実行する
+        （``1`` の場合は逐次実行）。
+        """
+        targets = self.fleet_target_files(since)
+        tasks = [(car, path) for car, paths in targets.items() for path in paths]
+        if not tasks:
+            print("分析対象のファイルがありません")
+            return []
+        
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        print(f"🚗 {len(targets)}車種 / {len(tasks)}ファイルを分析します ({workers}プロセス)")
+        
+        start = time.perf_counter()
+        results = []
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(_analyze_fleet_file, car, str(path), tier, self.output_format): (car, path)
+                           for car, path in tasks}
+                for future in as_completed(futures):
+                    result = future.result()
+                    results.append(result)
+                    self._print_fleet_progress(result, len(results), len(tasks))
+        else:
+            for car, path in tasks:
+                result = _analyze_fleet_file(car, str(path), tier, self.output_format, system=self)
+                results.append(result)
+                self._print_fleet_progress(result, len(results), len(tasks))
+        
+        self.print_fleet_summary(results, time.perf_counter() - start)
+        return results
+    
+    def _print_fleet_progress(self, result, done, total):
+        status = '✅' if result['error'] is None else '❌'
+        print(f"  [{done}/{total}] {status} {result['car']}: {Path(result['file']).name}")
+    
+    def print_fleet_summary(self, results, elapsed):
+        """車種別の分析結果集計表を表示"""
+        by_car = {}
+        for result in results:
+            by_car.setdefault(result['car'], []).append(result)
+        
+        print(f"\n{'=' * 78}")
+        print("📊 全車種分析サマリー")
+        print('=' * 78)
+        print(f"{'車種':<16}{'ファイル':>8}{'件数':>8}{'グレード数':>10}{'高精度':>8}{'中精度':>8}{'低精度':>8}{'秒':>8}  状態")
+        print('-' * 78)
+        for car in sorted(by_car):
+            car_results = by_car[car]
+            succeeded = [r for r in car_results if r['error'] is None]
+            errors = len(car_results) - len(succeeded)
+            rows = sum(r['rows'] for r in succeeded)
+            grades = max((r['unique_grades'] for r in succeeded), default=0)
+            high = sum(r['high'] for r in succeeded)
+            medium = sum(r['medium'] for r in succeeded)
+            low = sum(r['low'] for r in succeeded)
+            seconds = sum(r['seconds'] for r in car_results)
+            status = 'OK' if not errors else f"エラー{errors}件"
+            print(f"{car:<16}{len(car_results):>8}{rows:>8}{grades:>10}{high:>8}{medium:>8}{low:>8}{seconds:>8.1f}  {status}")
+        print('-' * 78)
+        failed = sum(1 for r in results if r['error'] is not None)
+        print(f"合計: {len(by_car)}車種 / {len(results)}ファイル (失敗 {failed}件) / 経過 {elapsed:.1f}秒")
+        for result in results:
+            if result['error'] is not None:
+                print(f"  ❌ {result['car']} {Path(result['file']).name}: {result['error']}")
+    
     def find_car_data_file(self, car_name, use_latest=True):
         """車種データファイル検索"""
-        from src.utils import get_scraped_dir
-        scraped_dir = get_scraped_dir(self.project_root)
-        car_dirs = list(scraped_dir.glob(f"*{car_name}*"))
+        car_entries = {car: entries for car, entries in get_catalog(self.project_root).cars().items()
+                       if _matches_car(car, car_name)}
         
-        if not car_dirs:
+        if not car_entries:
             self.logger.error(f"車種データが見つかりません: {car_name}")
             return None
         
-        # 最新のデータディレクトリを検索
-        all_files = []
-        for car_dir in car_dirs:
-            for date_dir in car_dir.iterdir():
-                if date_dir.is_dir():
-                    csv_files = list(date_dir.glob('*.csv'))
-                    all_files.extend(csv_files)
-        
-        if not all_files:
-            return None
+        all_entries = [entry for entries in car_entries.values() for entry in entries]
         
         if use_latest:
             # 最新ファイルを返す
-            return max(all_files, key=lambda f: f.stat().st_mtime)
+            return max(all_entries, key=lambda e: e['mtime'])['path']
         else:
             # 選択肢を表示
-            return self.select_from_files(all_files)
+            return self.select_from_files([entry['path'] for entry in all_entries])
 
     def find_car_data_in_dir(self, car_dir: Path, use_latest=True):
         """Search a directory for car data files."""
@@ -140,20 +368,16 @@ class CarAnalysisSystem:
             self.logger.error(f"ディレクトリが見つかりません: {car_dir}")
             return None
 
-        all_files = []
-        for date_dir in car_dir.iterdir():
-            if date_dir.is_dir():
-                csv_files = list(date_dir.glob('*.csv'))
-                all_files.extend(csv_files)
+        files = find_car_files(car_dir, self.project_root)
 
-        if not all_files:
+        if not files:
             self.logger.error(f"CSVファイルが見つかりません: {car_dir}")
             return None
 
         if use_latest:
-            return max(all_files, key=lambda f: f.stat().st_mtime)
+            return max(files, key=lambda f: f.stat().st_mtime)
         else:
-            return self.select_from_files(all_files)
+            return self.select_from_files(files)
     
     def select_from_files(self, files):
         """ファイル選択"""
@@ -183,30 +407,23 @@ class CarAnalysisSystem:
             print("スクレイピングデータが見つかりません")
             return None
         
-        # 車種ディレクトリ一覧
-        car_dirs = [d for d in scraped_dir.iterdir() if d.is_dir()]
+        # 車種ごとのファイル一覧（カタログから取得）
+        car_entries = get_catalog(self.project_root).cars()
+        car_names = list(car_entries)
         
-        if not car_dirs:
+        if not car_names:
             print("車種データが見つかりません")
             return None
         
         print("\n利用可能な車種:")
-        for i, car_dir in enumerate(car_dirs, 1):
-            print(f"{i}. {car_dir.name}")
+        for i, car in enumerate(car_names, 1):
+            print(f"{i}. {car}")
         
         try:
             choice = int(input("車種を選択 (番号): "))
-            if 1 <= choice <= len(car_dirs):
-                selected_car = car_dirs[choice - 1]
-                
-                # 該当車種のファイル一覧
-                all_files = []
-                for date_dir in selected_car.iterdir():
-                    if date_dir.is_dir():
-                        csv_files = list(date_dir.glob('*.csv'))
-                        all_files.extend(csv_files)
-                
-                return self.select_from_files(all_files)
+            if 1 <= choice <= len(car_names):
+                selected_car = car_names[choice - 1]
+                return self.select_from_files([entry['path'] for entry in car_entries[selected_car]])
                 
         except ValueError:
             pass
@@ -214,62 +431,94 @@ class CarAnalysisSystem:
         print("無効な選択です")
         return None
     
-    def save_analysis_result(self, df, source_file):
-        """分析結果保存"""
-        # 出力ディレクトリ
-        output_dir = self.project_root / 'data' / 'normalized'
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # ファイル名生成
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        car_name = df['車種名'].iloc[0] if '車種名' in df.columns else 'Unknown'
-        output_filename = f"{car_name}_normalized_{timestamp}.xlsx"
-        output_path = output_dir / output_filename
-        
-        # Excel保存（複数シート）
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            # 正規化済みデータ
-            df.to_excel(writer, sheet_name='正規化済みデータ', index=False)
-            
-            # グレード別集計
-            if '正規グレード' in df.columns:
-                grade_summary = df.groupby('正規グレード').agg({
-                    '支払総額': lambda x: self.extract_price_stats(x),
-                    'マッチング精度': 'mean'
-                }).round(2)
-                grade_summary.to_excel(writer, sheet_name='グレード別集計')
+    def save_analysis_result(self, df, source_file, output_path=None, output_tag=None):
+        """分析結果保存（``output_path`` 省略時は新しいファイル名で保存）
+        
+        ``output_tag`` はファイル名の末尾に付け、同時刻に保存される結果を区別する。
+        形式は ``output_path`` の拡張子、省略時は ``self.output_format``。
+        """
+        if output_path is None:
+            # 出力ディレクトリ
+            output_dir = self.project_root / 'data' / 'normalized'
+            output_dir.mkdir(parents=True, exist_ok=True)
             
-            # メタデータ
-            metadata = {
-                'ソースファイル': str(source_file),
-                '処理日時': datetime.now().isoformat(),
-                '総件数': len(df),
-                '正規グレード数': df['正規グレード'].nunique() if '正規グレード' in df.columns else 0
-            }
-            metadata_df = pd.DataFrame([metadata])
-            metadata_df.to_excel(writer, sheet_name='メタデータ', index=False)
+            # ファイル名生成
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            car_name = df['車種名'].iloc[0] if '車種名' in df.columns else 'Unknown'
+            suffix = f"_{output_tag}" if output_tag else ""
+            extension = OUTPUT_FORMATS[self.output_format]
+            output_filename = f"{car_name}_normalized_{timestamp}{suffix}{extension}"
+            output_path = output_dir / output_filename
+        
+        # 集計・メタデータを先に計算してから書き出す
+        grade_summary = grade_price_summary(df) if '正規グレード' in df.columns else None
+        metadata = {
+            'ソースファイル': str(source_file),
+            '処理日時': datetime.now().isoformat(),
+            '総件数': len(df),
+            '正規グレード数': df['正規グレード'].nunique() if '正規グレード' in df.columns else 0
+        }
+        write_analysis_result(output_path, df, grade_summary, metadata)
         
         return output_path
     
-    def extract_price_stats(self, price_series):
-        """価格統計計算"""
-        values = []
-        for price in price_series:
-            if pd.isna(price):
-                continue
-            match = re.search(r'([0-9.]+)万円', str(price))
-            if match:
-                values.append(float(match.group(1)))
-        
-        if values:
-            import numpy as np
-            return {
-                '平均': np.mean(values),
-                '最小': np.min(values),
-                '最大': np.max(values),
-                '件数': len(values)
-            }
-        return {'平均': 0, '最小': 0, '最大': 0, '件数': 0}
+    def serve_normalizer(self, workers=None):
+        """正規化サービスを起動（Ctrl+C で停止）"""
+        service = NormalizerService(max_workers=workers, lazy=True, result_cache=True)
+        service.start()
+        print(f"🛰 正規化サービス待ち受け中: {service.address}")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+    
+    def renormalize_outputs(self, changed_only=True, tier='full'):
+        """保存済みの正規化結果を現在の設定で再正規化
+        
+        分析結果ファイルに加え、増分分析の累積データ
+        (``data/normalized/cumulative/<車種>_cumulative.csv``) も対象とする。
+        ``changed_only=True`` の場合は設定ハッシュが変わった車種の行のみ照合し、
+        変更のないファイルは書き換えない。
+        """
+        output_dir = self.project_root / 'data' / 'normalized'
+        output_files = sorted(path for path in output_dir.glob('*_normalized_*')
+                              if is_result_file(path)) if output_dir.exists() else []
+        cumulative_dir = output_dir / 'cumulative'
+        cumulative_files = sorted(cumulative_dir.glob('*_cumulative.csv')) if cumulative_dir.exists() else []
+        if not output_files and not cumulative_files:
+            self.logger.warning(f"正規化済みファイルが見つかりません: {output_dir}")
+            return []
+        
+        normalizer = get_shared_normalizer(lazy=True, result_cache=True)
+        updated = []
+        
+        def renormalize(path, df, save):
+            result_df = normalizer.renormalize_dataframe(df, changed_only=changed_only, tier=tier)
+            renormalized = result_df.attrs.get('renormalized_rows', len(result_df))
+            if renormalized:
+                save(result_df)
+                updated.append(path)
+            print(f"{'🔄' if renormalized else '✔'} {path.name}: {renormalized}/{len(df)}件を再正規化")
+        
+        for output_path in output_files:
+            try:
+                df, metadata = read_analysis_result(output_path)
+                source_file = metadata.get('ソースファイル', output_path)
+                renormalize(output_path, df,
+                            lambda result_df: self.save_analysis_result(result_df, source_file, output_path))
+            except Exception as e:
+                self.logger.error(f"再正規化エラー ({output_path.name}): {e}")
+        
+        for cumulative_path in cumulative_files:
+            try:
+                dataset = CumulativeDataset(cumulative_path)
+                renormalize(cumulative_path, dataset.read(), dataset.replace)
+            except Exception as e:
+                self.logger.error(f"再正規化エラー ({cumulative_path.name}): {e}")
+        
+        total = len(output_files) + len(cumulative_files)
+        self.logger.info(f"再正規化完了: {len(updated)}/{total}ファイル更新")
+        return updated
     
     def print_analysis_report(self, report, source_file):
         """分析レポート表示"""
@@ -295,6 +544,15 @@ class CarAnalysisSystem:
             grade_dist = report.get('grade_distribution', {})
             for grade, count in list(grade_dist.items())[:5]:
                 print(f"  {grade}: {count}件")
+            
+            tier_stats = report.get('tier_stats', {})
+            if tier_stats:
+                print(f"\n⏱ 正規化ティア別:")
+                for tier, count in tier_stats['rows'].items():
+                    seconds = tier_stats['seconds'].get(tier)
+                    if count or seconds:
+                        elapsed = f" / {seconds:.3f}秒" if seconds is not None else ""
+                        print(f"  {tier}: {count}件{elapsed}")
     
     def list_available_data(self):
         """利用可能データ一覧表示"""
@@ -308,17 +566,11 @@ class CarAnalysisSystem:
         print("📁 利用可能なデータ:")
         print("-" * 50)
         
-        for car_dir in scraped_dir.iterdir():
-            if car_dir.is_dir():
-                print(f"\n🚗 {car_dir.name}")
-                
-                for date_dir in car_dir.iterdir():
-                    if date_dir.is_dir():
-                        csv_files = list(date_dir.glob('*.csv'))
-                        for csv_file in csv_files:
-                            # ファイルサイズ取得
-                            size_mb = csv_file.stat().st_size / (1024 * 1024)
-                            print(f"  📄 {csv_file.name} ({size_mb:.1f}MB)")
+        for car, entries in get_catalog(self.project_root).cars().items():
+            print(f"\n🚗 {car}")
+            for entry in entries:
+                size_mb = entry['size'] / (1024 * 1024)
+                print(f"  📄 {entry['path'].name} ({entry['rows']}件, {size_mb:.1f}MB)")
     
     def interactive_mode(self):
         """インタラクティブモード"""
@@ -342,15 +594,57 @@ class CarAnalysisSystem:
             elif choice == '3':
                 self.list_available_data()
             elif choice == '4':
-                scraped_files = self.scrape_data()
-                for file_path in scraped_files:
-                    self.analyze_data(data_path=file_path)
+                try:
+                    self.run_pipeline()
+                except Exception as e:
+                    print(f"❌ 全工程の実行に失敗しました: {e}")
             elif choice == '5':
                 print("システムを終了します")
                 break
             else:
                 print("無効な選択です")
 
+def _matches_car(car_dir_name, pattern):
+    """車種ディレクトリ名が ``pattern`` を含むか（大文字小文字を区別しない部分一致）"""
+    return fnmatch.fnmatchcase(car_dir_name.lower(), f"*{pattern.lower()}*")
+
+def _since_date(value):
+    """--since の日付を ``YYYY-MM-DD`` に正規化"""
+    try:
+        return datetime.strptime(value.replace('/', '-'), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日付は YYYY-MM-DD 形式で指定してください: {value}")
+
+# ワーカープロセスごとの CarAnalysisSystem（正規化サービスの確認結果を再利用する）
+_worker_systems = {}
+
+def _analyze_fleet_file(car, path, tier, output_format=DEFAULT_OUTPUT_FORMAT, system=None):
+    """全車種分析の1ファイル分の処理（ワーカープロセスで実行）"""
+    start = time.perf_counter()
+    result = {'car': car, 'file': path, 'output': None, 'rows': 0, 'unique_grades': 0,
+              'high': 0, 'medium': 0, 'low': 0, 'seconds': 0.0, 'error': None}
+    try:
+        if system is None:
+            system = _worker_systems.get(output_format)
+            if system is None:
+                system = _worker_systems[output_format] = CarAnalysisSystem(output_format)
+        # ファイル単位で並列化しているため正規化は逐次処理
+        output_path, report = system.analyze_file(path, tier=tier, max_workers=1,
+                                                  output_tag=Path(path).stem)
+        quality = report.get('matching_quality', {})
+        result.update({
+            'output': str(output_path),
+            'rows': report.get('total_count', 0),
+            'unique_grades': report.get('unique_normalized_grades', 0),
+            'high': quality.get('high_confidence', 0),
+            'medium': quality.get('medium_confidence', 0),
+            'low': quality.get('low_confidence', 0)
+        })
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - start
+    return result
+
 def main():
     """メイン関数"""
     car_dirs = get_car_directories(project_root)
@@ -364,38 +658,69 @@ def main():
     parser = argparse.ArgumentParser(description='統合中古車分析システム', epilog=epilog)
     parser.add_argument('--scrape', action='store_true', help='スクレイピング実行')
     parser.add_argument('--analyze', action='store_true', help='分析実行')
-    parser.add_argument('--all', action='store_true', help='全工程実行')
+    parser.add_argument('--all', action='store_true', help='全工程実行（スクレイピングと分析を並行実行）')
     parser.add_argument('--interactive', action='store_true', help='インタラクティブモード')
     
     parser.add_argument('--path', help='分析対象ファイルパス')
     parser.add_argument('--car', help='車種名')
     parser.add_argument('--dir', help='車種データディレクトリパス')
     parser.add_argument('--latest', action='store_true', help='最新データ使用')
+    parser.add_argument('--all-cars', action='store_true',
+                        help='--analyze で全車種を一括分析（既定は各車種の最新ファイル）')
+    parser.add_argument('--since', type=_since_date, help='--all-cars / --incremental でこの日付 (YYYY-MM-DD) 以降の全ファイルを分析')
+    parser.add_argument('--incremental', action='store_true',
+                        help='--analyze で未分析のスナップショットのみ正規化し車種別の累積データに追加')
     parser.add_argument('--list', action='store_true', help='利用可能データ一覧')
+    parser.add_argument('--rebuild-catalog', action='store_true', help='データカタログを全走査で再構築')
+    parser.add_argument('--serve', action='store_true',
+                        help='正規化サービスを常駐起動（--analyze は起動中のサービスを自動で利用）')
+    parser.add_argument('--workers', type=int,
+                        help='--serve の並列正規化 / --all-cars の並列分析に使うプロセス数')
+    parser.add_argument('--renormalize', action='store_true',
+                        help='保存済みの正規化結果（増分分析の累積データを含む）を再正規化')
+    parser.add_argument('--changed', action='store_true',
+                        help='--renormalize で設定が変更された車種の行のみ再正規化')
+    parser.add_argument('--tier', choices=['exact', 'standard', 'full', 'auto'], default='full',
+                        help='グレード正規化の照合範囲 (auto: 解決できない行のみ上位段階へ)')
+    parser.add_argument('--format', choices=list(OUTPUT_FORMATS), default=DEFAULT_OUTPUT_FORMAT,
+                        help='分析結果の保存形式 (parquet は pyarrow が必要)')
     
     args = parser.parse_args()
     
-    system = CarAnalysisSystem()
+    system = CarAnalysisSystem(output_format=args.format)
     
     try:
         if args.interactive:
             system.interactive_mode()
         elif args.all:
             print("🚀 全工程を実行します")
-            scraped_files = system.scrape_data()
-            for file_path in scraped_files:
-                system.analyze_data(data_path=file_path)
+            system.run_pipeline(tier=args.tier)
         elif args.scrape:
             system.scrape_data()
+        elif args.analyze and args.incremental:
+            system.analyze_incremental(car=args.car, since=args.since, tier=args.tier)
+        elif args.analyze and args.all_cars:
+            system.analyze_fleet(since=args.since, workers=args.workers, tier=args.tier)
         elif args.analyze:
             system.analyze_data(
                 data_path=args.path,
                 car_name=args.car,
                 car_dir=args.dir,
-                use_latest=args.latest
+                use_latest=args.latest,
+                tier=args.tier
             )
+        elif args.serve:
+            system.serve_normalizer(workers=args.workers)
+        elif args.renormalize:
+            system.renormalize_outputs(changed_only=args.changed, tier=args.tier)
         elif args.list:
+            if args.rebuild_catalog:
+                get_catalog(project_root).rebuild()
             system.list_available_data()
+        elif args.rebuild_catalog:
+            catalog = get_catalog(project_root)
+            catalog.rebuild()
+            print(f"📚 データカタログを再構築しました: {len(catalog.entries())}ファイル")
         else:
             parser.print_help()
             
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Aho-Corasick法による複数パターン同時検索
+正規グレード文字列が入力に含まれるかを1回の走査で判定
+"""
+
+from collections import deque
+
+
+class AhoCorasickMatcher:
+    def __init__(self, patterns):
+        """パターン一覧からオートマトンを構築
+
+        パターンIDは ``patterns`` 内の位置。同一文字列が複数あれば
+        それぞれのIDが報告される。
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append(pattern_id)
+
+        self._build_failure_links()
+        self._output = [tuple(ids) for ids in self._output]
+
+    def _build_failure_links(self):
+        """失敗遷移を幅優先で構築し、出力を統合"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state].extend(self._output[self._fail[next_state]])
+
+    def find_all(self, text):
+        """``text`` に含まれる全パターンIDの集合を返す"""
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+
+        found = set(output[0])
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
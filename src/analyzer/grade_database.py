@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+正規グレードDB読み込み
+JSON/除外キーワード設定のパースとコンパイル済みキャッシュ管理
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+from collections.abc import Mapping
+from pathlib import Path
+
+# キャッシュ形式を変更した場合は更新する
+CACHE_VERSION = 1
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+DEFAULT_CACHE_DIR = Path("data") / "cache"
+
+logger = logging.getLogger(__name__)
+
+
+def read_grades_json(grades_json_path):
+    """正規グレードJSONを読み込み ``(生データ, 車種DB)`` を返す"""
+    raw = Path(grades_json_path).read_bytes()
+    return raw, build_grade_database(json.loads(raw.decode('utf-8')))
+
+
+def read_exclude_keywords(keywords_path):
+    """除外キーワードファイルを読み込み ``(生データ, キーワード一覧)`` を返す"""
+    raw = Path(keywords_path).read_bytes()
+    return raw, parse_exclude_keywords(raw)
+
+
+def parse_exclude_keywords(raw):
+    """除外キーワードファイルの内容をキーワード一覧に変換（#以降の行はコメント）"""
+    return [line.strip() for line in raw.decode('utf-8').splitlines()
+            if line.strip() and not line.startswith('#')]
+
+
+def build_grade_database(grades_data):
+    """JSONの車種リストを車種名キーの辞書に変換"""
+    car_grades_db = {}
+    for car_info in grades_data:
+        car_grades_db[car_info['car_name']] = build_car_entry(car_info)
+    return car_grades_db
+
+
+def build_car_entry(car_info):
+    """車種1件分のDBエントリを作成"""
+    return {
+        'grades': car_info['grades'],
+        'aliases': car_info.get('aliases', []),
+        'special_patterns': car_info.get('special_patterns', {})
+    }
+
+
+def build_alias_index(car_grades_db):
+    """エイリアスを持つ車種のみを定義順に並べたインデックス"""
+    return [(car_name, car_info['aliases'])
+            for car_name, car_info in car_grades_db.items()
+            if car_info.get('aliases')]
+
+
+def build_offset_index(raw):
+    """JSON配列内の各車種エントリのバイト位置インデックスを構築
+
+    ``(offsets, alias_index)`` を返す。``offsets`` は車種名から
+    ``(開始バイト, バイト長)`` への辞書で、車種名が重複する場合は
+    :func:`build_grade_database` と同様に後のエントリが優先される。
+    """
+    text = raw.decode('utf-8')
+    decoder = json.JSONDecoder()
+    offsets = {}
+    aliases = {}
+
+    pos = _JSON_WHITESPACE.match(text, 0).end()
+    if text[pos:pos + 1] != '[':
+        raise ValueError("正規グレードJSONの最上位が配列ではありません")
+    pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+
+    char_pos = byte_pos = 0
+    while text[pos:pos + 1] != ']':
+        car_info, end = decoder.raw_decode(text, pos)
+        byte_pos += len(text[char_pos:pos].encode('utf-8'))
+        byte_length = len(text[pos:end].encode('utf-8'))
+        char_pos = pos
+
+        car_name = car_info['car_name']
+        offsets[car_name] = (byte_pos, byte_length)
+        aliases[car_name] = car_info.get('aliases', [])
+
+        pos = _JSON_WHITESPACE.match(text, end).end()
+        if text[pos:pos + 1] == ',':
+            pos = _JSON_WHITESPACE.match(text, pos + 1).end()
+        elif text[pos:pos + 1] != ']':
+            raise ValueError(f"正規グレードJSONの形式が不正です (位置 {pos})")
+
+    alias_index = [(car_name, aliases[car_name]) for car_name in offsets if aliases[car_name]]
+    return offsets, alias_index
+
+
+class LazyGradeDatabase(Mapping):
+    """車種エントリをアクセス時にのみパースする読み取り専用DB
+
+    車種の存在確認や列挙はオフセットインデックスだけで行い、
+    ``db[car_name]`` で初めて該当箇所のバイト列を読み込んでパースする。
+    元ファイルが変更されていた場合はインデックスを作り直す。
+
+    ``buffer`` を指定した場合はファイルの代わりにそのバッファ
+    （JSON全体のバイト列やメモリマップ）から読み込む。
+
+    ``on_refresh`` はインデックス再構築時に新しいエイリアスインデックスを
+    引数として呼ばれる（DBを使う側のキャッシュ破棄用）。
+    """
+
+    def __init__(self, grades_json_path, offsets, stamp=None, buffer=None, on_refresh=None):
+        self.grades_json_path = Path(grades_json_path)
+        self._offsets = offsets
+        self._stamp = stamp
+        self._buffer = buffer
+        self._entries = {}
+        self.on_refresh = on_refresh
+
+    def __getitem__(self, car_name):
+        entry = self._entries.get(car_name)
+        if entry is None:
+            if car_name not in self._offsets:
+                raise KeyError(car_name)
+            entry = self._load_entry(car_name)
+            self._entries[car_name] = entry
+        return entry
+
+    def __contains__(self, car_name):
+        return car_name in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    @property
+    def loaded_count(self):
+        """パース済み車種数"""
+        return len(self._entries)
+
+    def _load_entry(self, car_name):
+        if self._buffer is not None:
+            start, length = self._offsets[car_name]
+            chunk = bytes(self._buffer[start:start + length])
+            return build_car_entry(json.loads(chunk.decode('utf-8')))
+
+        if self._stamp is not None and file_stamp(self.grades_json_path) != self._stamp:
+            logger.warning(f"正規グレードファイルが変更されたためインデックスを再構築します: {self.grades_json_path}")
+            self.refresh()
+            if car_name not in self._offsets:
+                raise KeyError(car_name)
+
+        start, length = self._offsets[car_name]
+        with open(self.grades_json_path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(length)
+        return build_car_entry(json.loads(chunk.decode('utf-8')))
+
+    def refresh(self):
+        """元ファイルからオフセットインデックスを再構築し、新しいエイリアスインデックスを返す"""
+        self._stamp = file_stamp(self.grades_json_path)
+        self._offsets, alias_index = build_offset_index(self.grades_json_path.read_bytes())
+        self._entries = {}
+        if self.on_refresh is not None:
+            self.on_refresh(alias_index)
+        return alias_index
+
+
+def content_fingerprint(*contents):
+    """設定ファイル内容のハッシュ（存在しないファイルは ``None``）"""
+    digest = hashlib.sha256()
+    for content in contents:
+        if content is None:
+            digest.update(b'\x00missing')
+        else:
+            digest.update(len(content).to_bytes(8, 'little'))
+            digest.update(content)
+    return digest.hexdigest()
+
+
+def file_stamp(path):
+    """``(mtime_ns, size)``。存在しない場合は ``None``"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_optional_bytes(path):
+    """ファイル内容を返す（存在しない場合は ``None``）"""
+    try:
+        return Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+class CompiledGradeCache:
+    """パース済みグレードDBのディスクキャッシュ
+
+    キャッシュにはDB本体・エイリアスインデックス・除外キーワードと、
+    元ファイルの ``(mtime, サイズ)`` および内容ハッシュを保存する。
+    mtime とサイズが一致すればそのまま使い、異なる場合は内容ハッシュを
+    比較して、変更があったときだけ再構築する。
+
+    ``lazy=True`` の場合はDB本体の代わりに車種エントリのバイト位置
+    インデックス (``offsets``) を保存する。
+    """
+
+    def __init__(self, grades_json_path, keywords_path, cache_dir=None, lazy=False):
+        self.grades_json_path = Path(grades_json_path)
+        self.keywords_path = Path(keywords_path)
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.lazy = lazy
+
+        source_key = hashlib.sha1(
+            str(self.grades_json_path.resolve()).encode('utf-8')).hexdigest()[:12]
+        prefix = "grade_offsets" if lazy else "grade_db"
+        self.cache_path = self.cache_dir / f"{prefix}_{source_key}.pickle"
+
+    def current_stamps(self):
+        return {
+            'grades': file_stamp(self.grades_json_path),
+            'keywords': file_stamp(self.keywords_path)
+        }
+
+    def load(self):
+        """有効なキャッシュがあれば内容を、なければ ``None`` を返す"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"グレードDBキャッシュ読み込みエラー: {e}")
+            return None
+
+        if not isinstance(payload, dict) or payload.get('version') != CACHE_VERSION:
+            return None
+        if ('offsets' in payload) != self.lazy:
+            return None
+
+        stamps = self.current_stamps()
+        if payload['stamps'] == stamps:
+            return payload
+
+        # mtimeのみ変わった場合は内容ハッシュで判定
+        fingerprint = content_fingerprint(read_optional_bytes(self.grades_json_path),
+                                          read_optional_bytes(self.keywords_path))
+        if fingerprint != payload['fingerprint']:
+            return None
+
+        payload['stamps'] = stamps
+        self.save(payload)
+        return payload
+
+    def build(self):
+        """設定ファイルからキャッシュ内容を構築"""
+        stamps = self.current_stamps()
+        keywords_raw, exclude_keywords = None, []
+        if self.keywords_path.exists():
+            keywords_raw, exclude_keywords = read_exclude_keywords(self.keywords_path)
+
+        payload = {
+            'version': CACHE_VERSION,
+            'stamps': stamps,
+            'exclude_keywords': exclude_keywords,
+            'keywords_found': keywords_raw is not None
+        }
+
+        grades_raw = read_optional_bytes(self.grades_json_path)
+        if self.lazy:
+            offsets, alias_index = {}, []
+            if grades_raw is not None:
+                offsets, alias_index = build_offset_index(grades_raw)
+            payload['offsets'] = offsets
+        else:
+            car_grades_db = {}
+            if grades_raw is not None:
+                car_grades_db = build_grade_database(json.loads(grades_raw.decode('utf-8')))
+            alias_index = build_alias_index(car_grades_db)
+            payload['car_grades_db'] = car_grades_db
+
+        payload['alias_index'] = alias_index
+        payload['fingerprint'] = content_fingerprint(grades_raw, keywords_raw)
+        payload['grades_found'] = grades_raw is not None
+        return payload
+
+    def save(self, payload):
+        """キャッシュを書き込み（一時ファイル経由で置換）"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"グレードDBキャッシュ書き込みエラー: {e}")
+
+    def load_or_build(self):
+        """キャッシュを読み込み、無効なら再構築して保存"""
+        payload = self.load()
+        if payload is not None:
+            return payload, True
+
+        payload = self.build()
+        self.save(payload)
+        return payload, False
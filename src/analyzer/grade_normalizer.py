@@ -5,49 +5,174 @@
 JSON設定による高精度グレードクリーニング
 """
 
+import hashlib
 import json
 import pandas as pd
 import re
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Tuple
 from difflib import SequenceMatcher
 import logging
+import sqlite3
+import time
+from collections import Counter
+
+from .aho_corasick import AhoCorasickMatcher
+from .grade_database import (
+    CompiledGradeCache, LazyGradeDatabase, build_alias_index, content_fingerprint,
+    read_exclude_keywords, read_grades_json, read_optional_bytes
+)
+
+# 類似度マッチングの採用しきい値
+SIMILARITY_THRESHOLD = 0.6
+
+# マッチング段階（照合範囲の狭い順）
+MATCH_TIERS = ('exact', 'standard', 'full')
+
+# 照合ロジックの版。マッチング処理の結果が変わる変更をした場合は更新する
+# （結果キャッシュのキーに含め、古いロジックの結果を参照しないようにする）
+RESULT_CACHE_VERSION = 3
+
+# 正規化結果に記録する車種ごとの設定ハッシュ列
+CONFIG_HASH_COLUMN = '正規化設定ハッシュ'
+
+# クリーニング結果を保持する入力文字列数の上限（超えたら破棄）
+CLEANED_CACHE_SIZE = 65536
+
+# 並列正規化を行う最小行数と、ワーカーに渡す1タスクあたりの最大行数
+PARALLEL_MIN_ROWS = 5000
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _ratio(matches, length):
+    """SequenceMatcher.ratio() と同じ式で比率を計算"""
+    return 2.0 * matches / length if length else 1.0
+
 
 class GradeNormalizer:
-    def __init__(self, grades_json_path=None):
+    def __init__(self, grades_json_path=None, exclude_keywords_path=None,
+                 cache_dir=None, use_cache=True, lazy=False, result_cache=None):
+        self._init_state(grades_json_path, exclude_keywords_path, cache_dir, use_cache, lazy)
+        self.result_cache = _open_result_cache(result_cache)
+        self.load_configuration()
+    
+    @classmethod
+    def from_loaded(cls, car_grades_db, exclude_keywords, alias_index, config_fingerprint,
+                    grades_json_path=None, exclude_keywords_path=None):
+        """読み込み済みのDBから作成（設定ファイルは読み込まない）"""
+        normalizer = cls.__new__(cls)
+        normalizer._init_state(grades_json_path, exclude_keywords_path,
+                               cache_dir=None, use_cache=False,
+                               lazy=not isinstance(car_grades_db, dict))
+        normalizer.car_grades_db = car_grades_db
+        normalizer.exclude_keywords = exclude_keywords
+        normalizer.config_fingerprint = config_fingerprint
+        normalizer._alias_index = alias_index
+        return normalizer
+    
+    def _init_state(self, grades_json_path, exclude_keywords_path, cache_dir, use_cache, lazy):
         if grades_json_path is None:
             grades_json_path = Path("config") / "car_grades.json"
         else:
             grades_json_path = Path(grades_json_path)
+        if exclude_keywords_path is None:
+            exclude_keywords_path = Path("config") / "exclude_keywords.txt"
+        else:
+            exclude_keywords_path = Path(exclude_keywords_path)
 
         self.grades_json_path = grades_json_path
+        self.exclude_keywords_path = exclude_keywords_path
+        self.cache_dir = cache_dir
+        self.use_cache = use_cache
+        # lazy=True の場合は要求された車種のエントリのみパースする
+        self.lazy = lazy
         self.car_grades_db = {}
         self.exclude_keywords = []
+        self.config_fingerprint = None
+        # 以下のメモ化用dictは共有インスタンス（normalizer_registry）として複数スレッドから
+        # ロックなしで参照・更新される。CPython（GIL）では dict の get / 代入が個々に
+        # アトミックであること、値が入力から決まるため競合しても同じ値を二重に計算する
+        # だけであること、無効化は clear() ではなく新しい dict への差し替えで行うことに
+        # 依存している（GILのない実行環境ではロックが必要）
+        self._alias_index = []
+        self._grade_indexes = {}
+        self._car_hashes = {}
+        self._exclude_patterns = []
+        self._exclude_patterns_source = ()
+        self._cleaned_cache = {}
+        # 正規化結果の永続キャッシュ（NormalizationResultCache、未使用なら None）
+        self.result_cache = None
+        self._result_cache_purged = None
         
         self.logger = logging.getLogger(__name__)
-        self.load_configuration()
     
     def load_configuration(self):
         """設定読み込み"""
+        if self.use_cache or self.lazy:
+            try:
+                self.load_compiled_configuration()
+                return
+            except Exception as e:
+                self.logger.warning(f"グレードDBキャッシュ利用不可のため直接読み込みます: {e}")
+        
         self.load_grades_database()
         self.load_exclude_keywords()
+        self.config_fingerprint = content_fingerprint(
+            read_optional_bytes(self.grades_json_path),
+            read_optional_bytes(self.exclude_keywords_path))
+    
+    def load_compiled_configuration(self):
+        """コンパイル済みキャッシュから設定読み込み（無効なら再構築）"""
+        cache = CompiledGradeCache(self.grades_json_path, self.exclude_keywords_path,
+                                   self.cache_dir, lazy=self.lazy)
+        if self.use_cache:
+            payload, from_cache = cache.load_or_build()
+        else:
+            payload, from_cache = cache.build(), False
+        
+        if self.lazy:
+            self.car_grades_db = LazyGradeDatabase(self.grades_json_path, payload['offsets'],
+                                                   payload['stamps']['grades'],
+                                                   on_refresh=self._on_database_refresh)
+        else:
+            self.car_grades_db = payload['car_grades_db']
+        self.exclude_keywords = payload['exclude_keywords']
+        self.config_fingerprint = payload['fingerprint']
+        self._alias_index = payload['alias_index']
+        self._grade_indexes = {}
+        self._car_hashes = {}
+        
+        source = "キャッシュ" if from_cache else "JSON"
+        if self.lazy:
+            source += "・遅延読み込み"
+        if payload['grades_found']:
+            self.logger.info(f"正規グレードDB読み込み({source}): {len(self.car_grades_db)}車種")
+        else:
+            self.logger.warning(f"正規グレードファイルが見つかりません: {self.grades_json_path}")
+        if payload['keywords_found']:
+            self.logger.info(f"除外キーワード読み込み: {len(self.exclude_keywords)}件")
+        else:
+            self.logger.warning("除外キーワードファイルが見つかりません")
+    
+    def _on_database_refresh(self, alias_index):
+        """遅延読み込みDBの再構築時にエイリアス・グレードインデックスと設定ハッシュを更新"""
+        self._alias_index = alias_index
+        self._grade_indexes = {}
+        self._car_hashes = {}
+        self.config_fingerprint = content_fingerprint(
+            read_optional_bytes(self.grades_json_path),
+            read_optional_bytes(self.exclude_keywords_path))
     
     def load_grades_database(self):
         """正規グレードデータベース読み込み"""
         try:
             if self.grades_json_path.exists():
-                with open(self.grades_json_path, 'r', encoding='utf-8') as f:
-                    grades_data = json.load(f)
-                
-                self.car_grades_db = {}
-                for car_info in grades_data:
-                    car_name = car_info['car_name']
-                    self.car_grades_db[car_name] = {
-                        'grades': car_info['grades'],
-                        'aliases': car_info.get('aliases', []),
-                        'special_patterns': car_info.get('special_patterns', {})
-                    }
+                _, self.car_grades_db = read_grades_json(self.grades_json_path)
+                self._alias_index = build_alias_index(self.car_grades_db)
+                self._grade_indexes = {}
+                self._car_hashes = {}
                 
                 self.logger.info(f"正規グレードDB読み込み: {len(self.car_grades_db)}車種")
             else:
@@ -56,16 +181,13 @@ class GradeNormalizer:
         except Exception as e:
             self.logger.error(f"正規グレードDB読み込みエラー: {e}")
             self.car_grades_db = {}
+            self._alias_index = []
     
     def load_exclude_keywords(self):
         """除外キーワード読み込み"""
-        keywords_file = Path("config") / "exclude_keywords.txt"
-        
         try:
-            if keywords_file.exists():
-                with open(keywords_file, 'r', encoding='utf-8') as f:
-                    self.exclude_keywords = [line.strip() for line in f 
-                                           if line.strip() and not line.startswith('#')]
+            if self.exclude_keywords_path.exists():
+                _, self.exclude_keywords = read_exclude_keywords(self.exclude_keywords_path)
                 self.logger.info(f"除外キーワード読み込み: {len(self.exclude_keywords)}件")
             else:
                 self.logger.warning("除外キーワードファイルが見つかりません")
@@ -76,16 +198,22 @@ class GradeNormalizer:
             self.exclude_keywords = []
     
     def clean_grade_text(self, grade_text):
-        """グレードテキストクリーニング"""
+        """グレードテキストクリーニング（入力文字列ごとに結果を再利用）"""
         if not grade_text:
             return ""
         
-        cleaned = grade_text
+        patterns = self._get_exclude_patterns()
+        cleaned = self._cleaned_cache.get(grade_text)
+        if cleaned is not None:
+            return cleaned
         
-        # 除外キーワードの削除
-        for keyword in self.exclude_keywords:
-            pattern = rf'\b{re.escape(keyword)}\b'
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        # 除外キーワードの削除（テキストに含まれるキーワードのみ正規表現を適用）
+        cleaned = grade_text
+        lowered = cleaned.lower()
+        for keyword, pattern in patterns:
+            if keyword in lowered:
+                cleaned = pattern.sub('', cleaned)
+                lowered = cleaned.lower()
         
         # 不要文字の削除
         cleaned = re.sub(r'[（）\(\)\[\]【】]', '', cleaned)
@@ -93,18 +221,42 @@ class GradeNormalizer:
         cleaned = re.sub(r'\s+', ' ', cleaned)
         cleaned = cleaned.strip()
         
+        if len(self._cleaned_cache) >= CLEANED_CACHE_SIZE:
+            self._cleaned_cache = {}
+        self._cleaned_cache[grade_text] = cleaned
         return cleaned
     
+    def _get_exclude_patterns(self):
+        """除外キーワードと正規表現の組（キーワード変更時は再構築）"""
+        keywords = tuple(self.exclude_keywords)
+        if self._exclude_patterns_source != keywords:
+            self._exclude_patterns = [
+                (keyword.lower(), re.compile(rf'\b{re.escape(keyword)}\b', re.IGNORECASE))
+                for keyword in keywords
+            ]
+            self._exclude_patterns_source = keywords
+            self._cleaned_cache = {}
+        return self._exclude_patterns
+    
     def extract_core_grade(self, grade_text, car_name=None):
         """コアグレード抽出"""
-        cleaned = self.clean_grade_text(grade_text)
-        
-        # 車種固有の特殊パターン
+        return self._extract_core_from_cleaned(self.clean_grade_text(grade_text), car_name)
+    
+    def _find_special_pattern(self, cleaned, car_name):
+        """車種固有の特殊パターンに一致した正規グレード（なければ ``None``）"""
         if car_name and car_name in self.car_grades_db:
             special_patterns = self.car_grades_db[car_name].get('special_patterns', {})
             for pattern, normalized in special_patterns.items():
                 if pattern.lower() in cleaned.lower():
                     return normalized
+        return None
+    
+    def _extract_core_from_cleaned(self, cleaned, car_name=None):
+        """クリーニング済みテキストからコアグレード抽出"""
+        # 車種固有の特殊パターン
+        special = self._find_special_pattern(cleaned, car_name)
+        if special is not None:
+            return special
         
         # パターンマッチング
         patterns = [
@@ -150,9 +302,8 @@ class GradeNormalizer:
         if car_name in self.car_grades_db:
             return car_name
         
-        # エイリアスチェック
-        for norm_name, car_info in self.car_grades_db.items():
-            aliases = car_info.get('aliases', [])
+        # エイリアスチェック（エイリアスを持つ車種のみ定義順に確認）
+        for norm_name, aliases in self._alias_index:
             if car_name in aliases:
                 return norm_name
             
@@ -162,55 +313,234 @@ class GradeNormalizer:
         
         return car_name
     
-    def find_best_grade_match(self, input_grade, car_name):
-        """最適グレードマッチング"""
+    def car_config_hash(self, car_name, tier='full'):
+        """車種ごとの正規化設定ハッシュ（16桁）
+        
+        解決後の車種名・その車種のDBエントリ・除外キーワード・``tier`` と
+        :data:`RESULT_CACHE_VERSION` から計算するため、他の車種の設定変更では
+        値が変わらない。
+        """
+        key = (car_name, tier)
+        car_hash = self._car_hashes.get(key)
+        if car_hash is None:
+            normalized_car_name = self.normalize_car_name(car_name)
+            entry = self.car_grades_db.get(normalized_car_name)
+            digest = hashlib.sha256(json.dumps(
+                [RESULT_CACHE_VERSION, tier, normalized_car_name, entry, self.exclude_keywords],
+                ensure_ascii=False, sort_keys=True).encode('utf-8'))
+            car_hash = digest.hexdigest()[:16]
+            self._car_hashes[key] = car_hash
+        return car_hash
+    
+    def get_grade_index(self, car_name):
+        """車種別グレードインデックス取得（初回アクセス時に構築）"""
+        index = self._grade_indexes.get(car_name)
+        if index is None:
+            index = self.build_grade_index(self.car_grades_db[car_name]['grades'])
+            self._grade_indexes[car_name] = index
+        return index
+    
+    @staticmethod
+    def build_grade_index(official_grades):
+        """類似度の上限計算に使う前処理済みデータを構築"""
+        lowered = [grade.lower() for grade in official_grades]
+        first_index = {}
+        for i, grade in enumerate(lowered):
+            first_index.setdefault(grade, i)
+        return {
+            'grades': list(official_grades),
+            'lowered': lowered,
+            'first_index': first_index,
+            'lengths': [len(grade) for grade in lowered],
+            'char_counts': [Counter(grade) for grade in lowered],
+            'matcher': AhoCorasickMatcher(lowered)
+        }
+    
+    def find_best_grade_match(self, input_grade, car_name, tier='full'):
+        """最適グレードマッチング
+        
+        ``tier`` で照合範囲を選択する:
+        
+        - ``'exact'``: 完全一致・車種固有の特殊パターンのみ（ハッシュ検索）。
+          入力がそのまま正規グレードと一致する場合はクリーニングも行わない
+          （この場合のみ他の段階と結果が異なることがある）
+        - ``'standard'``: コアグレード一致と部分一致を追加
+        - ``'full'``: 類似度によるあいまい一致を追加（従来の動作）
+        - ``'auto'``: ``exact`` から順に、解決できなかった場合のみ上位の段階を実行
+        
+        ``auto`` は部分一致で解決した行に対して類似度照合を行わないため、
+        より類似度の高い候補がある場合は ``full`` と結果が異なることがある。
+        """
+        return self._match_grade(input_grade, car_name, self.normalize_car_name(car_name), tier)
+    
+    def normalize_grades_for_car(self, car_name, grades, tier='full', stats=None):
+        """同一車種のグレード一覧を正規化
+        
+        車種名の解決は1回だけ行い、同じグレード文字列の結果は再利用する。
+        ``None`` のグレードは ``('ベース', 0.0)`` になる。``stats``
+        (:class:`TierStats`) を渡すと段階ごとの解決件数と処理時間を加算する。
+        """
         normalized_car_name = self.normalize_car_name(car_name)
+        results = {}
+        matches = []
+        for grade in grades:
+            cached = results.get(grade)
+            if cached is None:
+                if grade is None:
+                    cached = ('ベース', 0.0), 'unresolved'
+                else:
+                    cached = self._match_grade_in_tiers(grade, car_name, normalized_car_name,
+                                                        tier, stats)
+                results[grade] = cached
+            match, resolved_tier = cached
+            if stats is not None:
+                stats.rows[resolved_tier] += 1
+            matches.append(match)
+        return matches
+    
+    def _match_grade(self, input_grade, car_name, normalized_car_name, tier='full'):
+        """解決済み車種名に対するグレードマッチング"""
+        match, _ = self._match_grade_in_tiers(input_grade, car_name, normalized_car_name, tier)
+        return match
+    
+    def _match_grade_in_tiers(self, input_grade, car_name, normalized_car_name, tier, stats=None):
+        """段階的マッチング。``((正規グレード, 精度), 解決した段階)`` を返す
+        
+        指定段階で解決できなかった場合の段階名は ``'unresolved'``。
+        """
+        if tier == 'auto':
+            tiers = MATCH_TIERS
+        elif tier in MATCH_TIERS:
+            tiers = (tier,)
+        else:
+            raise ValueError(f"不明な正規化ティア: {tier}")
         
-        if normalized_car_name not in self.car_grades_db:
-            core_grade = self.extract_core_grade(input_grade, car_name)
-            return core_grade, 0.0
+        # テキストクリーニングの時間は最初に実行する段階に含める
+        started = time.perf_counter()
+        
+        # exact のみ: 入力そのもの（前後の空白を除く）が正規グレードならクリーニング不要
+        # （他の段階はクリーニング後の照合結果を変えないよう従来どおり）
+        if tier == 'exact' and normalized_car_name in self.car_grades_db:
+            index = self.get_grade_index(normalized_car_name)
+            raw_index = index['first_index'].get(input_grade.strip().lower())
+            if raw_index is not None:
+                if stats is not None:
+                    stats.seconds[tier] += time.perf_counter() - started
+                return (index['grades'][raw_index], 1.0), tier
         
-        car_info = self.car_grades_db[normalized_car_name]
-        official_grades = car_info['grades']
         cleaned_input = self.clean_grade_text(input_grade)
-        core_grade = self.extract_core_grade(input_grade, normalized_car_name)
+        match = None
+        for current in tiers:
+            match, resolved = self._match_in_tier(input_grade, cleaned_input, car_name,
+                                                  normalized_car_name, current)
+            if stats is not None:
+                finished = time.perf_counter()
+                stats.seconds[current] += finished - started
+                started = finished
+            if resolved:
+                return match, current
+        return match, 'unresolved'
+    
+    def _match_in_tier(self, input_grade, cleaned_input, car_name, normalized_car_name, tier):
+        """1段階分のマッチング。``((正規グレード, 精度), 解決可否)`` を返す"""
+        if normalized_car_name not in self.car_grades_db:
+            # 正規グレードがない車種はコアグレード抽出が最終結果（exact では未解決扱い）
+            return (self._extract_core_from_cleaned(cleaned_input, car_name), 0.0), tier != 'exact'
         
-        best_match = core_grade
-        best_score = 0.0
+        index = self.get_grade_index(normalized_car_name)
+        first_index = index['first_index']
+        cleaned_lower = cleaned_input.lower()
         
-        for official_grade in official_grades:
-            # 完全一致
-            if cleaned_input.lower() == official_grade.lower():
-                return official_grade, 1.0
-            
-            # コアグレード完全一致
-            if core_grade.lower() == official_grade.lower():
-                return official_grade, 0.95
-            
-            # 部分一致
-            if core_grade.lower() in official_grade.lower():
-                score = self.similarity_score(cleaned_input, official_grade)
-                if score > best_score:
-                    best_match = official_grade
-                    best_score = score
+        if tier == 'exact':
+            core_grade = self._find_special_pattern(cleaned_input, normalized_car_name)
+        else:
+            core_grade = self._extract_core_from_cleaned(cleaned_input, normalized_car_name)
+        
+        # 完全一致・コアグレード完全一致（先に現れたグレードを優先）
+        exact_index = first_index.get(cleaned_lower)
+        core_index = None if core_grade is None else first_index.get(core_grade.lower())
+        if exact_index is not None and (core_index is None or exact_index <= core_index):
+            return (index['grades'][exact_index], 1.0), True
+        if core_index is not None:
+            return (index['grades'][core_index], 0.95), True
+        
+        if tier == 'exact':
+            return (core_grade or cleaned_input or 'ベース', 0.0), False
+        
+        match, found = self._find_best_similarity_match(index, cleaned_lower, core_grade,
+                                                        fuzzy=(tier == 'full'))
+        return match, found or tier == 'full'
+    
+    def _find_best_similarity_match(self, index, cleaned_lower, core_grade, fuzzy=True):
+        """上限値による枝刈り付き類似度マッチング
+        
+        部分一致・逆方向部分一致の候補は類似度に関わらず、それ以外は
+        しきい値を超えた場合のみ採用する（``fuzzy=False`` なら採用しない）。文字数による上限
+        (real_quick_ratio相当) の降順に候補を調べ、文字頻度による上限
+        (quick_ratio相当) でも最良値に届かない候補は ratio() を計算しない。
+        同点の場合は元のグレード順で先のものを採用するため、全候補を
+        順に計算した場合と同じ結果になる。
+        
+        ``((正規グレード, 精度), 候補が見つかったか)`` を返す。
+        """
+        core_lower = core_grade.lower()
+        input_length = len(cleaned_lower)
+        lengths = index['lengths']
+        # 逆方向部分一致（入力に含まれる正規グレード）を一括検出
+        contained_in_input = index['matcher'].find_all(cleaned_lower)
+        
+        candidates = []
+        for i, official_lower in enumerate(index['lowered']):
+            contained = i in contained_in_input or core_lower in official_lower
+            total = input_length + lengths[i]
+            bound = _ratio(min(input_length, lengths[i]), total)
+            if contained or (fuzzy and bound > SIMILARITY_THRESHOLD):
+                candidates.append((-bound, i, contained, total))
+        candidates.sort()
+        
+        best_index = len(lengths)
+        best_score = 0.0
+        input_counts = None
+        
+        for negative_bound, i, contained, total in candidates:
+            bound = -negative_bound
+            if bound < best_score:
+                break
+            if bound == best_score and i > best_index:
+                continue
             
-            # 逆方向部分一致
-            if official_grade.lower() in cleaned_input.lower():
-                score = self.similarity_score(cleaned_input, official_grade)
-                if score > best_score:
-                    best_match = official_grade
-                    best_score = score
+            # 文字頻度による上限
+            if input_counts is None:
+                input_counts = Counter(cleaned_lower)
+            matches = sum(min(count, input_counts[char])
+                          for char, count in index['char_counts'][i].items())
+            bound = _ratio(matches, total)
+            if bound < best_score or (bound == best_score and i > best_index):
+                continue
+            if not contained and bound <= SIMILARITY_THRESHOLD:
+                continue
             
-            # 類似度チェック
-            score = self.similarity_score(cleaned_input, official_grade)
-            if score > best_score and score > 0.6:
-                best_match = official_grade
+            score = SequenceMatcher(None, cleaned_lower, index['lowered'][i]).ratio()
+            if not contained and score <= SIMILARITY_THRESHOLD:
+                continue
+            if score > best_score or (score == best_score and score > 0 and i < best_index):
+                best_index = i
                 best_score = score
         
-        return best_match, best_score
+        if best_index < len(lengths):
+            return (index['grades'][best_index], best_score), True
+        return (core_grade, 0.0), False
     
-    def normalize_dataframe(self, df):
-        """DataFrameグレード正規化"""
+    def normalize_dataframe(self, df, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE, tier='full'):
+        """DataFrameグレード正規化
+        
+        行ごとの車種名で正規グレードを照合する。行数が多い場合は
+        車種ごと（大きい車種はさらに ``chunk_size`` 行ごと）に分割して
+        プロセスプールで並列処理し、元の行順で結果を返す。
+        ``max_workers=1`` で並列処理を無効化できる。``tier`` は
+        :meth:`find_best_grade_match` を参照。段階ごとの解決件数と処理時間は
+        ``result_df.attrs['tier_stats']`` に記録される。
+        """
         if df is None or df.empty:
             self.logger.warning("空のDataFrameです")
             return df
@@ -221,48 +551,234 @@ class GradeNormalizer:
         
         self.logger.info("グレード正規化開始...")
         
+        car_names = df['車種名'] if '車種名' in df.columns else "Unknown"
+        tier_stats = TierStats()
+        normalized_grades, match_scores = self.normalize_batch(
+            car_names, df['グレード'], max_workers=max_workers, chunk_size=chunk_size,
+            score_dtype='float64', tier=tier, stats=tier_stats)
+        return build_normalized_dataframe(df, normalized_grades, match_scores,
+                                          self.config_hashes(car_names, len(df), tier),
+                                          tier_stats.as_dict(), self.logger)
+    
+    def renormalize_dataframe(self, df, changed_only=True, max_workers=None,
+                              chunk_size=DEFAULT_CHUNK_SIZE, tier='full'):
+        """正規化済みDataFrameを現在の設定で再正規化
+        
+        ``changed_only=True`` の場合は、記録された設定ハッシュ
+        (:data:`CONFIG_HASH_COLUMN`) が現在の値と異なる行だけを照合し直す。
+        ハッシュ列がない場合は全行が対象。再正規化した行数は
+        ``result_df.attrs['renormalized_rows']`` に記録される。
+        """
+        if df is None or df.empty or '正規グレード' not in df.columns or 'グレード' not in df.columns:
+            return self.normalize_dataframe(df, max_workers=max_workers, chunk_size=chunk_size, tier=tier)
+        
+        car_names = df['車種名'] if '車種名' in df.columns else "Unknown"
+        current_hashes = self.config_hashes(car_names, len(df), tier)
+        if changed_only and CONFIG_HASH_COLUMN in df.columns:
+            positions = [position for position, (stored, current)
+                         in enumerate(zip(df[CONFIG_HASH_COLUMN].tolist(), current_hashes))
+                         if stored != current]
+        else:
+            positions = list(range(len(df)))
+        
         result_df = df.copy()
-        normalized_grades = []
-        match_scores = []
-        original_grades = []
-        
-        # 車種名取得
-        car_name = df['車種名'].iloc[0] if '車種名' in df.columns else "Unknown"
-        
-        for idx, grade in enumerate(df['グレード']):
-            if pd.isna(grade):
-                normalized_grade = 'ベース'
-                score = 0.0
-                original_grade = ''
+        result_df[CONFIG_HASH_COLUMN] = current_hashes
+        result_df.attrs['renormalized_rows'] = len(positions)
+        if not positions:
+            self.logger.info("設定が変更された車種はありません")
+            return result_df
+        
+        self.logger.info(f"再正規化: {len(positions)}/{len(df)}件")
+        changed = df.iloc[positions]
+        changed_cars = changed['車種名'] if '車種名' in df.columns else "Unknown"
+        tier_stats = TierStats()
+        normalized_grades, match_scores = self.normalize_batch(
+            changed_cars, changed['グレード'], max_workers=max_workers, chunk_size=chunk_size,
+            score_dtype='float64', tier=tier, stats=tier_stats)
+        result_df.attrs['tier_stats'] = tier_stats.as_dict()
+        
+        original = changed['グレード'].astype(str).where(changed['グレード'].notna(), '')
+        for column, values in (('元グレード', original.tolist()),
+                               ('正規グレード', normalized_grades),
+                               ('マッチング精度', match_scores)):
+            if column not in result_df.columns:
+                result_df[column] = None
+            result_df.iloc[positions, result_df.columns.get_loc(column)] = values
+        return result_df
+    
+    def config_hashes(self, car_names, count, tier='full'):
+        """行ごとの車種設定ハッシュ一覧（``car_names`` は :meth:`normalize_batch` と同形式）"""
+        if car_names is None or isinstance(car_names, str):
+            return [self.car_config_hash(car_names or "Unknown", tier)] * count
+        return [self.car_config_hash("Unknown" if name is None else name, tier)
+                for name in _to_optional_strings(car_names)]
+    
+    def normalize_batch(self, car_names, grades, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                        score_dtype='float32', categorical=False, tier='full', stats=None):
+        """車種名・グレードの配列を一括正規化
+        
+        ``car_names`` と ``grades`` には任意のシーケンスまたは pandas Series を
+        渡せる。``car_names`` に文字列を渡すと全行をその車種として扱う。
+        欠損グレードは ``'ベース'`` (精度0.0) になる。``tier`` と ``stats`` は
+        :meth:`normalize_grades_for_car` を参照。
+        
+        Returns:
+            ``(正規グレード, マッチング精度)``。正規グレードは object 型の
+            ndarray（``categorical=True`` なら pandas.Categorical）、精度は
+            ``score_dtype`` の ndarray。
+        """
+        import numpy as np
+        
+        grade_values = _to_optional_strings(grades)
+        if car_names is None or isinstance(car_names, str):
+            car_values = [car_names or "Unknown"] * len(grade_values)
+        else:
+            car_values = ["Unknown" if name is None else name
+                          for name in _to_optional_strings(car_names)]
+            if len(car_values) != len(grade_values):
+                raise ValueError(f"車種名とグレードの件数が一致しません: {len(car_values)} != {len(grade_values)}")
+        
+        matches = self.normalize_grade_rows(car_values, grade_values, max_workers, chunk_size,
+                                            tier=tier, stats=stats)
+        
+        normalized = np.empty(len(matches), dtype=object)
+        normalized[:] = [grade for grade, _ in matches]
+        scores = np.fromiter((score for _, score in matches), dtype=score_dtype, count=len(matches))
+        if categorical:
+            normalized = pd.Categorical(normalized)
+        return normalized, scores
+    
+    def normalize_grade_rows(self, car_names, grades, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                             tier='full', stats=None):
+        """行ごとの ``(車種名, グレード)`` を正規化し、行順の ``(正規グレード, 精度)`` を返す
+        
+        結果キャッシュが有効な場合は、キャッシュにない組み合わせのみ照合して保存する。
+        """
+        if tier != 'auto' and tier not in MATCH_TIERS:
+            raise ValueError(f"不明な正規化ティア: {tier}")
+        if self.result_cache is not None and self.config_fingerprint is not None:
+            return self._normalize_rows_with_cache(car_names, grades, max_workers, chunk_size,
+                                                   tier, stats)
+        return self._normalize_rows(car_names, grades, max_workers, chunk_size, tier, stats)
+    
+    @property
+    def result_cache_key(self):
+        """結果キャッシュのキー（照合ロジックの版 + 設定ハッシュ）"""
+        return f"v{RESULT_CACHE_VERSION}:{self.config_fingerprint}"
+    
+    def _normalize_rows_with_cache(self, car_names, grades, max_workers, chunk_size, tier, stats):
+        """結果キャッシュを参照・更新しながら正規化"""
+        fingerprint = self.result_cache_key
+        try:
+            if self._result_cache_purged != fingerprint:
+                self.result_cache.purge_stale(fingerprint)
+                self._result_cache_purged = fingerprint
+            cached = self.result_cache.lookup(fingerprint, tier, set(car_names))
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"正規化結果キャッシュを利用できません: {e}")
+            return self._normalize_rows(car_names, grades, max_workers, chunk_size, tier, stats)
+        
+        results = [None] * len(grades)
+        missing = []
+        for position, (car_name, grade) in enumerate(zip(car_names, grades)):
+            match = cached[car_name].get(grade) if grade is not None else None
+            if match is None:
+                missing.append(position)
             else:
-                original_grade = str(grade)
-                normalized_grade, score = self.find_best_grade_match(original_grade, car_name)
-            
-            normalized_grades.append(normalized_grade)
-            match_scores.append(score)
-            original_grades.append(original_grade)
-            
-            if (idx + 1) % 100 == 0:
-                self.logger.info(f"正規化進捗: {idx + 1}/{len(df)}")
+                results[position] = match
+        
+        hits = len(grades) - len(missing)
+        if stats is not None:
+            stats.rows['cached'] += hits
+        self.logger.info(f"正規化結果キャッシュ: {hits}/{len(grades)}件ヒット")
+        if not missing:
+            return results
+        
+        missing_cars = [car_names[p] for p in missing]
+        missing_grades = [grades[p] for p in missing]
+        matches = self._normalize_rows(missing_cars, missing_grades, max_workers, chunk_size,
+                                       tier, stats)
+        entries = {}
+        for position, car_name, grade, match in zip(missing, missing_cars, missing_grades, matches):
+            results[position] = match
+            if grade is not None:
+                entries[(car_name, grade)] = match
         
-        # 新列追加
-        result_df['元グレード'] = original_grades
-        result_df['正規グレード'] = normalized_grades
-        result_df['マッチング精度'] = match_scores
-        
-        # 統計
-        high_confidence = sum(1 for s in match_scores if s >= 0.8)
-        medium_confidence = sum(1 for s in match_scores if 0.6 <= s < 0.8)
-        low_confidence = sum(1 for s in match_scores if s < 0.6)
+        try:
+            self.result_cache.store(fingerprint, tier,
+                                    [(car_name, grade, normalized, score)
+                                     for (car_name, grade), (normalized, score) in entries.items()])
+        except (sqlite3.Error, OSError) as e:
+            self.logger.warning(f"正規化結果キャッシュ書き込みエラー: {e}")
+        return results
+    
+    def _normalize_rows(self, car_names, grades, max_workers, chunk_size, tier, stats):
+        """キャッシュを使わずに行ごとに正規化（行数が多い場合は並列処理）"""
+        tasks = split_rows_by_car(car_names, chunk_size)
+        total = len(grades)
+        
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(tasks))
+        
+        results = [None] * total
+        done = 0
+        
+        def store(positions, matches):
+            nonlocal done
+            for position, match in zip(positions, matches):
+                results[position] = match
+            done += len(positions)
+            self.logger.info(f"正規化進捗: {done}/{total}")
+        
+        if max_workers > 1 and total >= PARALLEL_MIN_ROWS:
+            try:
+                self.logger.info(f"並列正規化: {len(tasks)}タスク / {max_workers}プロセス")
+                initializer, initargs = self._worker_initializer()
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=initializer,
+                                         initargs=initargs) as executor:
+                    futures = [
+                        (positions, executor.submit(_normalize_chunk, car_name,
+                                                    [grades[p] for p in positions], tier))
+                        for car_name, positions in tasks
+                    ]
+                    chunk_stats = TierStats()
+                    for positions, future in futures:
+                        matches, worker_stats = future.result()
+                        store(positions, matches)
+                        chunk_stats.merge(worker_stats)
+                if stats is not None:
+                    stats.merge(chunk_stats.as_dict())
+                return results
+            except Exception as e:
+                self.logger.warning(f"並列正規化に失敗したため逐次処理します: {e}")
+                done = 0
+        
+        for car_name, positions in tasks:
+            store(positions, self.normalize_grades_for_car(car_name, [grades[p] for p in positions],
+                                                           tier=tier, stats=stats))
+        return results
+    
+    def _worker_initializer(self):
+        """ワーカープロセスの初期化関数と引数
         
-        self.logger.info(f"正規化完了:")
-        self.logger.info(f"  高精度(≥80%): {high_confidence}件")
-        self.logger.info(f"  中精度(60-80%): {medium_confidence}件")
-        self.logger.info(f"  低精度(<60%): {low_confidence}件")
+        通常はメモリマップ共有インデックスを使い、全ワーカーでDB本体を
+        共有する。作成できない場合は各ワーカーが設定ファイルを読み込む。
+        """
+        try:
+            from .shared_index import publish_grade_index
+            index_path = publish_grade_index(self.grades_json_path, self.exclude_keywords_path,
+                                             self.cache_dir)
+            return _init_mapped_worker, (str(index_path),)
+        except Exception as e:
+            self.logger.warning(f"共有グレードインデックスを利用できません: {e}")
         
-        return result_df
+        return _init_worker, (str(self.grades_json_path), str(self.exclude_keywords_path),
+                              None if self.cache_dir is None else str(self.cache_dir),
+                              self.use_cache)
     
-    def get_normalization_report(self, df):
+    @staticmethod
+    def get_normalization_report(df):
         """正規化レポート生成"""
         if '正規グレード' not in df.columns:
             return {}
@@ -271,10 +787,8 @@ class GradeNormalizer:
         unique_original = df['元グレード'].nunique() if '元グレード' in df.columns else 0
         unique_normalized = df['正規グレード'].nunique()
         
-        scores = df['マッチング精度'].values
-        high_confidence = sum(1 for s in scores if s >= 0.8)
-        medium_confidence = sum(1 for s in scores if 0.6 <= s < 0.8)
-        low_confidence = sum(1 for s in scores if s < 0.6)
+        high_confidence, medium_confidence, low_confidence = count_confidence_levels(
+            df['マッチング精度'].to_numpy())
         
         grade_counts = df['正規グレード'].value_counts().to_dict()
         
@@ -292,5 +806,127 @@ class GradeNormalizer:
                 'low_confidence': low_confidence
             },
             'grade_distribution': grade_counts,
-            'mapping_examples': mapping_examples
-        }
\ No newline at end of file
+            'mapping_examples': mapping_examples,
+            'tier_stats': df.attrs.get('tier_stats', {})
+        }
+
+
+class TierStats:
+    """マッチング段階ごとの解決件数と処理時間（秒）"""
+    
+    def __init__(self):
+        # cached は結果キャッシュから取得した行
+        self.rows = {tier: 0 for tier in ('cached',) + MATCH_TIERS + ('unresolved',)}
+        self.seconds = {tier: 0.0 for tier in MATCH_TIERS}
+    
+    def merge(self, other):
+        """:meth:`as_dict` 形式の統計を加算"""
+        for tier, count in other['rows'].items():
+            self.rows[tier] = self.rows.get(tier, 0) + count
+        for tier, seconds in other['seconds'].items():
+            self.seconds[tier] = self.seconds.get(tier, 0.0) + seconds
+    
+    def as_dict(self):
+        return {'rows': dict(self.rows), 'seconds': dict(self.seconds)}
+
+
+def build_normalized_dataframe(df, normalized_grades, match_scores, config_hashes, tier_stats,
+                               logger=None):
+    """正規化結果の列を追加したDataFrameを作成し、精度と段階別の集計をログ出力"""
+    result_df = df.copy()
+    result_df.attrs['tier_stats'] = tier_stats
+    
+    # 新列追加
+    result_df['元グレード'] = df['グレード'].astype(str).where(df['グレード'].notna(), '')
+    result_df['正規グレード'] = normalized_grades
+    result_df['マッチング精度'] = match_scores
+    result_df[CONFIG_HASH_COLUMN] = config_hashes
+    
+    # 統計
+    logger = logger or logging.getLogger(__name__)
+    high_confidence, medium_confidence, low_confidence = count_confidence_levels(match_scores)
+    
+    logger.info(f"正規化完了:")
+    logger.info(f"  高精度(≥80%): {high_confidence}件")
+    logger.info(f"  中精度(60-80%): {medium_confidence}件")
+    logger.info(f"  低精度(<60%): {low_confidence}件")
+    for tier_name, count in tier_stats['rows'].items():
+        if count:
+            logger.info(f"  {tier_name}: {count}件 ({tier_stats['seconds'].get(tier_name, 0.0):.3f}秒)")
+    
+    return result_df
+
+
+def count_confidence_levels(scores):
+    """マッチング精度を ``(高精度(≥0.8), 中精度(0.6-0.8), 低精度(<0.6))`` の件数に集計"""
+    import numpy as np
+    
+    scores = np.asarray(scores, dtype=float)
+    high = int(np.count_nonzero(scores >= 0.8))
+    low = int(np.count_nonzero(scores < 0.6))
+    medium = int(np.count_nonzero(scores >= 0.6)) - high
+    return high, medium, low
+
+
+def _open_result_cache(result_cache):
+    """``result_cache`` 引数を NormalizationResultCache に変換
+    
+    ``True`` は既定の保存先、パスはそのファイル、``None``/``False`` は無効。
+    """
+    if result_cache is None or result_cache is False:
+        return None
+    from .result_cache import NormalizationResultCache
+    if isinstance(result_cache, NormalizationResultCache):
+        return result_cache
+    return NormalizationResultCache(None if result_cache is True else result_cache)
+
+
+def _to_optional_strings(values):
+    """欠損値を ``None``、それ以外を文字列にしたリストに変換"""
+    if hasattr(values, 'isna'):
+        # pandas Series / Index は欠損判定をまとめて行う
+        mask = values.isna().tolist()
+        return [None if missing else str(value) for value, missing in zip(values.tolist(), mask)]
+    return [None if value is None or pd.isna(value) else str(value) for value in values]
+
+
+def split_rows_by_car(car_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    """行番号を車種ごとにまとめ、``chunk_size`` 行以下のタスクに分割
+    
+    ``[(車種名, [行番号, ...]), ...]`` を車種の出現順で返す。
+    """
+    groups = {}
+    for position, car_name in enumerate(car_names):
+        groups.setdefault(car_name, []).append(position)
+    
+    chunk_size = max(1, chunk_size)
+    tasks = []
+    for car_name, positions in groups.items():
+        for start in range(0, len(positions), chunk_size):
+            tasks.append((car_name, positions[start:start + chunk_size]))
+    return tasks
+
+
+# ワーカープロセス内の正規化エンジン
+_worker_normalizer = None
+
+
+def _init_worker(grades_json_path, exclude_keywords_path, cache_dir, use_cache):
+    """ワーカープロセス初期化（必要な車種のみ遅延読み込み）"""
+    global _worker_normalizer
+    _worker_normalizer = GradeNormalizer(grades_json_path, exclude_keywords_path,
+                                         cache_dir=cache_dir, use_cache=use_cache, lazy=True)
+
+
+def _init_mapped_worker(index_path):
+    """ワーカープロセス初期化（共有インデックスをメモリマップ）"""
+    global _worker_normalizer
+    from .shared_index import open_grade_index
+    _worker_normalizer = open_grade_index(index_path)
+
+
+def _normalize_chunk(car_name, grades, tier='full'):
+    """ワーカープロセスでの正規化タスク（結果と段階別統計を返す）"""
+    stats = TierStats()
+    matches = _worker_normalizer.normalize_grades_for_car(car_name, grades, tier=tier, stats=stats)
+    return matches, stats.as_dict()
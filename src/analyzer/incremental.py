@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+増分分析
+分析済みスナップショットの記録（ウォーターマーク）と車種別累積データセット
+"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# 累積データセットで各行の元スナップショットを示す列
+SOURCE_COLUMN = 'ソースファイル'
+
+WATERMARKS_FILENAME = '.watermarks.json'
+WATERMARK_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path):
+    """ファイル内容のSHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SnapshotWatermarks:
+    """分析済みスナップショットの記録
+
+    スナップショットのキー（スクレイピングデータ基準の相対パス）ごとに
+    内容ハッシュ・サイズ・mtime を保存する。サイズと mtime が一致すれば
+    内容ハッシュの計算を省略する。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = {}
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') == WATERMARK_VERSION:
+                self._entries = data.get('snapshots', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"ウォーターマーク読み込みエラー: {e}")
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def status(self, key, path):
+        """``('new' | 'changed' | 'unchanged', 内容ハッシュ)`` を返す
+
+        内容ハッシュは計算を省略した場合は記録済みの値。
+        """
+        entry = self._entries.get(key)
+        stat = os.stat(path)
+        if entry is not None and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return 'unchanged', entry['sha256']
+
+        content_hash = file_sha256(path)
+        if entry is None:
+            return 'new', content_hash
+        if entry['sha256'] == content_hash:
+            # 内容が同じなら mtime のみ更新
+            self._entries[key].update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            return 'unchanged', content_hash
+        return 'changed', content_hash
+
+    def mark(self, key, path, content_hash, rows):
+        """分析済みとして記録"""
+        stat = os.stat(path)
+        self._entries[key] = {
+            'sha256': content_hash,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'rows': rows,
+            'analyzed_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+    def save(self):
+        """記録を保存（一時ファイル経由で置換）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({'version': WATERMARK_VERSION, 'snapshots': self._entries},
+                                       ensure_ascii=False, indent=1), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+
+
+class CumulativeDataset:
+    """車種別の正規化済み累積データセット（CSV）
+
+    新しいスナップショットの行は末尾に追記する。内容が変わった
+    スナップショットは :data:`SOURCE_COLUMN` が一致する既存行を
+    削除してから追記する。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def header(self):
+        """既存ファイルの列名（ファイルがなければ ``None``）"""
+        try:
+            with open(self.path, encoding='utf-8-sig', newline='') as f:
+                return next(csv.reader(f), None)
+        except FileNotFoundError:
+            return None
+
+    def read(self):
+        """全行を読み込み（``マッチング精度`` 以外は文字列、ファイルがなければ ``None``）"""
+        header = self.header()
+        if header is None:
+            return None
+        dtype = {column: 'str' for column in header if column != 'マッチング精度'}
+        return pd.read_csv(self.path, encoding='utf-8-sig', dtype=dtype)
+
+    def replace(self, df):
+        """全行を ``df`` で置き換え（再正規化結果の保存）"""
+        self._write(df, mode='w', header=True)
+
+    def append(self, df, replace_sources=()):
+        """行を追加（``replace_sources`` のスナップショットの既存行は置き換え）"""
+        header = self.header()
+        if header is not None and (replace_sources or set(df.columns) - set(header)):
+            # 置き換え・列追加がある場合のみ全体を書き直す
+            existing = pd.read_csv(self.path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+            if replace_sources:
+                existing = existing[~existing[SOURCE_COLUMN].isin(list(replace_sources))]
+            combined = pd.concat([existing, df], ignore_index=True)
+            self._write(combined, mode='w', header=True)
+        elif header is not None:
+            self._write(df.reindex(columns=header), mode='a', header=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._write(df, mode='w', header=True)
+
+    def _write(self, df, mode, header):
+        if mode == 'w':
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            df.to_csv(tmp_path, index=False, encoding='utf-8-sig')
+            os.replace(tmp_path, self.path)
+        else:
+            df.to_csv(self.path, mode='a', header=header, index=False, encoding='utf-8-sig')
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+共有GradeNormalizerレジストリ
+プロセス内で正規化エンジンを使い回し、設定ファイル変更時に再読み込み
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+
+from .grade_database import file_stamp
+from .grade_normalizer import GradeNormalizer
+
+# 設定ファイルの更新確認間隔（秒）
+DEFAULT_POLL_INTERVAL = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+class NormalizerRegistry:
+    """設定ファイルの更新を監視する共有GradeNormalizer
+
+    :meth:`get` は構築済みのインスタンスを返し、``poll_interval`` 秒ごとに
+    ``car_grades.json`` と ``exclude_keywords.txt`` の ``(mtime, サイズ)`` を
+    確認する。変更があれば新しいインスタンスを構築してから参照を
+    差し替えるため、取得済みのインスタンスで処理中の正規化には影響しない。
+    """
+
+    def __init__(self, grades_json_path=None, exclude_keywords_path=None,
+                 poll_interval=DEFAULT_POLL_INTERVAL, **normalizer_options):
+        if grades_json_path is None:
+            grades_json_path = Path("config") / "car_grades.json"
+        if exclude_keywords_path is None:
+            exclude_keywords_path = Path("config") / "exclude_keywords.txt"
+
+        self.grades_json_path = Path(grades_json_path)
+        self.exclude_keywords_path = Path(exclude_keywords_path)
+        self.poll_interval = poll_interval
+        self.normalizer_options = normalizer_options
+
+        self._lock = threading.Lock()
+        self._normalizer = None
+        self._stamps = None
+        self._last_check = 0.0
+
+    def _current_stamps(self):
+        return file_stamp(self.grades_json_path), file_stamp(self.exclude_keywords_path)
+
+    def get(self):
+        """共有インスタンスを取得（必要に応じて再読み込み）"""
+        normalizer = self._normalizer
+        if normalizer is not None and time.monotonic() - self._last_check < self.poll_interval:
+            return normalizer
+
+        with self._lock:
+            stamps = self._current_stamps()
+            if self._normalizer is None or stamps != self._stamps:
+                if self._normalizer is not None:
+                    logger.info("設定ファイルの変更を検出したため正規化エンジンを再読み込みします")
+                self._load(stamps)
+            self._last_check = time.monotonic()
+            return self._normalizer
+
+    def reload(self):
+        """強制的に再読み込み"""
+        with self._lock:
+            self._load(self._current_stamps())
+            self._last_check = time.monotonic()
+            return self._normalizer
+
+    def _load(self, stamps):
+        # 読み込み前の状態を記録し、構築中の変更は次回の確認で検出する
+        normalizer = GradeNormalizer(self.grades_json_path, self.exclude_keywords_path,
+                                     **self.normalizer_options)
+        self._stamps = stamps
+        self._normalizer = normalizer
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_normalizer_registry(grades_json_path=None, exclude_keywords_path=None, **normalizer_options):
+    """設定ファイルとオプションの組み合わせごとのレジストリを取得"""
+    registry = NormalizerRegistry(grades_json_path, exclude_keywords_path, **normalizer_options)
+    key = (str(registry.grades_json_path.resolve()),
+           str(registry.exclude_keywords_path.resolve()),
+           tuple(sorted((name, repr(value)) for name, value in normalizer_options.items())))
+
+    with _registries_lock:
+        return _registries.setdefault(key, registry)
+
+
+def get_shared_normalizer(grades_json_path=None, exclude_keywords_path=None, **normalizer_options):
+    """プロセス内で共有される GradeNormalizer を取得"""
+    return get_normalizer_registry(grades_json_path, exclude_keywords_path,
+                                   **normalizer_options).get()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+常駐グレード正規化サービス
+読み込み済みの GradeNormalizer をプロセスに保持し、ローカルソケット経由で
+一括正規化リクエストに応答する
+
+Unixドメインソケットが使える環境では ``data/cache/normalizer.sock``、
+それ以外では ``127.0.0.1:8765`` で待ち受ける。メッセージは4バイトの長さ
+（ビッグエンディアン）に続くUTF-8 JSON（:data:`MAX_MESSAGE_SIZE` まで）。
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from .grade_database import DEFAULT_CACHE_DIR
+from .grade_normalizer import (
+    DEFAULT_CHUNK_SIZE, GradeNormalizer, TierStats, _to_optional_strings, build_normalized_dataframe
+)
+from .normalizer_registry import get_shared_normalizer
+
+HAS_UNIX_SOCKETS = hasattr(socket, 'AF_UNIX')
+DEFAULT_SOCKET_PATH = DEFAULT_CACHE_DIR / "normalizer.sock"
+DEFAULT_TCP_ADDRESS = ('127.0.0.1', 8765)
+
+# クライアントの接続確認・リクエストのタイムアウト（秒）
+CONNECT_TIMEOUT = 0.2
+REQUEST_TIMEOUT = 300.0
+
+# 1メッセージの最大バイト数（100万行の一括正規化で約100MB）。
+# これを超える長さのヘッダは不正として受信前に拒否する
+MAX_MESSAGE_SIZE = 256 * 1024 * 1024
+
+_LENGTH = struct.Struct('>I')
+
+logger = logging.getLogger(__name__)
+
+
+def default_address():
+    """既定の待ち受けアドレス（Unixソケットのパス、または ``(host, port)``）"""
+    return str(DEFAULT_SOCKET_PATH) if HAS_UNIX_SOCKETS else DEFAULT_TCP_ADDRESS
+
+
+def send_message(sock, message):
+    """長さ付きJSONメッセージを送信"""
+    data = json.dumps(message, ensure_ascii=False).encode('utf-8')
+    if len(data) > MAX_MESSAGE_SIZE:
+        raise ValueError(f"メッセージが大きすぎます: {len(data)}バイト (上限 {MAX_MESSAGE_SIZE})")
+    sock.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def receive_message(sock):
+    """長さ付きJSONメッセージを受信（接続が閉じられた場合は ``None``）
+
+    ヘッダの長さが :data:`MAX_MESSAGE_SIZE` を超える場合は ``ValueError``。
+    """
+    header = _receive_exactly(sock, _LENGTH.size)
+    if header is None:
+        return None
+    length = _LENGTH.unpack(header)[0]
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"メッセージ長が上限を超えています: {length}バイト")
+    data = _receive_exactly(sock, length)
+    if data is None:
+        raise ConnectionError("メッセージの途中で接続が閉じられました")
+    return json.loads(data.decode('utf-8'))
+
+
+def _receive_exactly(sock, size):
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(chunks)
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """1接続で複数のリクエストを順に処理"""
+
+    def handle(self):
+        while True:
+            try:
+                request = receive_message(self.request)
+            except (ConnectionError, ValueError) as e:
+                logger.warning(f"不正なリクエスト: {e}")
+                return
+            if request is None:
+                return
+            send_message(self.request, self.server.service.handle(request))
+
+
+if HAS_UNIX_SOCKETS:
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class NormalizerService:
+    """正規化サービス本体
+
+    リクエストごとに :func:`get_shared_normalizer` から正規化エンジンを
+    取得するため、設定ファイルを変更すると再起動なしで反映される。
+    """
+
+    def __init__(self, address=None, max_workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 **normalizer_options):
+        self.address = address if address is not None else default_address()
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.normalizer_options = normalizer_options
+        self.server = None
+        self._thread = None
+
+    def normalizer(self):
+        return get_shared_normalizer(**self.normalizer_options)
+
+    def handle(self, request):
+        """リクエスト辞書を処理し、応答辞書を返す"""
+        operation = request.get('op')
+        try:
+            if operation == 'ping':
+                return {'ok': True, 'pid': os.getpid()}
+            if operation == 'normalize':
+                return self.normalize(request)
+            raise ValueError(f"不明な操作: {operation}")
+        except Exception as e:
+            logger.error(f"正規化サービスエラー: {e}")
+            return {'ok': False, 'error': str(e)}
+
+    def normalize(self, request):
+        """``car_names`` / ``grades`` を一括正規化"""
+        start = time.perf_counter()
+        normalizer = self.normalizer()
+        car_names, grades = request.get('car_names'), request['grades']
+        tier = request.get('tier', 'full')
+        # クライアント指定の並列数（未指定ならサービス起動時の値）
+        max_workers = request.get('max_workers') or self.max_workers
+
+        stats = TierStats()
+        normalized, scores = normalizer.normalize_batch(
+            car_names, grades, max_workers=max_workers, chunk_size=self.chunk_size,
+            score_dtype='float64', tier=tier, stats=stats)
+        response = {
+            'ok': True,
+            'grades': normalized.tolist(),
+            'scores': scores.tolist(),
+            'config_hashes': normalizer.config_hashes(car_names, len(grades), tier),
+            'tier_stats': stats.as_dict(),
+            'fingerprint': normalizer.config_fingerprint
+        }
+        logger.info(f"正規化リクエスト: {len(grades)}件 ({time.perf_counter() - start:.3f}秒)")
+        return response
+
+    def start(self):
+        """待ち受けを開始（既に起動中のサービスがあれば ``RuntimeError``）"""
+        if NormalizerClient(self.address).ping():
+            raise RuntimeError(f"正規化サービスは既に起動しています: {self.address}")
+
+        if isinstance(self.address, str):
+            # 前回の異常終了で残ったソケットファイルを削除
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            os.makedirs(os.path.dirname(self.address) or '.', exist_ok=True)
+            server_class = _UnixServer
+        else:
+            server_class = _TCPServer
+
+        self.normalizer()  # 最初のリクエストの前にDBを読み込む
+        self.server = server_class(self.address, _RequestHandler)
+        self.server.service = self
+        logger.info(f"正規化サービス起動: {self.address}")
+        return self.server
+
+    def serve_forever(self):
+        """待ち受けを開始し、停止されるまで処理"""
+        server = self.server or self.start()
+        try:
+            server.serve_forever()
+        finally:
+            self.close()
+
+    def serve_in_background(self):
+        """別スレッドで待ち受けを開始（テスト・組み込み用）"""
+        server = self.server or self.start()
+        self._thread = threading.Thread(target=server.serve_forever, daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def close(self):
+        """待ち受けを停止し、ソケットファイルを削除"""
+        if self.server is None:
+            return
+        if self._thread is not None:
+            self.server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+        self.server = None
+        logger.info("正規化サービス停止")
+
+
+class NormalizerClient:
+    """正規化サービスのクライアント
+
+    :meth:`normalize_dataframe` と :meth:`get_normalization_report` は
+    :class:`GradeNormalizer` と同じ形式の結果を返す。
+    """
+
+    def __init__(self, address=None, timeout=REQUEST_TIMEOUT):
+        self.address = address if address is not None else default_address()
+        self.timeout = timeout
+        self.logger = logging.getLogger(__name__)
+
+    def _connect(self, timeout):
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def request(self, message, timeout=None):
+        """リクエストを送信して応答を返す（エラー応答は ``RuntimeError``）"""
+        with self._connect(self.timeout if timeout is None else timeout) as sock:
+            send_message(sock, message)
+            response = receive_message(sock)
+        if response is None:
+            raise ConnectionError("正規化サービスから応答がありません")
+        if not response.get('ok'):
+            raise RuntimeError(response.get('error', '正規化サービスエラー'))
+        return response
+
+    def ping(self):
+        """サービスが応答するか確認"""
+        try:
+            self.request({'op': 'ping'}, timeout=CONNECT_TIMEOUT)
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def normalize_batch(self, car_names, grades, tier='full', max_workers=None):
+        """一括正規化し、サービスの応答辞書を返す
+
+        ``max_workers`` はサービス側の並列正規化のプロセス数
+        （省略時はサービス起動時の ``max_workers``）。
+        """
+        if car_names is not None and not isinstance(car_names, str):
+            car_names = _to_optional_strings(car_names)
+        return self.request({'op': 'normalize', 'car_names': car_names,
+                             'grades': _to_optional_strings(grades), 'tier': tier,
+                             'max_workers': max_workers})
+
+    def normalize_dataframe(self, df, max_workers=None, tier='full'):
+        """:meth:`GradeNormalizer.normalize_dataframe` と同じ処理をサービスで実行"""
+        if df is None or df.empty or 'グレード' not in df.columns:
+            return df
+
+        car_names = df['車種名'] if '車種名' in df.columns else "Unknown"
+        response = self.normalize_batch(car_names, df['グレード'], tier=tier, max_workers=max_workers)
+        return build_normalized_dataframe(df, response['grades'], response['scores'],
+                                          response['config_hashes'], response['tier_stats'],
+                                          self.logger)
+
+    get_normalization_report = staticmethod(GradeNormalizer.get_normalization_report)
+
+
+def connect_normalizer_service(address=None):
+    """起動中の正規化サービスのクライアント（起動していなければ ``None``）"""
+    client = NormalizerClient(address)
+    return client if client.ping() else None
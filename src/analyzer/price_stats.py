@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+価格統計
+「支払総額」列の数値化とグレード別の価格集計
+"""
+
+import numpy as np
+import pandas as pd
+
+from ..utils.parsing import parse_price
+
+# グレード別集計に含めるパーセンタイル（列名, 分位）
+PRICE_PERCENTILES = (('25%価格', 0.25), ('中央値', 0.5), ('75%価格', 0.75))
+
+
+def extract_price_values(price_series):
+    """価格文字列のSeriesを万円単位の数値Seriesに変換（解析できない値は NaN）"""
+    values = parse_price(price_series).values.to_numpy(dtype=float, na_value=np.nan)
+    return pd.Series(values, index=price_series.index, name=price_series.name)
+
+
+def grade_price_summary(df, grade_column='正規グレード', price_column='支払総額'):
+    """グレード別の価格統計
+
+    ``グレード`` / ``平均価格`` / ``最小価格`` / ``最大価格`` / パーセンタイル /
+    ``データ件数`` 列を持つDataFrameを返す。``マッチング精度`` 列があれば
+    ``平均マッチング精度`` も追加する。価格が1件もないグレードの統計値は0。
+    """
+    if price_column in df.columns:
+        prices = extract_price_values(df[price_column])
+    else:
+        prices = pd.Series(np.nan, index=df.index)
+    grouped = prices.groupby(df[grade_column], observed=True, sort=True)
+
+    columns = {
+        '平均価格': grouped.mean(),
+        '最小価格': grouped.min(),
+        '最大価格': grouped.max()
+    }
+    for name, quantile in PRICE_PERCENTILES:
+        columns[name] = grouped.quantile(quantile)
+    summary = pd.DataFrame(columns).fillna(0).round(2)
+    summary['データ件数'] = grouped.count().astype(int)
+
+    if 'マッチング精度' in df.columns:
+        summary['平均マッチング精度'] = (
+            df['マッチング精度'].groupby(df[grade_column], observed=True, sort=True).mean().round(2))
+
+    summary.index.name = 'グレード'
+    return summary.reset_index()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+グレード正規化結果の永続キャッシュ
+(設定ハッシュ, ティア, 車種名, 元グレード) ごとの結果をSQLiteに保存
+"""
+
+import logging
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from .grade_database import DEFAULT_CACHE_DIR
+
+DEFAULT_RESULT_CACHE_PATH = DEFAULT_CACHE_DIR / "grade_results.sqlite3"
+
+# 他プロセスが書き込み中の場合の待ち時間（秒）
+_BUSY_TIMEOUT = 10.0
+
+# 結果を残す設定ハッシュの数（最近使ったものから）
+KEEP_FINGERPRINTS = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT NOT NULL,
+    tier TEXT NOT NULL,
+    car_name TEXT NOT NULL,
+    grade TEXT NOT NULL,
+    normalized TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (fingerprint, tier, car_name, grade)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    last_used INTEGER NOT NULL
+)
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class NormalizationResultCache:
+    """正規化結果のSQLiteキャッシュ
+
+    キーには ``car_grades.json`` と ``exclude_keywords.txt`` の内容ハッシュ
+    (:attr:`GradeNormalizer.config_fingerprint`) を含むため、設定が変わると
+    以前の結果は参照されなくなる。:meth:`purge_stale` で最近使った設定
+    （:data:`KEEP_FINGERPRINTS` 件）以外の結果を削除できるため、テスト用と
+    本番用など複数の設定を交互に使ってもキャッシュは消えない。
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path is not None else DEFAULT_RESULT_CACHE_PATH
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(str(self.db_path), timeout=_BUSY_TIMEOUT)
+        if not self._initialized:
+            with connection:
+                connection.executescript(_SCHEMA)
+            self._initialized = True
+        return connection
+
+    def lookup(self, fingerprint, tier, car_names):
+        """車種ごとのキャッシュ済み結果 ``{車種名: {元グレード: (正規グレード, 精度)}}``"""
+        found = {}
+        with closing(self._connect()) as connection:
+            for car_name in car_names:
+                rows = connection.execute(
+                    "SELECT grade, normalized, score FROM results "
+                    "WHERE fingerprint = ? AND tier = ? AND car_name = ?",
+                    (fingerprint, tier, car_name))
+                found[car_name] = {grade: (normalized, score) for grade, normalized, score in rows}
+        return found
+
+    @staticmethod
+    def _touch(connection, fingerprint):
+        """設定ハッシュの使用順を記録（``last_used`` は使用のたびに増える通し番号）"""
+        connection.execute(
+            "INSERT OR REPLACE INTO fingerprints VALUES "
+            "(?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM fingerprints))", (fingerprint,))
+
+    def store(self, fingerprint, tier, entries):
+        """``(車種名, 元グレード, 正規グレード, 精度)`` の一覧を保存"""
+        with closing(self._connect()) as connection:
+            with connection:
+                self._touch(connection, fingerprint)
+                connection.executemany(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                    ((fingerprint, tier, car_name, grade, normalized, score)
+                     for car_name, grade, normalized, score in entries))
+
+    def purge_stale(self, fingerprint, keep=KEEP_FINGERPRINTS):
+        """``fingerprint`` を使用済みとして記録し、最近使った ``keep`` 件以外の
+        設定ハッシュの結果を削除して削除件数を返す"""
+        with closing(self._connect()) as connection:
+            with connection:
+                self._touch(connection, fingerprint)
+                connection.execute(
+                    "DELETE FROM fingerprints WHERE fingerprint NOT IN ("
+                    "SELECT fingerprint FROM fingerprints ORDER BY last_used DESC LIMIT ?)", (keep,))
+                deleted = connection.execute(
+                    "DELETE FROM results WHERE fingerprint NOT IN "
+                    "(SELECT fingerprint FROM fingerprints)").rowcount
+        if deleted:
+            logger.info(f"古い正規化結果キャッシュを削除: {deleted}件")
+        return deleted
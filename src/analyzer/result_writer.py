@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分析結果の書き出し
+正規化済みデータ・グレード別集計・メタデータを選択した形式で保存する
+
+``xlsx`` は3シートのブック。それ以外の形式では正規化済みデータを
+``<名前>.<拡張子>``、グレード別集計を ``<名前>.summary.<拡張子>``、
+メタデータを ``<名前>.meta.json`` に保存する。
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+
+# 形式名 → 拡張子
+OUTPUT_FORMATS = {
+    'xlsx': '.xlsx',
+    'parquet': '.parquet',
+    'csv': '.csv',
+    'jsonl': '.jsonl'
+}
+DEFAULT_OUTPUT_FORMAT = 'xlsx'
+
+DATA_SHEET = '正規化済みデータ'
+SUMMARY_SHEET = 'グレード別集計'
+METADATA_SHEET = 'メタデータ'
+
+SUMMARY_SUFFIX = '.summary'
+METADATA_SUFFIX = '.meta.json'
+
+# write-only ブックへ一度に変換する行数
+XLSX_CHUNK_ROWS = 10000
+
+
+def output_format_for(path):
+    """拡張子から形式名を返す（対応していなければ ``ValueError``）"""
+    suffix = Path(path).suffix.lower()
+    for name, extension in OUTPUT_FORMATS.items():
+        if extension == suffix:
+            return name
+    raise ValueError(f"サポートされていない出力形式: {suffix}")
+
+
+def _sidecar(path, suffix):
+    path = Path(path)
+    return path.with_name(path.stem + suffix)
+
+
+def is_result_file(path):
+    """正規化済みデータ本体のファイルか（集計・メタデータの付属ファイルは除く）"""
+    path = Path(path)
+    return (path.suffix.lower() in OUTPUT_FORMATS.values()
+            and not path.stem.endswith(SUMMARY_SUFFIX)
+            and not path.name.endswith(METADATA_SUFFIX))
+
+
+def write_analysis_result(output_path, df, summary=None, metadata=None):
+    """分析結果を ``output_path`` の拡張子の形式で保存"""
+    output_format = output_format_for(output_path)
+    if output_format == 'xlsx':
+        sheets = [(DATA_SHEET, df)]
+        if summary is not None:
+            sheets.append((SUMMARY_SHEET, summary))
+        if metadata is not None:
+            sheets.append((METADATA_SHEET, pd.DataFrame([metadata])))
+        write_xlsx(output_path, sheets)
+        return
+
+    _write_table(output_path, df, output_format)
+    summary_path = _sidecar(output_path, SUMMARY_SUFFIX + OUTPUT_FORMATS[output_format])
+    if summary is not None:
+        _write_table(summary_path, summary, output_format)
+    if metadata is not None:
+        _sidecar(output_path, METADATA_SUFFIX).write_text(
+            json.dumps(metadata, ensure_ascii=False, indent=2, default=str), encoding='utf-8')
+
+
+def _write_table(path, df, output_format):
+    if output_format == 'parquet':
+        try:
+            df.to_parquet(path, index=False)
+        except ImportError as e:
+            raise ImportError("Parquet 出力には pyarrow が必要です: pip install pyarrow") from e
+    elif output_format == 'csv':
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    else:
+        df.to_json(path, orient='records', lines=True, force_ascii=False, date_format='iso')
+
+
+def write_xlsx(output_path, sheets):
+    """``[(シート名, DataFrame), ...]`` を openpyxl の write-only モードで保存
+
+    行をセルオブジェクトに保持せず順に書き出すため、大きなデータでも
+    メモリ使用量と保存時間が抑えられる。
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    for title, df in sheets:
+        worksheet = workbook.create_sheet(title)
+        worksheet.append([str(column) for column in df.columns])
+        for start in range(0, len(df), XLSX_CHUNK_ROWS):
+            chunk = df.iloc[start:start + XLSX_CHUNK_ROWS].astype(object)
+            for row in chunk.where(chunk.notna(), None).itertuples(index=False, name=None):
+                worksheet.append(row)
+    workbook.save(output_path)
+
+
+def read_analysis_result(path):
+    """保存済みの分析結果を読み込み、``(正規化済みデータ, メタデータ辞書)`` を返す"""
+    path = Path(path)
+    output_format = output_format_for(path)
+    if output_format == 'xlsx':
+        df = pd.read_excel(path, sheet_name=DATA_SHEET)
+        try:
+            metadata = pd.read_excel(path, sheet_name=METADATA_SHEET).iloc[0].to_dict()
+        except (ValueError, IndexError):
+            metadata = {}
+        return df, metadata
+
+    if output_format == 'parquet':
+        df = pd.read_parquet(path)
+    elif output_format == 'csv':
+        df = pd.read_csv(path, encoding='utf-8-sig')
+    else:
+        df = pd.read_json(path, orient='records', lines=True)
+    try:
+        metadata = json.loads(_sidecar(path, METADATA_SUFFIX).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        metadata = {}
+    return df, metadata
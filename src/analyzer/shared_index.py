@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ワーカープロセス共有用グレードインデックス
+メモリマップしたファイル経由で複数プロセスが同じDBを参照
+"""
+
+import logging
+import marshal
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from .grade_database import (
+    DEFAULT_CACHE_DIR, CompiledGradeCache, LazyGradeDatabase, build_offset_index,
+    content_fingerprint, parse_exclude_keywords, read_optional_bytes
+)
+from .grade_normalizer import GradeNormalizer
+
+# ファイル形式: ヘッダ / marshal化したメタデータ / car_grades.json の内容
+_MAGIC = b'CGIX'
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<4sHI')
+
+logger = logging.getLogger(__name__)
+
+
+def publish_grade_index(grades_json_path, exclude_keywords_path, cache_dir=None):
+    """ワーカー共有用のインデックスファイルを作成し、そのパスを返す
+
+    ファイル名は設定内容のハッシュで決まるため、同じ設定であれば
+    既存のファイルをそのまま再利用する。新しく作成した場合は
+    他の設定の古いインデックスファイルを削除する。
+    """
+    grades_raw = read_optional_bytes(grades_json_path)
+    if grades_raw is None:
+        raise FileNotFoundError(f"正規グレードファイルが見つかりません: {grades_json_path}")
+    keywords_raw = read_optional_bytes(exclude_keywords_path)
+    fingerprint = content_fingerprint(grades_raw, keywords_raw)
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    index_path = cache_dir / f"grade_index_{fingerprint[:16]}.bin"
+    if index_path.exists():
+        return index_path
+
+    # オフセットは読み込んだ内容と一致するキャッシュがあれば再利用
+    payload, _ = CompiledGradeCache(grades_json_path, exclude_keywords_path,
+                                    cache_dir, lazy=True).load_or_build()
+    if payload['fingerprint'] == fingerprint:
+        offsets, alias_index = payload['offsets'], payload['alias_index']
+        exclude_keywords = payload['exclude_keywords']
+    else:
+        offsets, alias_index = build_offset_index(grades_raw)
+        exclude_keywords = parse_exclude_keywords(keywords_raw or b'')
+
+    meta = marshal.dumps({
+        'fingerprint': fingerprint,
+        'offsets': offsets,
+        'alias_index': alias_index,
+        'exclude_keywords': exclude_keywords,
+        'grades_json_path': str(grades_json_path),
+        'exclude_keywords_path': str(exclude_keywords_path)
+    })
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, len(meta)))
+        f.write(meta)
+        f.write(grades_raw)
+    os.replace(tmp_path, index_path)
+    logger.info(f"共有グレードインデックス作成: {index_path}")
+    _remove_stale_indexes(cache_dir, keep=index_path)
+    return index_path
+
+
+def _remove_stale_indexes(cache_dir, keep):
+    """``keep`` 以外の共有インデックスファイルを削除（使用中で削除できないものは残す）"""
+    for stale in Path(cache_dir).glob("grade_index_*.bin"):
+        if stale == keep:
+            continue
+        try:
+            stale.unlink()
+        except OSError as e:
+            logger.debug(f"古い共有グレードインデックスを削除できません ({stale.name}): {e}")
+
+
+def open_grade_index(index_path):
+    """共有インデックスファイルを読み取り専用でマップし、正規化エンジンを作成
+
+    DBエントリはマップ領域から要求時にのみパースされるため、
+    JSON本体はプロセス間でOSのページキャッシュを共有する。
+    """
+    with open(index_path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, meta_length = _HEADER.unpack_from(mapped, 0)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        mapped.close()
+        raise ValueError(f"共有グレードインデックスの形式が不正です: {index_path}")
+
+    meta_start = _HEADER.size
+    view = memoryview(mapped)
+    # メタデータもマップ領域から直接読み込む（中間コピーを作らない）
+    meta = marshal.loads(view[meta_start:meta_start + meta_length])
+    data = view[meta_start + meta_length:]
+
+    car_grades_db = LazyGradeDatabase(meta['grades_json_path'], meta['offsets'], buffer=data)
+    return GradeNormalizer.from_loaded(
+        car_grades_db, meta['exclude_keywords'], meta['alias_index'], meta['fingerprint'],
+        grades_json_path=meta['grades_json_path'],
+        exclude_keywords_path=meta['exclude_keywords_path'])
@@ -15,6 +15,33 @@ import logging
 from datetime import datetime
 from urllib.parse import urljoin, urlparse, parse_qs
 from pathlib import Path
+from typing import NamedTuple
+
+try:
+    from ..utils.catalog import DataCatalog
+except ImportError:
+    # スクリプトとして直接実行された場合はカタログを更新しない
+    DataCatalog = None
+
+class CarListing(NamedTuple):
+    """1台分の掲載情報（フィールド名は保存時の列名）
+
+    行ごとの辞書よりメモリが少なく、そのまま DataFrame に変換できる。
+    """
+    車種名: str
+    モデル: str
+    グレード: str
+    支払総額: str
+    年式: str
+    走行距離: str
+    修復歴: str
+    ミッション: str
+    排気量: str
+    取得日時: str
+    取得日: str
+    取得時刻: str
+    ソースURL: str
+    車両URL: str
 
 class CarScraper:
     def __init__(self, output_dir=None):
@@ -157,22 +184,22 @@ class CarScraper:
             # 現在時刻を取得日時として記録
             current_time = datetime.now()
             
-            return {
-                '車種名': car_name,
-                'モデル': model_info,
-                'グレード': grade,
-                '支払総額': price,
-                '年式': spec_data['年式'],
-                '走行距離': spec_data['走行距離'],
-                '修復歴': spec_data['修復歴'],
-                'ミッション': spec_data['ミッション'],
-                '排気量': spec_data['排気量'],
-                '取得日時': current_time.isoformat(),
-                '取得日': current_time.strftime('%Y-%m-%d'),
-                '取得時刻': current_time.strftime('%H:%M:%S'),
-                'ソースURL': base_url,
-                '車両URL': vehicle_url
-            }
+            return CarListing(
+                車種名=car_name,
+                モデル=model_info,
+                グレード=grade,
+                支払総額=price,
+                年式=spec_data['年式'],
+                走行距離=spec_data['走行距離'],
+                修復歴=spec_data['修復歴'],
+                ミッション=spec_data['ミッション'],
+                排気量=spec_data['排気量'],
+                取得日時=current_time.isoformat(),
+                取得日=current_time.strftime('%Y-%m-%d'),
+                取得時刻=current_time.strftime('%H:%M:%S'),
+                ソースURL=base_url,
+                車両URL=vehicle_url
+            )
             
         except Exception as e:
             self.logger.warning(f"車両アイテム解析エラー: {e}")
@@ -239,12 +266,20 @@ class CarScraper:
         self.logger.info(f"スクレイピング完了: {len(car_data_list)}台")
         return car_data_list, car_name
     
+    def to_dataframe(self, car_data_list):
+        """取得データを保存時の列順のDataFrameに変換"""
+        # CarListing のフィールド順がそのまま保存時の列順になる
+        return pd.DataFrame.from_records(car_data_list, columns=CarListing._fields)
+    
     def save_data(self, car_data_list, car_name):
         """データ保存（取得日時とURL情報付き）"""
         if not car_data_list:
             self.logger.warning("保存するデータがありません")
             return None
-        
+        return self.save_dataframe(self.to_dataframe(car_data_list), car_name)
+    
+    def save_dataframe(self, df_ordered, car_name):
+        """:meth:`to_dataframe` で変換したデータをCSV / Excelに保存"""
         # 保存先ディレクトリ
         today = datetime.now()
         car_folder = self.output_dir / self.sanitize_filename(car_name)
@@ -262,20 +297,6 @@ class CarScraper:
         
         final_filename = f"{base_filename}.No{file_number}"
         
-        # データフレーム作成・保存
-        df = pd.DataFrame(car_data_list)
-        
-        # 列の順序を指定（新しい列を含む）
-        column_order = [
-            '車種名', 'モデル', 'グレード', '支払総額', '年式', '走行距離', 
-            '修復歴', 'ミッション', '排気量', '取得日時', '取得日', '取得時刻',
-            'ソースURL', '車両URL'
-        ]
-        
-        # 存在する列のみを選択
-        available_columns = [col for col in column_order if col in df.columns]
-        df_ordered = df[available_columns]
-        
         # CSV保存
         csv_path = date_folder / f"{final_filename}.csv"
         df_ordered.to_csv(csv_path, index=False, encoding='utf-8-sig')
@@ -293,7 +314,7 @@ class CarScraper:
                 scraping_info = pd.DataFrame([{
                     'スクレイピング開始時刻': self.scraping_start_time.isoformat(),
                     'スクレイピング完了時刻': datetime.now().isoformat(),
-                    '取得台数': len(car_data_list),
+                    '取得台数': len(df_ordered),
                     '車種名': car_name,
                     'ファイル名': final_filename
                 }])
@@ -303,10 +324,21 @@ class CarScraper:
         except ImportError:
             self.logger.warning("openpyxlがインストールされていません")
         
+        # データカタログ更新
+        if DataCatalog is not None:
+            try:
+                DataCatalog(self.output_dir).add_file(csv_path, rows=len(df_ordered))
+            except OSError as e:
+                self.logger.warning(f"カタログ更新エラー: {e}")
+        
         return csv_path
     
-    def run_from_urls_file(self, urls_file=None):
-        """URLファイルからスクレイピング実行（パス自動検出機能付き）"""
+    def run_from_urls_file(self, urls_file=None, on_saved=None):
+        """URLファイルからスクレイピング実行（パス自動検出機能付き）
+        
+        ``on_saved(csv_path, df)`` を指定すると、URLごとに保存直後の
+        DataFrameを渡す（次のURLの取得と並行して分析する場合に使用）。
+        """
         # URLファイルのパスを自動検出
         if urls_file is None:
             possible_paths = [
@@ -352,9 +384,12 @@ class CarScraper:
                 self.logger.info(f"URL {i+1}/{len(urls)} を処理中: {url}")
                 car_data_list, car_name = self.scrape_url(url)
                 if car_data_list:
-                    saved_path = self.save_data(car_data_list, car_name)
+                    df = self.to_dataframe(car_data_list)
+                    saved_path = self.save_dataframe(df, car_name)
                     if saved_path:
                         results.append(saved_path)
+                        if on_saved is not None:
+                            on_saved(saved_path, df)
                         
                         # 進捗をログに記録
                         self.logger.info(f"完了: {car_name} - {len(car_data_list)}台取得")
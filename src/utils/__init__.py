@@ -1 +1,4 @@
 from .paths import get_scraped_dir, get_car_directories
+from .catalog import DataCatalog, find_car_files, get_catalog
+from .frame_cache import read_snapshot
+from .loader import load_snapshot, load_snapshots
@@ -0,0 +1,260 @@
+import csv
+import json
+import logging
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .paths import get_scraped_dir
+
+CATALOG_FILENAME = '.catalog.json'
+CATALOG_VERSION = 1
+
+_FILE_NUMBER = re.compile(r'\.No(\d+)\.csv$')
+
+logger = logging.getLogger(__name__)
+
+
+def parse_date_dir(name: str) -> Optional[str]:
+    """Return ``YYYY-MM-DD`` for a ``YYYY年MM月DD日`` directory name, else ``None``."""
+    try:
+        return datetime.strptime(name, '%Y年%m月%d日').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def count_csv_rows(csv_path: Path) -> int:
+    """Return the number of data rows (excluding the header) in ``csv_path``."""
+    with open(csv_path, encoding='utf-8-sig', newline='') as f:
+        return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+
+
+class DataCatalog:
+    """Manifest of the scraped CSV snapshots under ``scraped_dir``.
+
+    Each entry records the car directory, snapshot date, file number, row
+    count, size and mtime of one CSV file. The manifest is stored as
+    ``scraped_dir/.catalog.json``. :meth:`add_file` keeps it current when
+    new files are saved.
+
+    Refreshing only stats the car and date directories (adding or removing
+    a file changes its directory's mtime). If a directory's mtime differs
+    from the recorded one, only that directory is rescanned and its files
+    are compared by size and mtime; row counts of unchanged files are
+    reused. A file rewritten in place without touching its directory is
+    picked up by :meth:`rebuild`, which discards the manifest and scans
+    everything.
+    """
+
+    def __init__(self, scraped_dir: Path):
+        self.scraped_dir = Path(scraped_dir)
+        self.manifest_path = self.scraped_dir / CATALOG_FILENAME
+        self._dirs: Dict[str, int] = {}
+        self._files: Dict[str, dict] = {}
+        self._loaded = False
+
+    # ------------------------------------------------------------------
+    # manifest I/O
+    def _read_manifest(self) -> None:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"カタログ読み込みエラー: {e}")
+            return
+        if manifest.get('version') == CATALOG_VERSION:
+            self._dirs = manifest.get('dirs', {})
+            self._files = manifest.get('files', {})
+
+    def save(self) -> None:
+        """Write the manifest (atomically replacing the previous one)."""
+        manifest = {'version': CATALOG_VERSION, 'dirs': self._dirs, 'files': self._files}
+        try:
+            tmp_path = self.manifest_path.with_name(f"{CATALOG_FILENAME}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(manifest, ensure_ascii=False), encoding='utf-8')
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            logger.warning(f"カタログ書き込みエラー: {e}")
+
+    # ------------------------------------------------------------------
+    # scanning
+    def _relative(self, path: Path) -> str:
+        return Path(path).relative_to(self.scraped_dir).as_posix()
+
+    def _make_entry(self, csv_path: Path, stat: os.stat_result, rows: Optional[int] = None) -> dict:
+        match = _FILE_NUMBER.search(csv_path.name)
+        date_dir = csv_path.parent.name
+        return {
+            'car': csv_path.parent.parent.name,
+            'date_dir': date_dir,
+            'date': parse_date_dir(date_dir),
+            'file_number': int(match.group(1)) if match else 0,
+            'rows': count_csv_rows(csv_path) if rows is None else rows,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime
+        }
+
+    def _scan_date_dir(self, dir_key: str, mtime_ns: int) -> None:
+        prefix = dir_key + '/'
+        previous = {key: entry for key, entry in self._files.items() if key.startswith(prefix)}
+        for key in previous:
+            del self._files[key]
+
+        for csv_path in (self.scraped_dir / dir_key).glob('*.csv'):
+            stat = csv_path.stat()
+            key = prefix + csv_path.name
+            entry = previous.get(key)
+            if entry is None or entry['size'] != stat.st_size or entry['mtime'] != stat.st_mtime:
+                entry = self._make_entry(csv_path, stat)
+            self._files[key] = entry
+        self._dirs[dir_key] = mtime_ns
+
+    def _refresh_car_dir(self, car_key: str, mtime_ns: int, known_date_keys: List[str]) -> bool:
+        root = str(self.scraped_dir)
+        changed = self._dirs.get(car_key) != mtime_ns
+        if changed:
+            # only list date directories again when one was added or removed
+            with os.scandir(os.path.join(root, car_key)) as it:
+                date_keys = [f"{car_key}/{entry.name}" for entry in it if entry.is_dir()]
+            for key in set(known_date_keys) - set(date_keys):
+                self._forget(key)
+            self._dirs[car_key] = mtime_ns
+        else:
+            date_keys = known_date_keys
+
+        for key in date_keys:
+            try:
+                date_mtime = os.stat(os.path.join(root, key)).st_mtime_ns
+            except FileNotFoundError:
+                self._forget(key)
+                changed = True
+                continue
+            if self._dirs.get(key) != date_mtime:
+                self._scan_date_dir(key, date_mtime)
+                changed = True
+        return changed
+
+    def _forget(self, dir_key: str) -> None:
+        self._dirs.pop(dir_key, None)
+        prefix = dir_key + '/'
+        for key in [key for key in self._files if key.startswith(prefix)]:
+            del self._files[key]
+
+    def refresh(self) -> None:
+        """Load the manifest and rescan directories whose mtime changed."""
+        if not self._loaded:
+            self._read_manifest()
+            self._loaded = True
+        if not self.scraped_dir.exists():
+            self._dirs, self._files = {}, {}
+            return
+
+        date_keys_by_car: Dict[str, List[str]] = {}
+        for key in self._dirs:
+            car_key, separator, _ = key.partition('/')
+            if separator:
+                date_keys_by_car.setdefault(car_key, []).append(key)
+
+        changed = False
+        car_keys = set()
+        with os.scandir(self.scraped_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                car_keys.add(entry.name)
+                changed |= self._refresh_car_dir(entry.name, entry.stat().st_mtime_ns,
+                                                 date_keys_by_car.get(entry.name, []))
+
+        for key in [key for key in self._dirs if '/' not in key and key not in car_keys]:
+            for date_key in date_keys_by_car.get(key, []):
+                self._forget(date_key)
+            self._forget(key)
+            changed = True
+        if changed:
+            self.save()
+
+    def rebuild(self) -> None:
+        """Discard the manifest and rescan the whole tree."""
+        self._dirs, self._files = {}, {}
+        self._loaded = True
+        self.refresh()
+        self.save()
+
+    def add_file(self, csv_path: Path, rows: Optional[int] = None) -> None:
+        """Record a newly written CSV file (``rows`` avoids re-reading it)."""
+        if not self._loaded:
+            self.refresh()
+        csv_path = Path(csv_path)
+        self._files[self._relative(csv_path)] = self._make_entry(csv_path, csv_path.stat(), rows)
+        for directory in (csv_path.parent, csv_path.parent.parent):
+            self._dirs[self._relative(directory)] = directory.stat().st_mtime_ns
+        self.save()
+
+    # ------------------------------------------------------------------
+    # queries
+    def entries(self, car: Optional[str] = None) -> List[dict]:
+        """Catalog entries sorted by ``(car, date_dir, file_number)``.
+
+        Each entry is a copy of the manifest record with ``path`` set to the
+        absolute :class:`Path` of the CSV file.
+        """
+        self.refresh()
+        result = [dict(entry, path=self.scraped_dir / key)
+                  for key, entry in self._files.items()
+                  if car is None or entry['car'] == car]
+        return sorted(result, key=lambda e: (e['car'], e['date_dir'], e['file_number']))
+
+    def cars(self) -> Dict[str, List[dict]]:
+        """Entries grouped by car directory name (sorted by name)."""
+        grouped: Dict[str, List[dict]] = {}
+        for entry in self.entries():
+            grouped.setdefault(entry['car'], []).append(entry)
+        return grouped
+
+    def files(self, car: Optional[str] = None) -> List[Path]:
+        """CSV paths, optionally limited to one car directory."""
+        return [entry['path'] for entry in self.entries(car)]
+
+    def latest(self, car: Optional[str] = None) -> Optional[dict]:
+        """Most recently modified entry (ties broken by file number)."""
+        entries = self.entries(car)
+        if not entries:
+            return None
+        return max(entries, key=lambda e: (e['mtime'], e['file_number']))
+
+
+_catalogs: Dict[Path, DataCatalog] = {}
+
+
+def get_catalog(project_root: Path) -> DataCatalog:
+    """Return the catalog of the project's scraped data directory.
+
+    The instance is shared per directory, so the manifest is read once per
+    process and later lookups only stat directories.
+    """
+    scraped_dir = get_scraped_dir(project_root)
+    catalog = _catalogs.get(scraped_dir)
+    if catalog is None:
+        catalog = _catalogs[scraped_dir] = DataCatalog(scraped_dir)
+    return catalog
+
+
+def find_car_files(car_dir: Path, project_root: Path) -> List[Path]:
+    """CSV snapshots (``<date dir>/*.csv``) of one car directory.
+
+    Car directories of the project's scraped data directory are listed
+    through its catalog. Any other directory is globbed read-only, so no
+    manifest is written next to user-supplied paths.
+    """
+    car_dir = Path(car_dir)
+    scraped_dir = get_scraped_dir(project_root)
+    try:
+        in_project = car_dir.resolve().parent == scraped_dir.resolve()
+    except OSError:
+        in_project = False
+    if in_project:
+        return get_catalog(project_root).files(car_dir.name)
+    return sorted(path for path in car_dir.glob('*/*.csv') if path.is_file())
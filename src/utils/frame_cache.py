@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+import pandas as pd
+
+# Anchored at the project root so the cache does not depend on the working directory
+DEFAULT_FRAME_CACHE_DIR = Path(__file__).resolve().parents[2] / "data" / "cache" / "frames"
+
+logger = logging.getLogger(__name__)
+
+
+def _feather():
+    """Return ``pyarrow.feather`` or ``None`` when pyarrow is not installed."""
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return None
+    return feather
+
+
+def parse_snapshot(path: Path, columns: Optional[Sequence[str]] = None,
+                   dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Parse a scraped CSV (UTF-8 with BOM) or Excel snapshot.
+
+    ``columns`` limits parsing to those columns (missing ones are ignored)
+    and ``dtype`` maps column names to dtypes.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    usecols = set(columns).__contains__ if columns is not None else None
+    if suffix == '.csv':
+        return pd.read_csv(path, encoding='utf-8-sig', usecols=usecols, dtype=dtype)
+    if suffix in ('.xlsx', '.xls'):
+        return pd.read_excel(path, usecols=usecols, dtype=dtype)
+    raise ValueError(f"サポートされていないファイル形式: {path.suffix}")
+
+
+def cache_path_for(path: Path, cache_dir: Optional[Path] = None,
+                   columns: Optional[Sequence[str]] = None,
+                   dtype: Optional[Dict[str, str]] = None) -> Path:
+    """Return the Feather cache file for the current version of ``path``.
+
+    The name combines a hash of the absolute source path and read options
+    with the source's size and mtime, so a modified source never matches an
+    old cache file.
+    """
+    path = Path(path)
+    stat = path.stat()
+    options = json.dumps([str(path.resolve()), list(columns) if columns is not None else None, dtype],
+                         ensure_ascii=False, sort_keys=True, default=str)
+    key = hashlib.sha1(options.encode('utf-8')).hexdigest()[:16]
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_FRAME_CACHE_DIR
+    return cache_dir / f"{key}_{stat.st_size}_{stat.st_mtime_ns}.feather"
+
+
+def read_snapshot(path: Path, cache_dir: Optional[Path] = None, use_cache: bool = True,
+                  columns: Optional[Sequence[str]] = None,
+                  dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """Read a snapshot, going through the Feather read cache when possible.
+
+    ``columns`` and ``dtype`` are passed to :func:`parse_snapshot`; each
+    combination is cached separately.
+
+    On a hit the Arrow IPC file is memory-mapped and converted to pandas
+    (which copies the columns) instead of parsing the CSV/Excel source. On a miss the source is parsed and the frame is
+    written to the cache; stale cache files of the same source are removed.
+    Without pyarrow (or with ``use_cache=False``) the source is parsed
+    every time.
+    """
+    feather = _feather() if use_cache else None
+    if feather is None:
+        return parse_snapshot(path, columns, dtype)
+
+    cache_path = cache_path_for(path, cache_dir, columns, dtype)
+    if cache_path.exists():
+        try:
+            return feather.read_table(cache_path, memory_map=True).to_pandas()
+        except Exception as e:
+            logger.warning(f"読み込みキャッシュエラー ({cache_path.name}): {e}")
+
+    df = parse_snapshot(path, columns, dtype)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        prefix = cache_path.name.split('_', 1)[0] + '_'
+        for stale in cache_path.parent.glob(f"{prefix}*.feather"):
+            stale.unlink(missing_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        feather.write_feather(df, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        # e.g. mixed-type object columns that Arrow cannot represent
+        logger.warning(f"読み込みキャッシュを作成できません ({Path(path).name}): {e}")
+    return df
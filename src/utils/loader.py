@@ -0,0 +1,141 @@
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .catalog import parse_date_dir
+from .frame_cache import read_snapshot
+
+# Columns whose values repeat across rows and snapshots (listing prices,
+# years and mileages included; parsing them then works on the categories)
+CATEGORY_COLUMNS = ('車種名', 'モデル', '支払総額', '年式', '走行距離', '修復歴', 'ミッション',
+                    '排気量', '取得日', 'ソースURL')
+TEXT_COLUMNS = ('グレード', '取得日時', '取得時刻', '車両URL')
+SNAPSHOT_DTYPES: Dict[str, str] = {
+    **{column: 'category' for column in CATEGORY_COLUMNS},
+    **{column: 'str' for column in TEXT_COLUMNS}
+}
+
+# Columns added by load_snapshots(tag=True)
+SNAPSHOT_DATE_COLUMN = 'スナップショット日'
+FILE_NUMBER_COLUMN = 'ファイル番号'
+
+# Files concatenated together before converting categories (bounds peak memory)
+LOAD_BATCH_FILES = 16
+
+_FILE_NUMBER = re.compile(r'\.No(\d+)\.\w+$')
+
+logger = logging.getLogger(__name__)
+
+Snapshot = Union[Path, str, dict]
+
+
+def _snapshot_info(snapshot: Snapshot):
+    """Return ``(path, date, file_number)`` for a path or catalog entry."""
+    if isinstance(snapshot, dict):
+        return Path(snapshot['path']), snapshot.get('date'), snapshot.get('file_number', 0)
+    path = Path(snapshot)
+    match = _FILE_NUMBER.search(path.name)
+    return path, parse_date_dir(path.parent.name), int(match.group(1)) if match else 0
+
+
+def _unify_categories(frames: List[pd.DataFrame], columns: Iterable[str]) -> None:
+    """Give each categorical column the same categories in every frame.
+
+    ``pd.concat`` only keeps the categorical dtype when the categories match.
+    """
+    for column in columns:
+        parts = [frame[column] for frame in frames if column in frame.columns]
+        if len(parts) < 2:
+            continue
+        categories = union_categoricals(parts, ignore_order=True).categories
+        for frame in frames:
+            if column in frame.columns:
+                frame[column] = frame[column].cat.set_categories(categories)
+
+
+def _default_dtype(columns: Optional[Sequence[str]]) -> Dict[str, str]:
+    return {column: kind for column, kind in SNAPSHOT_DTYPES.items()
+            if columns is None or column in columns}
+
+
+def _read(path: Path, columns: Optional[Sequence[str]], dtype: Dict[str, str],
+          use_cache: bool) -> pd.DataFrame:
+    # Categorical columns are parsed as strings; converting once after
+    # concatenation is much cheaper than per-file categories.
+    parse_dtype = {column: 'str' if kind == 'category' else kind for column, kind in dtype.items()}
+    return read_snapshot(path, columns=columns, dtype=parse_dtype, use_cache=use_cache)
+
+
+def _to_categories(df: pd.DataFrame, dtype: Dict[str, str]) -> pd.DataFrame:
+    for column, kind in dtype.items():
+        if kind == 'category' and column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype('category')
+    return df
+
+
+def load_snapshot(path: Path, columns: Optional[Sequence[str]] = None,
+                  dtype: Optional[Dict[str, str]] = None, use_cache: bool = True) -> pd.DataFrame:
+    """Read one snapshot with the projection and dtypes of :func:`load_snapshots`."""
+    if dtype is None:
+        dtype = _default_dtype(columns)
+    return _to_categories(_read(path, columns, dtype, use_cache), dtype)
+
+
+def load_snapshots(snapshots: Sequence[Snapshot], columns: Optional[Sequence[str]] = None,
+                   dtype: Optional[Dict[str, str]] = None, tag: bool = True,
+                   max_workers: Optional[int] = None, use_cache: bool = True) -> Optional[pd.DataFrame]:
+    """Read several snapshots in a thread pool and concatenate them.
+
+    ``snapshots`` are paths or :class:`~src.utils.catalog.DataCatalog`
+    entries. Only ``columns`` are parsed (all when ``None``) with ``dtype``
+    (default :data:`SNAPSHOT_DTYPES`: categoricals for repeated columns,
+    strings for the rest). With ``tag=True`` each row gets the snapshot date
+    and file number. Files that cannot be read are logged and skipped;
+    ``None`` is returned when nothing could be read.
+    """
+    infos = [_snapshot_info(snapshot) for snapshot in snapshots]
+    if not infos:
+        return None
+    if dtype is None:
+        dtype = _default_dtype(columns)
+
+    def read(info):
+        path, date, file_number = info
+        try:
+            df = _read(path, columns, dtype, use_cache)
+        except Exception as e:
+            logger.warning(f"CSV読み込みエラー {path}: {e}")
+            return None
+        if tag:
+            df[SNAPSHOT_DATE_COLUMN] = pd.Timestamp(date) if date else pd.NaT
+            df[FILE_NUMBER_COLUMN] = np.int16(file_number)
+        return df
+
+    workers = min(max_workers or os.cpu_count() or 1, len(infos))
+    executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    batches = []
+    try:
+        # concatenate and convert categories per batch so that only one
+        # batch of string columns is alive at a time
+        for start in range(0, len(infos), LOAD_BATCH_FILES):
+            batch = infos[start:start + LOAD_BATCH_FILES]
+            frames = list(executor.map(read, batch)) if executor else [read(info) for info in batch]
+            frames = [frame for frame in frames if frame is not None]
+            if frames:
+                batches.append(_to_categories(pd.concat(frames, ignore_index=True), dtype))
+    finally:
+        if executor:
+            executor.shutdown()
+    if not batches:
+        return None
+
+    _unify_categories(batches, [column for column, kind in dtype.items() if kind == 'category'])
+    # columns missing from some batches come out of concat as object
+    return _to_categories(pd.concat(batches, ignore_index=True), dtype)
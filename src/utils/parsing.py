@@ -0,0 +1,141 @@
+from typing import Dict, NamedTuple, Tuple
+
+import numpy as np
+import pandas as pd
+
+# First match only, as in the listing text ("支払総額 450.5万円(税込)")
+PRICE_PATTERN = r'([0-9.]+)万円'
+YEAR_PATTERN = r'(\d{4})'
+# Japanese era years such as "R01" or "平成30" (used when no western year is present)
+ERA_PATTERN = r'(R|H|S|令和|平成|昭和)\s*(元|\d{1,2})'
+MILEAGE_MAN_PATTERN = r'([0-9.]+)万km'
+MILEAGE_KM_PATTERN = r'([0-9.]+)km'
+DISPLACEMENT_PATTERN = r'([0-9.]+)\s*(CC|cc|L)'
+# ".../usedcar/detail/AU6213553402/index.html?TRCD=..." -> "AU6213553402"
+VEHICLE_ID_PATTERN = r'/detail/([A-Za-z0-9]+)'
+
+ERA_OFFSETS = {'R': 2018, '令和': 2018, 'H': 1988, '平成': 1988, 'S': 1925, '昭和': 1925}
+
+# Values that mean "no value" rather than a parse failure
+MISSING_TOKENS = ('応談', '情報なし', '---', '-', '')
+
+# Source column -> (parsed column, parser name)
+VEHICLE_FIELDS: Dict[str, Tuple[str, str]] = {
+    '支払総額': ('価格数値', 'price'),
+    '年式': ('年式数値', 'year'),
+    '走行距離': ('走行距離数値', 'mileage'),
+    '排気量': ('排気量数値', 'displacement')
+}
+
+
+class ParsedColumn(NamedTuple):
+    """Parsed values and a mask of unparseable inputs.
+
+    Values use the narrowest nullable dtype that holds them exactly
+    (prices stay ``Float64`` because they are fractional 万円).
+    """
+    values: pd.Series
+    failed: pd.Series
+
+
+def _unique_strings(series: pd.Series):
+    """Return ``(codes, uniques)`` with the uniques as stripped strings.
+
+    Scraped columns repeat a few values on every row, so every parser works
+    on the unique values and maps the result back through ``codes``.
+    """
+    codes, uniques = pd.factorize(series)
+    return codes, pd.Series(uniques, dtype=object).astype(str).str.strip()
+
+
+def _number(texts: pd.Series, pattern: str) -> np.ndarray:
+    return pd.to_numeric(texts.str.extract(pattern, expand=False), errors='coerce').to_numpy(dtype=float)
+
+
+def _expand(series: pd.Series, codes: np.ndarray, texts: pd.Series, parsed: np.ndarray,
+            dtype: str) -> ParsedColumn:
+    found = codes >= 0
+    values = np.full(len(codes), np.nan)
+    values[found] = parsed[codes[found]]
+
+    unparsed = np.isnan(parsed) & ~texts.isin(MISSING_TOKENS).to_numpy()
+    failed = np.zeros(len(codes), dtype=bool)
+    failed[found] = unparsed[codes[found]]
+
+    if dtype.startswith('Int'):
+        values = np.round(values)
+    return ParsedColumn(pd.Series(values, index=series.index, name=series.name).astype(dtype),
+                        pd.Series(failed, index=series.index, name=series.name))
+
+
+def parse_price(series: pd.Series) -> ParsedColumn:
+    """``"450.5万円"`` -> 450.5 (in 万円, ``Float64``); ``応談`` is missing."""
+    codes, texts = _unique_strings(series)
+    return _expand(series, codes, texts, _number(texts, PRICE_PATTERN), 'Float64')
+
+
+def parse_year(series: pd.Series) -> ParsedColumn:
+    """``"2019(R01)"`` -> 2019 (``Int16``); era-only values such as ``"H30"`` are converted."""
+    codes, texts = _unique_strings(series)
+    years = _number(texts, YEAR_PATTERN)
+
+    era = texts.str.extract(ERA_PATTERN)
+    offsets = era[0].map(ERA_OFFSETS).to_numpy(dtype=float)
+    era_years = offsets + pd.to_numeric(era[1].replace('元', '1'), errors='coerce').to_numpy(dtype=float)
+    years = np.where(np.isnan(years), era_years, years)
+    return _expand(series, codes, texts, years, 'Int16')
+
+
+def parse_mileage(series: pd.Series) -> ParsedColumn:
+    """``"1.3万km"`` -> 13000, ``"300km"`` -> 300 (whole km, ``Int32``)."""
+    codes, texts = _unique_strings(series)
+    mileage = _number(texts, MILEAGE_MAN_PATTERN) * 10000
+    mileage = np.where(np.isnan(mileage), _number(texts, MILEAGE_KM_PATTERN), mileage)
+    return _expand(series, codes, texts, mileage, 'Int32')
+
+
+def parse_displacement(series: pd.Series) -> ParsedColumn:
+    """``"5000CC"`` -> 5000, ``"5.0L"`` -> 5000 (cc, ``Int32``)."""
+    codes, texts = _unique_strings(series)
+    match = texts.str.extract(DISPLACEMENT_PATTERN)
+    amount = pd.to_numeric(match[0], errors='coerce').to_numpy(dtype=float)
+    displacement = np.where(match[1].to_numpy() == 'L', amount * 1000, amount)
+    return _expand(series, codes, texts, displacement, 'Int32')
+
+
+def parse_vehicle_id(series: pd.Series) -> pd.Series:
+    """Canonical vehicle ID from ``車両URL``.
+
+    The detail page ID identifies a listing across snapshots regardless of
+    the tracking query string. Other URLs fall back to the URL without its
+    query string; empty values are missing.
+    """
+    codes, texts = _unique_strings(series)
+    ids = texts.str.extract(VEHICLE_ID_PATTERN, expand=False)
+    ids = ids.fillna(texts.str.split('?', n=1).str[0])
+    ids = ids.where(~texts.isin(MISSING_TOKENS)).to_numpy(dtype=object, na_value=None)
+    values = np.where(codes >= 0, ids[codes] if len(ids) else None, None)
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+PARSERS = {
+    'price': parse_price,
+    'year': parse_year,
+    'mileage': parse_mileage,
+    'displacement': parse_displacement
+}
+
+
+def parse_vehicle_fields(df: pd.DataFrame, fields: Dict[str, Tuple[str, str]] = VEHICLE_FIELDS):
+    """Parse the listing columns of ``df`` present in ``fields``.
+
+    Returns ``(parsed, failed)``: a frame of parsed columns (named by
+    ``fields``, e.g. ``価格数値``) and a boolean frame of parse failures with
+    the same column names.
+    """
+    parsed, failed = {}, {}
+    for source, (target, parser) in fields.items():
+        if source in df.columns:
+            result = PARSERS[parser](df[source])
+            parsed[target], failed[target] = result.values, result.failed
+    return pd.DataFrame(parsed, index=df.index), pd.DataFrame(failed, index=df.index)
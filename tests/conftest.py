@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+
+@pytest.fixture
+def grade_config(tmp_path):
+    """``tmp_path/config`` にグレードDBと除外キーワードを書き込む関数
+
+    ``write(grades, keywords=('禁煙車',))`` は両ファイルを（再）作成し、
+    ``(grades_path, keywords_path)`` を返す。
+    """
+    config_dir = tmp_path / 'config'
+
+    def write(grades, keywords=('禁煙車',)):
+        config_dir.mkdir(exist_ok=True)
+        grades_path = config_dir / 'car_grades.json'
+        keywords_path = config_dir / 'exclude_keywords.txt'
+        grades_path.write_text(json.dumps(grades, ensure_ascii=False), encoding='utf-8')
+        keywords_path.write_text(''.join(f'{keyword}\n' for keyword in keywords), encoding='utf-8')
+        return grades_path, keywords_path
+
+    return write
@@ -0,0 +1,16 @@
+from src.analyzer.aho_corasick import AhoCorasickMatcher
+
+
+def test_find_all_overlapping_patterns():
+    patterns = ['he', 'she', 'his', 'hers', 'xyz']
+    matcher = AhoCorasickMatcher(patterns)
+    assert matcher.find_all('ushers') == {0, 1, 3}
+    assert matcher.find_all('') == set()
+
+
+def test_find_all_matches_substring_check():
+    patterns = ['rz', 'rz ハイパフォーマンス', 'rc f', 'f', 'rz']
+    matcher = AhoCorasickMatcher(patterns)
+    for text in ['1.6 rz ハイパフォーマンス 4wd', 'rc f カーボン', 'gr86', '']:
+        expected = {i for i, p in enumerate(patterns) if p in text}
+        assert matcher.find_all(text) == expected
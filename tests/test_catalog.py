@@ -0,0 +1,72 @@
+import os
+from pathlib import Path
+
+from src.utils import DataCatalog
+
+
+def _write_csv(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = ['車種名,グレード'] + [f'A,X{i}' for i in range(rows)]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8-sig')
+    return path
+
+
+def test_catalog_scan_incremental_and_add(tmp_path):
+    scraped = tmp_path / 'scraped'
+    _write_csv(scraped / 'A' / '2025年06月12日' / '2025_06_12_A.No1.csv', 3)
+    _write_csv(scraped / 'A' / '2025年06月12日' / '2025_06_12_A.No2.csv', 1)
+    _write_csv(scraped / 'B' / '2025年06月13日' / '2025_06_13_B.No1.csv', 2)
+
+    catalog = DataCatalog(scraped)
+    entries = catalog.entries()
+    assert [(e['car'], e['file_number'], e['rows']) for e in entries] == [
+        ('A', 1, 3), ('A', 2, 1), ('B', 1, 2)]
+    assert entries[0]['date'] == '2025-06-12'
+    assert (scraped / '.catalog.json').exists()
+
+    # マニフェストから読み込み、変更のないディレクトリは再走査しない
+    reloaded = DataCatalog(scraped)
+    assert reloaded.files('A') == catalog.files('A')
+
+    # 新しい日付ディレクトリの追加と削除を検出
+    new_file = _write_csv(scraped / 'B' / '2025年06月14日' / '2025_06_14_B.No1.csv', 5)
+    os.remove(scraped / 'A' / '2025年06月12日' / '2025_06_12_A.No2.csv')
+    assert list(DataCatalog(scraped).cars()) == ['A', 'B']
+    assert [e['rows'] for e in DataCatalog(scraped).entries()] == [3, 2, 5]
+    assert DataCatalog(scraped).latest('B')['path'] == new_file
+
+    # add_file は行数を読み直さずに記録
+    added = _write_csv(scraped / 'C' / '2025年06月15日' / '2025_06_15_C.No1.csv', 4)
+    catalog.add_file(added, rows=99)
+    assert DataCatalog(scraped).entries('C')[0]['rows'] == 99
+
+    catalog.rebuild()
+    assert catalog.entries('C')[0]['rows'] == 4
+
+
+def test_catalog_refresh_stats_directories_only(tmp_path, monkeypatch):
+    scraped = tmp_path / 'scraped'
+    date_dir = scraped / 'A' / '2025年06月12日'
+    csv_path = _write_csv(date_dir / '2025_06_12_A.No1.csv', 3)
+    catalog = DataCatalog(scraped)
+    assert catalog.entries('A')[0]['rows'] == 3
+
+    # ディレクトリのmtimeを変えずにファイルだけを書き換える
+    dir_stat = date_dir.stat()
+    _write_csv(csv_path, 7)
+    os.utime(date_dir, ns=(dir_stat.st_atime_ns, dir_stat.st_mtime_ns))
+
+    path_stat = Path.stat
+
+    def no_file_stat(path, *args, **kwargs):
+        assert path.suffix != '.csv', f'unexpected stat: {path}'
+        return path_stat(path, *args, **kwargs)
+
+    with monkeypatch.context() as m:
+        m.setattr(Path, 'stat', no_file_stat)
+        assert catalog.entries('A')[0]['rows'] == 3
+        assert DataCatalog(scraped).entries('A')[0]['rows'] == 3
+
+    # 明示的な再構築で書き換えを反映
+    catalog.rebuild()
+    assert catalog.entries('A')[0]['rows'] == 7
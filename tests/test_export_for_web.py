@@ -0,0 +1,106 @@
+import io
+import json
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from scripts.export_for_web import build_web_records, deduplicate_vehicles, write_json_records
+
+
+def _detail_url(vehicle_id, query=''):
+    return f'https://www.carsensor.net/usedcar/detail/{vehicle_id}/index.html{query}'
+
+
+def test_deduplicate_vehicles():
+    df = pd.DataFrame({
+        '車両URL': [
+            _detail_url('AU0000000001', '?TRCD=1'),
+            _detail_url('AU0000000001', '?TRCD=2'),
+            _detail_url('AU0000000001'),
+            _detail_url('AU0000000001'),
+            _detail_url('AU0000000002'),
+            None,
+            None,
+        ],
+        '取得日時': [
+            '2025-06-12T09:00:00', '2025-06-12T18:00:00', '2025-06-14T09:00:00', '2025-06-15T09:00:00',
+            '2025-06-13T09:00:00', '2025-06-13T09:00:00', '2025-06-13T09:00:00',
+        ],
+        '価格数値': pd.array([500.0, 490.0, 480.0, None, 300.0, 200.0, 200.0], dtype='Float64'),
+        'グレード': ['X1', 'X2', 'X3', 'X4', 'Y', 'Z', 'Z'],
+    })
+
+    result = deduplicate_vehicles(df).set_index('車両ID')
+
+    # URLのない行は同じ内容でも別の車両
+    assert len(result) == 4
+    assert result['車両URL'].isna().sum() == 2
+
+    first = result.loc['AU0000000001']
+    assert first['グレード'] == 'X4'
+    assert (first['初回掲載日'], first['最終掲載日']) == ('2025-06-12', '2025-06-15')
+    # 同じ日は最後の観測、価格のない観測は履歴に含めない
+    assert first['価格履歴'] == [['2025-06-12', 490.0], ['2025-06-14', 480.0]]
+
+    second = result.loc['AU0000000002']
+    assert (second['初回掲載日'], second['最終掲載日']) == ('2025-06-13', '2025-06-13')
+    assert second['価格履歴'] == [['2025-06-13', 300.0]]
+
+
+def test_deduplicate_vehicles_without_prices():
+    df = pd.DataFrame({
+        '車両URL': [_detail_url('AU0000000001')] * 2,
+        '取得日時': ['2025-06-12T09:00:00', '2025-06-13T09:00:00'],
+        '価格数値': pd.array([None, None], dtype='Float64'),
+    })
+
+    result = deduplicate_vehicles(df)
+    assert result['価格履歴'].tolist() == [[]]
+    assert result['最終掲載日'].tolist() == ['2025-06-13']
+
+
+def _web_frame(count):
+    return pd.DataFrame({
+        '車種名': 'RC F',
+        'グレード': [f'グレード{i}' for i in range(count)],
+        '価格数値': pd.array([float(i) if i % 3 else None for i in range(count)], dtype='Float64'),
+        '年式数値': pd.array([2020 + i % 5 for i in range(count)], dtype='Int16'),
+        '走行距離数値': [i * 1000.0 for i in range(count)],
+    })
+
+
+def _write(records, **kwargs):
+    buffer = io.StringIO()
+    write_json_records(records, buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def _reject_constant(name):
+    raise ValueError(f'invalid JSON constant: {name}')
+
+
+@pytest.mark.parametrize('count, chunk_rows', [(0, 2), (1, 2), (2, 2), (7, 2), (7, 3), (7, 10)])
+@pytest.mark.parametrize('pretty', [False, True])
+def test_write_json_records_matches_json_dumps(count, chunk_rows, pretty):
+    records = build_web_records(_web_frame(count))
+    expected_records = [
+        {key: (None if pd.isna(value) else value) for key, value in row.items()}
+        for row in records.astype(object).to_dict('records')
+    ]
+    if pretty:
+        expected = json.dumps(expected_records, ensure_ascii=False, indent=2)
+    else:
+        expected = json.dumps(expected_records, ensure_ascii=False, separators=(',', ':'))
+
+    text = _write(records, pretty=pretty, chunk_rows=chunk_rows)
+    assert text == expected
+    assert json.loads(text, parse_constant=_reject_constant) == expected_records
+
+
+def test_write_json_records_writes_missing_values_as_null():
+    records = build_web_records(_web_frame(4))
+    parsed = json.loads(_write(records, chunk_rows=3), parse_constant=_reject_constant)
+    assert [row['price'] for row in parsed] == [None, 1.0, 2.0, None]
+    assert parsed[1]['year'] == 2021
+    assert parsed[0]['モデル'] == '情報なし'
@@ -0,0 +1,39 @@
+import os
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from src.utils.frame_cache import DEFAULT_FRAME_CACHE_DIR, cache_path_for, read_snapshot
+
+CSV_TEXT = '﻿車種名,グレード,支払総額\nRC F,ベース,450万円\nRC F,カーボン,\n'
+
+
+def test_read_snapshot_without_cache(tmp_path):
+    source = tmp_path / 'a.csv'
+    source.write_text(CSV_TEXT, encoding='utf-8')
+    df = read_snapshot(source, cache_dir=tmp_path / 'cache', use_cache=False)
+    assert df['グレード'].tolist() == ['ベース', 'カーボン']
+    assert not (tmp_path / 'cache').exists()
+
+
+def test_read_snapshot_cache_is_invalidated_by_source_change(tmp_path):
+    pytest.importorskip('pyarrow')
+    cache_dir = tmp_path / 'cache'
+    source = tmp_path / 'a.csv'
+    source.write_text(CSV_TEXT, encoding='utf-8')
+
+    first = read_snapshot(source, cache_dir=cache_dir)
+    assert cache_path_for(source, cache_dir).exists()
+    pd.testing.assert_frame_equal(read_snapshot(source, cache_dir=cache_dir), first)
+
+    source.write_text(CSV_TEXT + 'RC F,RC F,980万円\n', encoding='utf-8')
+    os.utime(source, ns=(0, 10 ** 9))
+    assert len(read_snapshot(source, cache_dir=cache_dir)) == 3
+    assert len(list(cache_dir.iterdir())) == 1
+
+
+def test_default_cache_dir_is_anchored_at_project_root():
+    project_root = Path(__file__).resolve().parent.parent
+    assert DEFAULT_FRAME_CACHE_DIR == project_root / 'data' / 'cache' / 'frames'
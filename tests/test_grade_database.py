@@ -0,0 +1,102 @@
+import json
+import os
+
+from src.analyzer.grade_database import (
+    CompiledGradeCache, LazyGradeDatabase, build_offset_index, file_stamp
+)
+
+
+def test_compiled_cache_roundtrip_and_invalidation(tmp_path, grade_config):
+    grades_path, keywords_path = grade_config(
+        [{'car_name': 'RC F', 'grades': ['RC F'], 'aliases': ['F']}], keywords=('# comment', 'ETC', '禁煙車'))
+    cache = CompiledGradeCache(grades_path, keywords_path, tmp_path / 'cache')
+
+    payload, from_cache = cache.load_or_build()
+    assert not from_cache
+    assert payload['exclude_keywords'] == ['ETC', '禁煙車']
+    assert payload['alias_index'] == [('RC F', ['F'])]
+
+    payload, from_cache = cache.load_or_build()
+    assert from_cache
+
+    # mtimeだけ変わった場合は内容ハッシュが一致するので再利用
+    os.utime(keywords_path, ns=(1, 1))
+    cached, from_cache = cache.load_or_build()
+    assert from_cache
+    assert cached['fingerprint'] == payload['fingerprint']
+
+    keywords_path.write_text('ETC\n', encoding='utf-8')
+    rebuilt, from_cache = cache.load_or_build()
+    assert not from_cache
+    assert rebuilt['exclude_keywords'] == ['ETC']
+    assert rebuilt['fingerprint'] != payload['fingerprint']
+
+
+def test_compiled_cache_missing_sources(tmp_path):
+    cache = CompiledGradeCache(tmp_path / 'none.json', tmp_path / 'none.txt',
+                               tmp_path / 'cache')
+    payload, _ = cache.load_or_build()
+    assert payload['car_grades_db'] == {}
+    assert not payload['grades_found']
+    assert not payload['keywords_found']
+
+
+def test_lazy_database_matches_full_load(tmp_path, grade_config):
+    grades = [
+        {'car_name': 'GRヤリス', 'grades': ['RZ', 'RZ ハイパフォーマンス']},
+        {'car_name': 'RC F', 'grades': ['RC F'], 'aliases': ['F'],
+         'special_patterns': {'カーボン': 'RC F Carbon'}},
+        {'car_name': 'GRヤリス', 'grades': ['RS']},
+    ]
+    grades_path, keywords_path = grade_config(grades)
+    full, _ = CompiledGradeCache(grades_path, keywords_path, tmp_path / 'cache').load_or_build()
+    lazy_payload, _ = CompiledGradeCache(grades_path, keywords_path, tmp_path / 'cache',
+                                         lazy=True).load_or_build()
+
+    assert lazy_payload['alias_index'] == full['alias_index']
+    assert lazy_payload['fingerprint'] == full['fingerprint']
+
+    db = LazyGradeDatabase(grades_path, lazy_payload['offsets'],
+                           lazy_payload['stamps']['grades'])
+    assert list(db) == list(full['car_grades_db'])
+    assert 'RC F' in db and db.loaded_count == 0
+    assert db['RC F'] == full['car_grades_db']['RC F']
+    assert db['GRヤリス'] == {'grades': ['RS'], 'aliases': [], 'special_patterns': {}}
+    assert db.loaded_count == 2
+
+
+def test_lazy_database_refreshes_when_source_changes(grade_config):
+    grades_path, keywords_path = grade_config([{'car_name': 'A', 'grades': ['X']}])
+    offsets, _ = build_offset_index(grades_path.read_bytes())
+    refreshed = []
+    db = LazyGradeDatabase(grades_path, offsets, file_stamp(grades_path), on_refresh=refreshed.append)
+
+    grades_path.write_text(json.dumps(
+        [{'car_name': 'B', 'grades': [], 'aliases': ['BB']}, {'car_name': 'A', 'grades': ['Y']}]),
+        encoding='utf-8')
+    os.utime(grades_path, ns=(1, 1))
+    assert db['A']['grades'] == ['Y']
+    assert 'B' in db
+    assert refreshed == [[('B', ['BB'])]]
+
+
+def test_lazy_normalizer_updates_aliases_after_source_edit(grade_config):
+    from src.analyzer.grade_normalizer import GradeNormalizer
+
+    grades_path, keywords_path = grade_config([{'car_name': 'A', 'grades': ['X'], 'aliases': ['AA']},
+                                               {'car_name': 'C', 'grades': ['Z']}])
+    normalizer = GradeNormalizer(grades_path, keywords_path, use_cache=False, lazy=True)
+    assert normalizer.normalize_car_name('AA') == 'A'
+    assert normalizer.find_best_grade_match('X', 'A') == ('X', 1.0)
+    fingerprint = normalizer.config_fingerprint
+
+    grades_path.write_text(json.dumps(
+        [{'car_name': 'A', 'grades': ['Y'], 'aliases': ['QQ']},
+         {'car_name': 'C', 'grades': ['Z']}]), encoding='utf-8')
+    os.utime(grades_path, ns=(1, 1))
+    # 未読み込みの車種へのアクセスで変更を検出
+    assert normalizer.find_best_grade_match('Z', 'C') == ('Z', 1.0)
+
+    assert normalizer.normalize_car_name('QQ') == 'A'
+    assert normalizer.find_best_grade_match('Y', 'A') == ('Y', 1.0)
+    assert normalizer.config_fingerprint != fingerprint
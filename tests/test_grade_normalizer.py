@@ -0,0 +1,217 @@
+import json
+import random
+import sys
+import types
+from difflib import SequenceMatcher
+
+import pytest
+
+# Provide minimal pandas stub if pandas is not installed
+if 'pandas' not in sys.modules:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.modules['pandas'] = types.ModuleType('pandas')
+
+from src.analyzer import grade_normalizer
+from src.analyzer.grade_normalizer import GradeNormalizer, TierStats, split_rows_by_car
+
+
+def _brute_force_match(normalizer, input_grade, car_name):
+    """全候補の類似度を順に計算する素朴な実装"""
+    normalized_car_name = normalizer.normalize_car_name(car_name)
+    if normalized_car_name not in normalizer.car_grades_db:
+        return normalizer.extract_core_grade(input_grade, car_name), 0.0
+
+    official_grades = normalizer.car_grades_db[normalized_car_name]['grades']
+    cleaned = normalizer.clean_grade_text(input_grade).lower()
+    core = normalizer.extract_core_grade(input_grade, normalized_car_name)
+    best_match, best_score = core, 0.0
+    for official in official_grades:
+        official_lower = official.lower()
+        if cleaned == official_lower:
+            return official, 1.0
+        if core.lower() == official_lower:
+            return official, 0.95
+        score = SequenceMatcher(None, cleaned, official_lower).ratio()
+        contained = core.lower() in official_lower or official_lower in cleaned
+        if score > best_score and (contained or score > 0.6):
+            best_match, best_score = official, score
+    return best_match, best_score
+
+
+def _sample_inputs(count=300, seed=0):
+    with open('config/car_grades.json', encoding='utf-8') as f:
+        cars = [c for c in json.load(f) if c['grades']]
+    noise = ['純正ナビ', 'ETC', '禁煙車', '4WD', 'ターボ', 'HYBRID', 'S', 'X']
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        car = rng.choice(cars)
+        words = rng.choice(car['grades']).split()
+        if len(words) > 1 and rng.random() < 0.3:
+            words.pop(rng.randrange(len(words)))
+        words += rng.sample(noise, rng.randint(0, 3))
+        samples.append((car['car_name'], ' '.join(words)))
+    return samples
+
+
+def test_pruned_matching_equals_brute_force():
+    gn = GradeNormalizer()
+    samples = _sample_inputs() + [
+        ('F', 'RC  カーボンエクステリアパッケージ 純正ナビ バックカメラ ETC'),
+        ('RC F', 'ベース'),
+        ('Unknown', 'RZ ハイパフォーマンス'),
+    ]
+    for car_name, grade in samples:
+        assert gn.find_best_grade_match(grade, car_name) == \
+            _brute_force_match(gn, grade, car_name), (car_name, grade)
+
+
+def test_shared_instance_gives_same_results_from_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    samples = _sample_inputs(count=200, seed=1)
+    expected = [GradeNormalizer().find_best_grade_match(grade, car) for car, grade in samples]
+
+    # メモ化dictの差し替えが頻繁に起きるようにする
+    monkeypatch.setattr(grade_normalizer, 'CLEANED_CACHE_SIZE', 8)
+    shared = GradeNormalizer()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda item: shared.find_best_grade_match(item[1], item[0]), samples))
+    assert results == expected
+
+
+def test_grade_index_is_cached_per_car():
+    gn = GradeNormalizer()
+    index = gn.get_grade_index('RC F')
+    assert index is gn.get_grade_index('RC F')
+    assert index['lowered'][0] == 'rc f'
+    assert index['lengths'][0] == 4
+
+
+def test_split_rows_by_car_preserves_positions():
+    tasks = split_rows_by_car(['A', 'B', 'A', 'A', 'B'], chunk_size=2)
+    assert tasks == [('A', [0, 2]), ('A', [3]), ('B', [1, 4])]
+
+
+def test_normalize_grade_rows_multi_car(monkeypatch):
+    gn = GradeNormalizer()
+    rows = [('F', 'RC カーボンエクステリアパッケージ ETC'), ('GRヤリス', 'RZ ハイパフォーマンス'),
+            ('F', None), ('GRヤリス', 'RZ'), ('Unknown', 'X 4WD')] * 3
+    car_names = [car for car, _ in rows]
+    grades = [grade for _, grade in rows]
+    expected = [('ベース', 0.0) if grade is None else gn.find_best_grade_match(grade, car)
+                for car, grade in rows]
+
+    assert gn.normalize_grade_rows(car_names, grades, max_workers=1) == expected
+
+    monkeypatch.setattr(grade_normalizer, 'PARALLEL_MIN_ROWS', 1)
+    assert gn.normalize_grade_rows(car_names, grades, max_workers=2, chunk_size=2) == expected
+
+
+def test_normalize_batch_returns_arrays():
+    np = pytest.importorskip('numpy')
+    gn = GradeNormalizer()
+    cars = ['F', 'GRヤリス', 'F']
+    grades = ['RC カーボンエクステリアパッケージ', 'RZ', None]
+    normalized, scores = gn.normalize_batch(cars, grades, max_workers=1)
+
+    assert normalized.dtype == object and scores.dtype == np.float32
+    assert list(normalized) == ['RC F Carbon Exterior Package', 'RZ', 'ベース']
+    assert scores[1] == 1.0 and scores[2] == 0.0
+
+    single, _ = gn.normalize_batch('GRヤリス', ['RZ'], max_workers=1)
+    assert list(single) == ['RZ']
+
+
+def test_match_tiers_and_stats():
+    gn = GradeNormalizer()
+    assert gn.find_best_grade_match('RZ 禁煙車', 'GRヤリス', tier='exact') == ('RZ', 1.0)
+    # 特殊パターンは exact 段階で解決
+    assert gn.find_best_grade_match('RC カーボンエクステリアパッケージ', 'F', tier='exact') == \
+        ('RC F Carbon Exterior Package', 0.95)
+    with pytest.raises(ValueError):
+        gn.find_best_grade_match('RZ', 'GRヤリス', tier='fast')
+
+    grades = ['RZ', 'RZ', None, 'RZ ハイパフォーマンス 純正ナビ', 'ｱｲｳ']
+    stats = TierStats()
+    auto = gn.normalize_grades_for_car('GRヤリス', grades, tier='auto', stats=stats)
+    assert auto[:3] == [('RZ', 1.0), ('RZ', 1.0), ('ベース', 0.0)]
+    assert stats.rows['exact'] == 2
+    assert stats.rows['unresolved'] == 1
+    assert sum(stats.rows.values()) == len(grades)
+    assert stats.seconds['exact'] > 0
+
+    full = gn.normalize_grades_for_car('GRヤリス', grades)
+    assert auto[3] == full[3]
+
+
+def test_exact_tier_skips_cleaning_for_official_grades(monkeypatch):
+    gn = GradeNormalizer()
+    calls = []
+    clean = gn.clean_grade_text
+    monkeypatch.setattr(gn, 'clean_grade_text', lambda text: calls.append(text) or clean(text))
+
+    assert gn.find_best_grade_match(' rz ', 'GRヤリス', tier='exact') == ('RZ', 1.0)
+    assert calls == []
+    gn.find_best_grade_match('RZ 禁煙車', 'GRヤリス', tier='exact')
+    assert calls == ['RZ 禁煙車']
+
+
+def test_full_tier_matches_cleaned_input_even_if_raw_input_is_official(grade_config):
+    gn = GradeNormalizer(*grade_config([{'car_name': 'A', 'grades': ['X', 'X 禁煙車']}]), use_cache=False)
+
+    # 従来どおり除外キーワードを取り除いてから照合する
+    assert gn.find_best_grade_match('X 禁煙車', 'A') == ('X', 1.0)
+    assert gn.find_best_grade_match('X 禁煙車', 'A', tier='standard') == ('X', 1.0)
+    assert gn.find_best_grade_match('X 禁煙車', 'A') == _brute_force_match(gn, 'X 禁煙車', 'A')
+    # exact のみ入力そのものの一致を優先する
+    assert gn.find_best_grade_match('X 禁煙車', 'A', tier='exact') == ('X 禁煙車', 1.0)
+
+
+def test_clean_grade_text_applies_only_contained_keywords(grade_config):
+    keywords = [f'KW{i}' for i in range(200)] + ['ETC']
+    gn = GradeNormalizer(*grade_config([], keywords=keywords), use_cache=False)
+
+    class CountingPattern:
+        def __init__(self, pattern):
+            self.pattern = pattern
+            self.calls = 0
+
+        def sub(self, repl, text):
+            self.calls += 1
+            return self.pattern.sub(repl, text)
+
+    gn._get_exclude_patterns()
+    gn._exclude_patterns = [(keyword, CountingPattern(pattern))
+                            for keyword, pattern in gn._exclude_patterns]
+    assert gn.clean_grade_text('RZ etc 純正ナビ') == 'RZ 純正ナビ'
+    assert gn.clean_grade_text('RZ etc 純正ナビ') == 'RZ 純正ナビ'
+    assert [pattern.calls for _, pattern in gn._exclude_patterns if pattern.calls] == [1]
+
+
+def test_unknown_car_fallback_is_same_for_all_tiers():
+    gn = GradeNormalizer()
+    results = {tier: gn.find_best_grade_match('X 4WD ETC', 'Unknown', tier=tier)
+               for tier in ('exact', 'standard', 'full', 'auto')}
+    assert set(results.values()) == {(gn.extract_core_grade('X 4WD ETC', 'Unknown'), 0.0)}
+
+
+def test_car_config_hash_changes_only_for_edited_car(tmp_path, grade_config):
+    grades = [{'car_name': 'A', 'grades': ['X'], 'aliases': ['エー']},
+              {'car_name': 'B', 'grades': ['Y']}]
+
+    def load():
+        return GradeNormalizer(*grade_config(grades), cache_dir=tmp_path / 'cache')
+
+    before = load()
+    grades[1]['grades'].append('Y2')
+    after = load()
+
+    assert before.car_config_hash('A') == after.car_config_hash('A')
+    assert before.car_config_hash('エー') == after.car_config_hash('A')
+    assert before.car_config_hash('B') != after.car_config_hash('B')
+    assert after.car_config_hash('A') != after.car_config_hash('A', tier='exact')
+    assert after.config_hashes('A', 2) == [after.car_config_hash('A')] * 2
+    assert after.config_hashes('A', 2) == [after.car_config_hash('A')] * 2
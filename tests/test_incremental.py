@@ -0,0 +1,41 @@
+import os
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from src.analyzer.incremental import SOURCE_COLUMN, CumulativeDataset, SnapshotWatermarks
+
+
+def test_watermarks_detect_new_changed_and_unchanged(tmp_path):
+    snapshot = tmp_path / 'a.csv'
+    snapshot.write_text('グレード\nRS\n', encoding='utf-8')
+    store_path = tmp_path / 'marks.json'
+
+    watermarks = SnapshotWatermarks(store_path)
+    status, content_hash = watermarks.status('car/a.csv', snapshot)
+    assert status == 'new'
+    watermarks.mark('car/a.csv', snapshot, content_hash, rows=1)
+    watermarks.save()
+
+    watermarks = SnapshotWatermarks(store_path)
+    assert watermarks.status('car/a.csv', snapshot)[0] == 'unchanged'
+
+    # mtime だけ変わった場合は内容ハッシュで未変更と判定
+    os.utime(snapshot, ns=(0, 10 ** 9))
+    assert watermarks.status('car/a.csv', snapshot)[0] == 'unchanged'
+
+    snapshot.write_text('グレード\nRZ\n', encoding='utf-8')
+    assert watermarks.status('car/a.csv', snapshot)[0] == 'changed'
+
+
+def test_cumulative_dataset_appends_and_replaces(tmp_path):
+    dataset = CumulativeDataset(tmp_path / 'car_cumulative.csv')
+    dataset.append(pd.DataFrame({'正規グレード': ['RS', 'RZ'], SOURCE_COLUMN: ['a.csv', 'a.csv']}))
+    dataset.append(pd.DataFrame({SOURCE_COLUMN: ['b.csv'], '正規グレード': ['S']}))
+    assert dataset.header() == ['正規グレード', SOURCE_COLUMN]
+
+    dataset.append(pd.DataFrame({'正規グレード': ['G'], SOURCE_COLUMN: ['a.csv']}),
+                   replace_sources=['a.csv'])
+    result = pd.read_csv(dataset.path, encoding='utf-8-sig')
+    assert result.to_dict('list') == {'正規グレード': ['S', 'G'], SOURCE_COLUMN: ['b.csv', 'a.csv']}
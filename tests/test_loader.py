@@ -0,0 +1,33 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from src.utils.loader import FILE_NUMBER_COLUMN, SNAPSHOT_DATE_COLUMN, load_snapshots
+
+
+def _write_snapshot(root, date_dir, number, rows):
+    directory = root / 'RC_F' / date_dir
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"RC_F.No{number}.csv"
+    lines = ['車種名,グレード,修復歴,支払総額'] + [','.join(row) for row in rows]
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8-sig')
+    return path
+
+
+def test_load_snapshots_projects_types_and_tags(tmp_path):
+    first = _write_snapshot(tmp_path, '2025年01月01日', 1, [('RC F', 'ベース', 'なし', '450万円')])
+    second = _write_snapshot(tmp_path, '2025年01月02日', 2, [('RC F', 'カーボン', 'あり', '980')])
+
+    df = load_snapshots([first, second], columns=['車種名', '修復歴', '支払総額'],
+                        max_workers=2, use_cache=False)
+
+    assert list(df.columns) == ['車種名', '修復歴', '支払総額', SNAPSHOT_DATE_COLUMN, FILE_NUMBER_COLUMN]
+    assert isinstance(df['修復歴'].dtype, pd.CategoricalDtype)
+    assert set(df['修復歴'].cat.categories) == {'なし', 'あり'}
+    assert df['支払総額'].tolist() == ['450万円', '980']
+    assert df[SNAPSHOT_DATE_COLUMN].dt.strftime('%Y-%m-%d').tolist() == ['2025-01-01', '2025-01-02']
+    assert df[FILE_NUMBER_COLUMN].tolist() == [1, 2]
+
+
+def test_load_snapshots_skips_unreadable_files(tmp_path):
+    assert load_snapshots([tmp_path / 'missing.csv'], use_cache=False) is None
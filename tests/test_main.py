@@ -0,0 +1,215 @@
+import os
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from scripts import main
+from src.analyzer.grade_normalizer import CONFIG_HASH_COLUMN, GradeNormalizer
+from src.analyzer.incremental import SOURCE_COLUMN, CumulativeDataset
+from src.analyzer.result_writer import read_analysis_result
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'project_root', tmp_path)
+    return main.CarAnalysisSystem(output_format='csv')
+
+
+def test_renormalize_changed_rewrites_only_files_with_edited_cars(system, tmp_path, monkeypatch, grade_config):
+    grades = [{'car_name': 'A', 'grades': ['X']}, {'car_name': 'B', 'grades': ['Y']}]
+
+    def load_normalizer(**kwargs):
+        return GradeNormalizer(*grade_config(grades), cache_dir=tmp_path / 'cache')
+
+    normalizer = load_normalizer()
+    output_dir = tmp_path / 'data' / 'normalized'
+    output_dir.mkdir(parents=True)
+    mixed = output_dir / 'A_normalized_1.csv'
+    only_a = output_dir / 'A_normalized_2.csv'
+    for path, cars in ((mixed, ['A', 'B']), (only_a, ['A', 'A'])):
+        df = pd.DataFrame({'車種名': cars, 'グレード': ['X 禁煙車', 'Y2']})
+        system.save_analysis_result(normalizer.normalize_dataframe(df), 'source.csv', path)
+    only_a_mtime = only_a.stat().st_mtime_ns
+
+    # B の正規グレードだけを変更
+    grades[1]['grades'].append('Y2')
+    monkeypatch.setattr(main, 'get_shared_normalizer', load_normalizer)
+
+    assert system.renormalize_outputs(changed_only=True) == [mixed]
+    assert only_a.stat().st_mtime_ns == only_a_mtime
+
+    df, metadata = read_analysis_result(mixed)
+    assert df['正規グレード'].tolist() == ['X', 'Y2']
+    assert metadata['ソースファイル'] == 'source.csv'
+    assert df[CONFIG_HASH_COLUMN].nunique() == 2
+
+    # 変更がなければどのファイルも書き換えない
+    assert system.renormalize_outputs(changed_only=True) == []
+
+
+def test_renormalize_changed_updates_cumulative_datasets(system, tmp_path, monkeypatch, grade_config):
+    grades = [{'car_name': 'A', 'grades': ['X']}, {'car_name': 'B', 'grades': ['Y']}]
+
+    def load_normalizer(**kwargs):
+        return GradeNormalizer(*grade_config(grades), cache_dir=tmp_path / 'cache')
+
+    dataset = CumulativeDataset(tmp_path / 'data' / 'normalized' / 'cumulative' / 'B_cumulative.csv')
+    df = pd.DataFrame({'車種名': ['B', 'B'], 'グレード': ['Y2', None], '年式': ['2020', '2021']})
+    dataset.append(load_normalizer().normalize_dataframe(df).assign(**{SOURCE_COLUMN: 'B/a.csv'}))
+    assert dataset.read()['正規グレード'].tolist() == ['Y', 'ベース']
+
+    grades[1]['grades'].append('Y2')
+    monkeypatch.setattr(main, 'get_shared_normalizer', load_normalizer)
+
+    assert system.renormalize_outputs(changed_only=True) == [dataset.path]
+    result = dataset.read()
+    assert result['正規グレード'].tolist() == ['Y2', 'ベース']
+    assert result['年式'].tolist() == ['2020', '2021']
+    assert result[SOURCE_COLUMN].tolist() == ['B/a.csv'] * 2
+    assert system.renormalize_outputs(changed_only=True) == []
+
+
+def test_normalizer_service_is_resolved_once(system, monkeypatch):
+    pings = []
+
+    class BrokenClient:
+        def normalize_dataframe(self, df, max_workers=None, tier='full'):
+            raise ConnectionError("停止済み")
+
+    class LocalNormalizer:
+        def normalize_dataframe(self, df, max_workers=None, tier='full'):
+            return df.assign(正規グレード=df['グレード'])
+
+    monkeypatch.setattr(main, 'connect_normalizer_service', lambda: pings.append(1) or BrokenClient())
+    monkeypatch.setattr(main, 'get_shared_normalizer', lambda **kwargs: LocalNormalizer())
+    df = pd.DataFrame({'車種名': ['A'], 'グレード': ['X']})
+
+    for _ in range(3):
+        normalized, normalizer = system.normalize_data(df)
+        assert isinstance(normalizer, LocalNormalizer)
+        assert normalized['正規グレード'].tolist() == ['X']
+    # 接続確認は1回だけ。エラー後はサービスを使わない
+    assert pings == [1]
+
+
+def _write_snapshot(car_dir, date_dir, name):
+    path = car_dir / date_dir / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text('車種名,グレード\nA,X\n', encoding='utf-8-sig')
+    return path
+
+
+def test_find_car_data_in_dir_outside_scraped_is_read_only(system, tmp_path):
+    car_dir = tmp_path / 'elsewhere' / 'RC F'
+    older = _write_snapshot(car_dir, '2025年06月12日', '2025_06_12_RC F.No1.csv')
+    newer = _write_snapshot(car_dir, '2025年06月13日', '2025_06_13_RC F.No1.csv')
+    os.utime(older, (1, 1))
+
+    assert system.find_car_data_in_dir(car_dir) == newer
+    assert not (car_dir.parent / '.catalog.json').exists()
+    assert not (tmp_path / 'data' / 'scraped' / '.catalog.json').exists()
+
+
+def test_find_car_data_file_matches_case_insensitively(system, tmp_path):
+    path = _write_snapshot(tmp_path / 'data' / 'scraped' / 'RC F', '2025年06月12日', '2025_06_12_RC F.No1.csv')
+
+    assert system.find_car_data_file('rc f') == path
+    assert system.find_car_data_in_dir(path.parent.parent) == path
+
+
+@pytest.fixture
+def fleet(tmp_path):
+    scraped = tmp_path / 'data' / 'scraped'
+    return {
+        'A_old': _write_snapshot(scraped / 'A', '2025年06月10日', '2025_06_10_A.No1.csv'),
+        'A_new': _write_snapshot(scraped / 'A', '2025年06月14日', '2025_06_14_A.No1.csv'),
+        'B': _write_snapshot(scraped / 'B', '2025年06月13日', '2025_06_13_B.No1.csv'),
+        'C': _write_snapshot(scraped / 'C', '2025年06月09日', '2025_06_09_C.No1.csv'),
+    }
+
+
+def test_fleet_target_files_latest_and_since(system, fleet):
+    os.utime(fleet['A_old'], (1, 1))
+
+    assert system.fleet_target_files() == {
+        'A': [fleet['A_new']], 'B': [fleet['B']], 'C': [fleet['C']]}
+    assert system.fleet_target_files(since='2025-06-10') == {
+        'A': [fleet['A_old'], fleet['A_new']], 'B': [fleet['B']]}
+    assert system.fleet_target_files(since='2025-06-15') == {}
+
+
+def test_analyze_fleet_continues_after_failure(system, fleet, monkeypatch, capsys):
+    def analyze_file(path, tier='full', max_workers=None, output_tag=None):
+        if '_B.' in path:
+            raise ValueError('壊れたCSV')
+        report = {'total_count': 10, 'unique_normalized_grades': 2,
+                  'matching_quality': {'high_confidence': 6, 'medium_confidence': 3, 'low_confidence': 1}}
+        return Path(path).with_suffix('.out'), report
+
+    monkeypatch.setattr(system, 'analyze_file', analyze_file)
+    results = system.analyze_fleet(since='2025-06-01', workers=1)
+
+    assert sorted((r['car'], r['error']) for r in results) == [
+        ('A', None), ('A', None), ('B', '壊れたCSV'), ('C', None)]
+    succeeded = [r for r in results if r['error'] is None]
+    assert [(r['rows'], r['high'], r['medium'], r['low']) for r in succeeded] == [(10, 6, 3, 1)] * 3
+
+    out = capsys.readouterr().out
+    assert '合計: 3車種 / 4ファイル (失敗 1件)' in out
+    rows = {line.split()[0]: line.split() for line in out.splitlines() if line[:2] in ('A ', 'B ', 'C ')}
+    # 車種 ファイル 件数 グレード数 高精度 中精度 低精度 秒 状態
+    assert rows['A'][1:7] == ['2', '20', '2', '12', '6', '2']
+    assert rows['A'][-1] == 'OK'
+    assert rows['B'][1:3] == ['1', '0']
+    assert rows['B'][-1] == 'エラー1件'
+
+
+class _StubScraper:
+    """保存済みDataFrameを ``on_saved`` に順に渡すだけのスクレイパー"""
+
+    cars = ['A', 'B', 'C', 'D', 'E']
+
+    def run_from_urls_file(self, urls_file=None, on_saved=None):
+        saved = []
+        for car in self.cars:
+            csv_path = f'{car}.csv'
+            on_saved(csv_path, pd.DataFrame({'車種名': [car], 'グレード': ['X']}))
+            saved.append(csv_path)
+        return saved
+
+
+def test_run_pipeline_analyzes_every_scraped_file(system, monkeypatch):
+    analyzed = []
+
+    def analyze_frame(df, source, tier='full'):
+        analyzed.append(df['車種名'].iloc[0])
+        return source.with_suffix('.out'), {}
+
+    monkeypatch.setattr(main, 'CarScraper', _StubScraper)
+    monkeypatch.setattr(system, 'analyze_frame', analyze_frame)
+    monkeypatch.setattr(system, 'print_analysis_report', lambda report, path: None)
+
+    outputs = system.run_pipeline(queue_size=1)
+    assert analyzed == _StubScraper.cars
+    assert outputs == [Path(f'{car}.out') for car in _StubScraper.cars]
+
+
+def test_run_pipeline_surfaces_consumer_error(system, monkeypatch):
+    analyzed = []
+
+    def analyze_frame(df, source, tier='full'):
+        analyzed.append(df['車種名'].iloc[0])
+        if len(analyzed) == 2:
+            raise ValueError('分析失敗')
+        return source.with_suffix('.out'), {}
+
+    monkeypatch.setattr(main, 'CarScraper', _StubScraper)
+    monkeypatch.setattr(system, 'analyze_frame', analyze_frame)
+    monkeypatch.setattr(system, 'print_analysis_report', lambda report, path: None)
+
+    # キューが満杯でもスクレイピング側が止まらずに例外が返る
+    with pytest.raises(ValueError, match='分析失敗'):
+        system.run_pipeline(queue_size=1)
+    assert analyzed == ['A', 'B']
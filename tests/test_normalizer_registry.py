@@ -0,0 +1,37 @@
+import json
+import os
+import sys
+import types
+
+# Provide minimal pandas stub if pandas is not installed
+if 'pandas' not in sys.modules:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.modules['pandas'] = types.ModuleType('pandas')
+
+from src.analyzer.normalizer_registry import NormalizerRegistry, get_normalizer_registry
+
+
+def test_registry_reuses_and_reloads_on_change(tmp_path, grade_config):
+    grades_path, keywords_path = grade_config([{'car_name': 'A', 'grades': ['X']}], keywords=('ETC',))
+
+    registry = NormalizerRegistry(grades_path, keywords_path, poll_interval=0,
+                                  cache_dir=tmp_path / 'cache')
+    first = registry.get()
+    assert registry.get() is first
+
+    grades_path.write_text(json.dumps([{'car_name': 'A', 'grades': ['X', 'Y']}]),
+                           encoding='utf-8')
+    os.utime(grades_path, ns=(1, 1))
+    second = registry.get()
+    assert second is not first
+    assert second.car_grades_db['A']['grades'] == ['X', 'Y']
+    # 取得済みのインスタンスは置き換え後も元の設定のまま
+    assert first.car_grades_db['A']['grades'] == ['X']
+
+
+def test_registry_is_shared_per_configuration(tmp_path):
+    a = get_normalizer_registry(tmp_path / 'a.json', tmp_path / 'k.txt')
+    assert get_normalizer_registry(tmp_path / 'a.json', tmp_path / 'k.txt') is a
+    assert get_normalizer_registry(tmp_path / 'a.json', tmp_path / 'k.txt', lazy=True) is not a
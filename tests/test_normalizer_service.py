@@ -0,0 +1,87 @@
+import socket
+import sys
+import types
+
+import pytest
+
+# Provide minimal pandas stub if pandas is not installed
+if 'pandas' not in sys.modules:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.modules['pandas'] = types.ModuleType('pandas')
+
+from src.analyzer.grade_normalizer import GradeNormalizer
+from src.analyzer import normalizer_service
+from src.analyzer.normalizer_service import (
+    NormalizerClient, NormalizerService, connect_normalizer_service, receive_message, send_message
+)
+
+
+@pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unixドメインソケット非対応')
+def test_service_roundtrip(tmp_path, grade_config):
+    pytest.importorskip('numpy')
+    grades_path, keywords_path = grade_config([{'car_name': 'A', 'grades': ['X', 'Y']}])
+    address = str(tmp_path / 'normalizer.sock')
+
+    assert connect_normalizer_service(address) is None
+
+    service = NormalizerService(address, max_workers=1, grades_json_path=grades_path,
+                                exclude_keywords_path=keywords_path, cache_dir=tmp_path / 'cache')
+    service.serve_in_background()
+    try:
+        client = connect_normalizer_service(address)
+        assert client is not None
+        with pytest.raises(RuntimeError):
+            NormalizerService(address).start()
+
+        response = client.normalize_batch(['A', 'A', 'B'], ['X 禁煙車', None, 'Y'])
+        local = GradeNormalizer(grades_path, keywords_path, cache_dir=tmp_path / 'cache')
+        expected = local.normalize_grade_rows(['A', 'A', 'B'], ['X 禁煙車', None, 'Y'], max_workers=1)
+        assert list(zip(response['grades'], response['scores'])) == expected
+        assert response['config_hashes'] == local.config_hashes(['A', 'A', 'B'], 3)
+        assert response['fingerprint'] == local.config_fingerprint
+
+        with pytest.raises(RuntimeError):
+            client.normalize_batch(['A'], ['X'], tier='fast')
+    finally:
+        service.close()
+
+    assert not NormalizerClient(address).ping()
+    assert not (tmp_path / 'normalizer.sock').exists()
+
+
+def test_oversized_frames_are_rejected(monkeypatch):
+    monkeypatch.setattr(normalizer_service, 'MAX_MESSAGE_SIZE', 64)
+    left, right = socket.socketpair()
+    with left, right:
+        send_message(left, {'op': 'ping'})
+        assert receive_message(right) == {'op': 'ping'}
+
+        # 偽のヘッダで巨大な長さを宣言しても本体を待たずに拒否する
+        left.sendall((2 ** 32 - 1).to_bytes(4, 'big'))
+        with pytest.raises(ValueError):
+            receive_message(right)
+        with pytest.raises(ValueError):
+            send_message(left, {'grades': ['X' * 100]})
+
+
+def test_service_uses_requested_max_workers(monkeypatch):
+    np = pytest.importorskip('numpy')
+    calls = []
+
+    class FakeNormalizer:
+        config_fingerprint = 'fp'
+
+        def normalize_batch(self, car_names, grades, max_workers=None, **kwargs):
+            calls.append(max_workers)
+            return np.array(grades, dtype=object), np.zeros(len(grades))
+
+        def config_hashes(self, car_names, count, tier):
+            return [''] * count
+
+    service = NormalizerService(address='unused', max_workers=4)
+    monkeypatch.setattr(service, 'normalizer', FakeNormalizer)
+    service.normalize({'car_names': ['A'], 'grades': ['X'], 'max_workers': 1})
+    service.normalize({'car_names': ['A'], 'grades': ['X'], 'max_workers': None})
+    assert calls == [1, 4]
@@ -0,0 +1,47 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+from src.utils.parsing import (
+    parse_displacement, parse_mileage, parse_price, parse_vehicle_fields, parse_vehicle_id, parse_year
+)
+
+
+def test_parse_price():
+    result = parse_price(pd.Series(['450.5万円', '応談', None, '支払総額 380万円(税込)', '不明']))
+    assert str(result.values.dtype) == 'Float64'
+    assert result.values.iloc[[0, 3]].tolist() == [450.5, 380.0]
+    assert result.values.iloc[[1, 2, 4]].isna().all()
+    # 応談・欠損は失敗扱いにしない
+    assert result.failed.tolist() == [False, False, False, False, True]
+
+
+def test_parse_year_with_japanese_era():
+    result = parse_year(pd.Series(['2019(R01)', 'H30', '平成元年', '令和2年', '年式不明']))
+    assert result.values.iloc[:4].tolist() == [2019, 2018, 1989, 2020]
+    assert result.failed.tolist() == [False, False, False, False, True]
+
+
+def test_parse_mileage_and_displacement():
+    assert parse_mileage(pd.Series(['1.3万km', '300km'])).values.tolist() == [13000.0, 300.0]
+    assert parse_displacement(pd.Series(['5000CC', '5.0L', '4960cc'])).values.tolist() == [5000, 5000, 4960]
+
+
+def test_parse_vehicle_fields():
+    df = pd.DataFrame({'支払総額': ['400万円'], '走行距離': ['x'], 'グレード': ['RC F']})
+    parsed, failed = parse_vehicle_fields(df)
+    assert list(parsed.columns) == ['価格数値', '走行距離数値']
+    assert failed.loc[0].tolist() == [False, True]
+
+
+def test_parse_vehicle_id():
+    urls = pd.Series([
+        'https://www.carsensor.net/usedcar/detail/AU6213553402/index.html?TRCD=200002&RESTID=CS210610',
+        'https://www.carsensor.net/usedcar/detail/AU6213553402/index.html?TRCD=200002&LOAN=TSUJO',
+        'https://example.com/car?id=1',
+        '',
+        None
+    ])
+    assert parse_vehicle_id(urls).tolist() == [
+        'AU6213553402', 'AU6213553402', 'https://example.com/car', None, None
+    ]
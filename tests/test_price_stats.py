@@ -0,0 +1,32 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+pd = pytest.importorskip('pandas')
+
+from src.analyzer.grade_normalizer import count_confidence_levels
+from src.analyzer.price_stats import extract_price_values, grade_price_summary
+
+
+def test_extract_price_values():
+    prices = pd.Series(['450.5万円', None, '応談', '支払総額 380万円(税込)', '450.5万円'])
+    values = extract_price_values(prices)
+    assert values.iloc[[0, 3, 4]].tolist() == [450.5, 380.0, 450.5]
+    assert values.iloc[[1, 2]].isna().all()
+
+
+def test_grade_price_summary():
+    df = pd.DataFrame({
+        '正規グレード': ['RZ', 'RZ', 'RZ', 'RS'],
+        '支払総額': ['400万円', '500万円', '600万円', '応談'],
+        'マッチング精度': [1.0, 0.8, 0.6, 0.5]
+    })
+    summary = grade_price_summary(df).set_index('グレード')
+    assert summary.loc['RZ', ['平均価格', '最小価格', '最大価格', '中央値']].tolist() == [500, 400, 600, 500]
+    assert summary.loc['RZ', '25%価格'] == 450
+    assert summary.loc['RZ', 'データ件数'] == 3
+    assert summary.loc['RZ', '平均マッチング精度'] == 0.8
+    assert summary.loc['RS', ['平均価格', 'データ件数']].tolist() == [0, 0]
+
+
+def test_count_confidence_levels():
+    assert count_confidence_levels([1.0, 0.8, 0.79, 0.6, 0.59, 0.0]) == (2, 2, 2)
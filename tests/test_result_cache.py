@@ -0,0 +1,91 @@
+import sys
+import types
+
+import pytest
+
+# Provide minimal pandas stub if pandas is not installed
+if 'pandas' not in sys.modules:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.modules['pandas'] = types.ModuleType('pandas')
+
+from src.analyzer.grade_normalizer import GradeNormalizer, TierStats
+from src.analyzer.result_cache import NormalizationResultCache
+
+
+@pytest.fixture
+def cached_normalizer(tmp_path, grade_config):
+    """``load(grades)`` で設定を書き込み、結果キャッシュ付きの正規化エンジンを作成"""
+    def load(grades):
+        return GradeNormalizer(*grade_config(grades), cache_dir=tmp_path / 'cache',
+                               result_cache=tmp_path / 'results.sqlite3')
+    return load
+
+
+def test_results_cached_and_invalidated_on_config_change(tmp_path, cached_normalizer):
+    db_path = tmp_path / 'results.sqlite3'
+    cars = ['A', 'A', 'B', 'A']
+    grades = ['X 禁煙車', None, 'Y', 'Z']
+
+    normalizer = cached_normalizer([{'car_name': 'A', 'grades': ['X', 'Z']},
+                                    {'car_name': 'B', 'grades': ['Y']}])
+    first = normalizer.normalize_grade_rows(cars, grades, max_workers=1)
+    assert first == [('X', 1.0), ('ベース', 0.0), ('Y', 1.0), ('Z', 1.0)]
+
+    stats = TierStats()
+    assert normalizer.normalize_grade_rows(cars, grades, max_workers=1, stats=stats) == first
+    assert stats.rows['cached'] == 3
+    assert stats.rows['unresolved'] == 1
+
+    # ティアごとに別の結果として保存される
+    stats = TierStats()
+    normalizer.normalize_grade_rows(cars, grades, max_workers=1, tier='exact', stats=stats)
+    assert stats.rows['cached'] == 0
+
+    # 設定変更後は古い結果を使わず、削除する
+    changed = cached_normalizer([{'car_name': 'A', 'grades': ['X', 'Z']},
+                                 {'car_name': 'B', 'grades': ['Y2']}])
+    assert changed.config_fingerprint != normalizer.config_fingerprint
+    stats = TierStats()
+    match = changed.normalize_grade_rows(cars, grades, max_workers=1, stats=stats)[2]
+    assert match[0] == 'Y2'
+    assert stats.rows['cached'] == 0
+    cache = NormalizationResultCache(db_path)
+    assert cache.lookup(changed.result_cache_key, 'full', ['B']) == {'B': {'Y': match}}
+    # 以前の設定の結果は残る（最近使った設定は保持）
+    assert cache.lookup(normalizer.result_cache_key, 'full', ['A'])['A']
+
+
+def test_purge_keeps_recent_fingerprints(tmp_path):
+    cache = NormalizationResultCache(tmp_path / 'results.sqlite3')
+    for fingerprint in ('old', 'test', 'prod'):
+        cache.store(fingerprint, 'full', [('A', 'X', 'X', 1.0)])
+
+    # 2つの設定を交互に使ってもどちらの結果も消えない
+    for fingerprint in ('test', 'prod', 'test', 'prod'):
+        cache.purge_stale(fingerprint, keep=2)
+    assert cache.lookup('test', 'full', ['A']) == {'A': {'X': ('X', 1.0)}}
+    assert cache.lookup('prod', 'full', ['A']) == {'A': {'X': ('X', 1.0)}}
+    assert cache.lookup('old', 'full', ['A']) == {'A': {}}
+
+    cache.store('new', 'full', [('A', 'X', 'X', 1.0)])
+    assert cache.purge_stale('new', keep=2) == 1
+    assert cache.lookup('test', 'full', ['A']) == {'A': {}}
+
+
+def test_result_cache_key_includes_matcher_version(monkeypatch, cached_normalizer):
+    from src.analyzer import grade_normalizer
+
+    normalizer = cached_normalizer([{'car_name': 'A', 'grades': ['X']}])
+    normalizer.normalize_grade_rows(['A'], ['X 禁煙車'], max_workers=1)
+    key = normalizer.result_cache_key
+    car_hash = normalizer.car_config_hash('A')
+
+    monkeypatch.setattr(grade_normalizer, 'RESULT_CACHE_VERSION', grade_normalizer.RESULT_CACHE_VERSION + 1)
+    normalizer._car_hashes = {}
+    assert normalizer.result_cache_key != key
+    assert normalizer.car_config_hash('A') != car_hash
+    stats = TierStats()
+    normalizer.normalize_grade_rows(['A'], ['X 禁煙車'], max_workers=1, stats=stats)
+    assert stats.rows['cached'] == 0
@@ -0,0 +1,32 @@
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('openpyxl')
+
+from src.analyzer.result_writer import is_result_file, read_analysis_result, write_analysis_result
+
+
+def _result_frame():
+    return pd.DataFrame({'車種名': ['RC F', 'RC F'], '正規グレード': ['RC F', None],
+                         'マッチング精度': [95.0, 40.5]})
+
+
+@pytest.mark.parametrize('extension', ['.xlsx', '.csv', '.jsonl'])
+def test_write_and_read_analysis_result(tmp_path, extension):
+    output_path = tmp_path / f"RC_F_normalized_20250101_000000{extension}"
+    summary = pd.DataFrame({'グレード': ['RC F'], 'データ件数': [1]})
+    write_analysis_result(output_path, _result_frame(), summary, {'ソースファイル': 'a.csv', '総件数': 2})
+
+    df, metadata = read_analysis_result(output_path)
+    assert df['マッチング精度'].tolist() == [95.0, 40.5]
+    assert df['正規グレード'].isna().tolist() == [False, True]
+    assert metadata['ソースファイル'] == 'a.csv'
+
+    result_files = [path.name for path in tmp_path.iterdir() if is_result_file(path)]
+    assert result_files == [output_path.name]
+
+
+def test_xlsx_has_summary_and_metadata_sheets(tmp_path):
+    output_path = tmp_path / 'out.xlsx'
+    write_analysis_result(output_path, _result_frame(), pd.DataFrame({'グレード': ['RC F']}), {'総件数': 2})
+    assert list(pd.read_excel(output_path, sheet_name=None)) == ['正規化済みデータ', 'グレード別集計', 'メタデータ']
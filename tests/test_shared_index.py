@@ -0,0 +1,44 @@
+import sys
+import types
+
+# Provide minimal pandas stub if pandas is not installed
+if 'pandas' not in sys.modules:
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        sys.modules['pandas'] = types.ModuleType('pandas')
+
+from src.analyzer.grade_normalizer import GradeNormalizer
+from src.analyzer.shared_index import open_grade_index, publish_grade_index
+
+
+def test_mapped_index_matches_file_normalizer(tmp_path, grade_config):
+    grades_path, keywords_path = grade_config([
+        {'car_name': 'GRヤリス', 'grades': ['RZ', 'RZ ハイパフォーマンス', 'RS']},
+        {'car_name': 'RC F', 'grades': ['RC F', 'RC F Carbon Exterior Package'],
+         'aliases': ['F'], 'special_patterns': {'カーボン': 'RC F Carbon Exterior Package'}},
+    ], keywords=('ETC', '禁煙車'))
+
+    index_path = publish_grade_index(grades_path, keywords_path, tmp_path / 'cache')
+    assert publish_grade_index(grades_path, keywords_path, tmp_path / 'cache') == index_path
+
+    mapped = open_grade_index(index_path)
+    direct = GradeNormalizer(grades_path, keywords_path, cache_dir=tmp_path / 'cache')
+    assert mapped.config_fingerprint == direct.config_fingerprint
+    assert mapped.car_grades_db.loaded_count == 0
+    for car_name, grade in [('F', 'RC カーボン ETC'), ('GRヤリス', 'RZ ハイパフォーマンス 禁煙車'),
+                            ('GRヤリス', 'RS 4WD'), ('Unknown', 'X')]:
+        assert mapped.find_best_grade_match(grade, car_name) == \
+            direct.find_best_grade_match(grade, car_name)
+
+
+def test_publish_removes_stale_index_files(tmp_path, grade_config):
+    grades_path, keywords_path = grade_config([{'car_name': 'A', 'grades': ['X']}], keywords=('ETC',))
+
+    old_path = publish_grade_index(grades_path, keywords_path, tmp_path / 'cache')
+    grade_config([{'car_name': 'A', 'grades': ['Y']}], keywords=('ETC',))
+    new_path = publish_grade_index(grades_path, keywords_path, tmp_path / 'cache')
+
+    assert new_path != old_path
+    assert sorted((tmp_path / 'cache').glob('grade_index_*.bin')) == [new_path]
+    assert open_grade_index(new_path).find_best_grade_match('Y', 'A') == ('Y', 1.0)
@@ -4,6 +4,7 @@ import { Car, TrendingUp, BarChart3, MapPin, Filter, Upload, Download, RefreshCw
 import Papa from 'papaparse';
 import { 
   processCarData, 
+  expandPriceHistory,
   calculatePriceStats, 
   exportToCSV, 
   checkDataQuality,
@@ -125,7 +126,7 @@ export default function CarAnalysisDashboard() {
             // JSONデータを処理
             const processedData = processCarData(jsonData);
             setRawData(processedData);
-            setAllRawData(processedData);
+            setAllRawData(expandPriceHistory(processedData));
             setUploadedDirName(filePath.split('/')[0] || '');
             setFileUploaded(true);
             setLastUpdate(new Date().toLocaleString());
@@ -263,7 +264,7 @@ export default function CarAnalysisDashboard() {
 
     Promise.all(files.map(readFile))
       .then(dataLists => {
-        setAllRawData(dataLists.flat());
+        setAllRawData(expandPriceHistory(dataLists.flat()));
 
         // 最新のファイルを決定
         let latestIndex = 0;
@@ -214,6 +214,11 @@ export const processCarData = (rawData) => {
         date: date,
         ソースURL: row.ソースURL || '',
         車両URL: row.車両URL || row.ソースURL || '', // 車両個別URLを追加
+        // 車両単位エクスポートの掲載期間と価格履歴（[日付, 価格] の配列）
+        vehicleId: row.vehicleId || null,
+        firstSeen: row.firstSeen || null,
+        lastSeen: row.lastSeen || null,
+        priceHistory: Array.isArray(row.priceHistory) ? row.priceHistory : null,
         // 追加の分析用フィールド
         pricePerCC: price && displacement ? (price * 10000) / displacement : null,
         ageInYears: year ? (new Date().getFullYear() - year) : null,
@@ -234,6 +239,31 @@ export const processCarData = (rawData) => {
   );
 };
 
+/**
+ * 車両単位のデータを価格履歴から日ごとの観測データに展開（価格推移用）
+ * @param {Array} data - processCarData で変換済みのデータ
+ * @returns {Array} 観測日ごとのデータ（価格履歴のない行はそのまま）
+ */
+export const expandPriceHistory = (data) => {
+  if (!Array.isArray(data)) {
+    return [];
+  }
+
+  return data.flatMap(item => {
+    if (!item.priceHistory || item.priceHistory.length === 0) {
+      return [item];
+    }
+    return item.priceHistory
+      .filter(([, price]) => typeof price === 'number' && price > 0)
+      .map(([date, price]) => ({
+        ...item,
+        price,
+        取得日時: date,
+        date: parseDate(date)
+      }));
+  });
+};
+
 /**
  * グレード名の正規化（簡易版）
  * @param {string} gradeName - 元のグレード名